@@ -6,7 +6,10 @@ from fastapi.staticfiles import StaticFiles
 import threading
 
 from app.routes import register_routes
-from app.services.data_loader import reload_data
+from app.services.assets import build_assets
+from app.services.data_loader import start_background_reload, warm_start
+from app.services.deadline_scheduler import start_deadline_scheduler
+from app.services.edit_journal import load_journal, start_compactor
 from app.services.file_watcher import start_file_watcher
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -22,12 +25,20 @@ def create_app() -> FastAPI:
 
     @application.on_event("startup")
     async def startup_event():
-        reload_data()
+        # Pending journal edits are overlaid by every reload, so load them before the first one.
+        load_journal()
+        build_assets()
+        # Serve the persisted snapshot right away; the full reload bumps the version when done.
+        warm_start()
+        start_background_reload()
+        start_compactor()
+        start_deadline_scheduler()
         threading.Thread(target=start_file_watcher, daemon=True).start()
 
     @application.on_event("shutdown")
     async def shutdown_event():
         from app.services.file_watcher import observer
+        from app.services.snapshot_store import flush_snapshot
 
         try:
             if observer is not None:
@@ -36,4 +47,6 @@ def create_app() -> FastAPI:
         except Exception as exc:
             logger.warning("Failed to stop file watcher cleanly: %s", exc)
 
+        flush_snapshot()
+
     return application
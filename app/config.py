@@ -6,6 +6,10 @@ FILE_PATHS = [
     # "another.xlsx",
 ]
 
+# Override the list above without editing this file (separated by os.pathsep: ";" on Windows, ":" elsewhere)
+if os.environ.get("PDO_FILE_PATHS"):
+    FILE_PATHS = os.environ["PDO_FILE_PATHS"].split(os.pathsep)
+
 DEBOUNCE_SECONDS = 3
 MAX_RELOAD_RETRIES = 3
 RELOAD_RETRY_DELAY = 1.0
@@ -13,6 +17,41 @@ READ_RETRY_DELAY = 0.3
 READ_RETRY_ATTEMPTS = 3
 SSE_POLL_SECONDS = 0.5
 SSE_KEEPALIVE_SECONDS = 25
+# Typed events (e.g. deadline crossings) queued per SSE client; the oldest are dropped beyond this
+SSE_EVENT_BACKLOG = 50
+
+# Last good data, persisted after every reload and served on the next start while a fresh reload runs
+SNAPSHOT_PATH = os.environ.get("PDO_SNAPSHOT_PATH", ".pdo_snapshot.json.gz")
+
+# Edits are appended (and fsynced) here first, then written into the workbooks in the background
+JOURNAL_PATH = os.environ.get("PDO_JOURNAL_PATH", "edit_journal.jsonl")
+JOURNAL_COMPACT_INTERVAL_SECONDS = 5
+JOURNAL_COMPACT_DELAY_SECONDS = 0.5
+JOURNAL_COMPACT_BATCH = 200
+# Workbooks are written in parallel, each under its own lock
+JOURNAL_COMPACT_WORKERS = 4
+
+# Open tasks due within this many days count as "due soon" in /api/summary and the badge
+DUE_SOON_DAYS = 7
+# The deadline scheduler sleeps until the next due-soon/overdue threshold, re-reading the clock at least this often
+DEADLINE_RECHECK_SECONDS = 60
+
+# Optional cap on parsed sheet data held in memory (0 = unlimited). Beyond it, the least recently
+# used sheets are evicted and re-parsed from their workbooks when next requested.
+MEMORY_BUDGET_MB = float(os.environ.get("PDO_MEMORY_BUDGET_MB", "0"))
+
+# Recent published versions kept for /api/data?version= and /api/diff; unchanged sheets and rows are
+# shared between versions. PDO_HISTORY_VERSIONS=0 turns history off; PDO_HISTORY_SECONDS=0 removes the age limit.
+HISTORY_MAX_VERSIONS = int(os.environ.get("PDO_HISTORY_VERSIONS", "20"))
+HISTORY_MAX_AGE_SECONDS = float(os.environ.get("PDO_HISTORY_SECONDS", "3600"))
+
+# Static CSS/JS are fingerprinted and precompressed at startup; smaller files are sent uncompressed
+ASSET_COMPRESS_MIN_BYTES = 1024
 
 APP_HOST = "127.0.0.1"
 APP_PORT = 8889
+
+# Opt-in instrumentation (set PDO_PROFILING=1 to enable /debug/profile and timing spans)
+PROFILING_ENABLED = os.environ.get("PDO_PROFILING", "0") == "1"
+SLOW_OPERATION_THRESHOLD_MS = float(os.environ.get("PDO_SLOW_OPERATION_MS", "250"))
+SLOW_OPERATION_LOG = os.environ.get("PDO_SLOW_OPERATION_LOG", "slow_operations.log")
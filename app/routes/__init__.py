@@ -1,15 +1,23 @@
 from fastapi import FastAPI
 
 from app.routes.pages import router as pages_router
+from app.routes.assets import router as assets_router
 from app.routes.data import router as data_router
 from app.routes.excel import router as excel_router
+from app.routes.export import router as export_router
+from app.routes.history import router as history_router
 from app.routes.events import router as events_router
 from app.routes.health import router as health_router
+from app.routes.debug import router as debug_router
 
 
 def register_routes(app: FastAPI):
     app.include_router(pages_router)
+    app.include_router(assets_router)
     app.include_router(data_router, prefix="/api")
     app.include_router(excel_router, prefix="/api")
+    app.include_router(export_router, prefix="/api")
+    app.include_router(history_router, prefix="/api")
     app.include_router(events_router)
     app.include_router(health_router)
+    app.include_router(debug_router)
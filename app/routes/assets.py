@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.services.assets import IMMUTABLE_CACHE_CONTROL, get_asset, pick_encoding
+
+router = APIRouter()
+
+
+@router.get("/assets/{asset_path:path}")
+async def serve_asset(asset_path: str, request: Request):
+    """Serve a fingerprinted static file from memory, precompressed when the client accepts it."""
+    asset = get_asset(asset_path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "ETag": asset["etag"],
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == asset["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    body, encoding = pick_encoding(asset, request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset["media_type"], headers=headers)
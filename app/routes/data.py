@@ -1,40 +1,122 @@
-import io
+import asyncio
 import logging
 import os
-import tempfile
-import time
-from fastapi import APIRouter, HTTPException
-from openpyxl import load_workbook
-import pandas as pd
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from app.config import FILE_PATHS
 from app.models import TaskUpdate, AddTaskRequest
-from app.services.excel_io import read_file_with_shared_access, safe_read_excel
-from app.services.data_loader import reload_data
+from app.services.columnar import encode_columnar
+from app.services.data_loader import publish_snapshot
+from app.services.edit_journal import apply_to_snapshot, record_edit
+from app.services.history import get_version
 from app.services.path_guard import is_allowed_path, normalize_path
+from app.services.profiling import profile_operation
+from app.services.rollups import summarize
+from app.services.sheet_cache import get_sheet, is_evicted
+from app.services.task_index import lookup
+from app.services.workbook_writer import EditRejected
 import app.state as state
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-LOCKED_FILE_MESSAGE = "Cannot save: The Excel file is open in another program. Please close Excel and try again."
+@router.get("/data")
+async def get_data(
+    format: Optional[str] = Query(None, description='"columnar" for the compact encoding'),
+    version: Optional[int] = Query(None, description="A retained earlier version (see /api/history)"),
+):
+    """Fetch the latest cached data, or an earlier version still held in the history."""
+    if format not in (None, "json", "columnar"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use json or columnar")
+
+    if version is not None and version != state.data_version:
+        entry = get_version(version)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Version {version} is not retained")
+        all_sheets_data = entry["sheets"]
+        payload = {
+            "sheet_names": entry["sheet_names"],
+            "version": entry["version"],
+            "last_updated": entry["last_updated"],
+            "schema": entry["schema"],
+            "historical": True,
+            # Sheets evicted under the memory budget are not kept in the history.
+            "unavailable_sheets": [name for name in entry["sheet_names"] if name not in all_sheets_data],
+        }
+    else:
+        all_sheets_data = state.cached_data["all_sheets_data"]
+        payload = {
+            "sheet_names": state.cached_data["sheet_names"],
+            "version": state.data_version,
+            "last_updated": state.cached_data["last_updated"],
+            "stale": state.cached_data["stale"],
+            "schema": state.cached_data["schema"],
+            "evicted_sheets": state.cached_data["evicted_sheets"],
+        }
+
+    if format == "columnar":
+        content = encode_columnar(all_sheets_data, payload["sheet_names"], payload, cache=not payload.get("historical"))
+        return Response(content=content, media_type="application/json")
+    return {"all_sheets_data": all_sheets_data, **payload}
+
+
+@router.get("/sheets/{sheet_name}")
+async def get_sheet_data(sheet_name: str):
+    """Fetch one sheet's tasks, re-parsing it from its workbooks if it was evicted."""
+    tasks = await asyncio.to_thread(get_sheet, sheet_name)
+    if tasks is None:
+        raise HTTPException(status_code=404, detail="Sheet not found")
+
+    return {
+        "sheet_name": sheet_name,
+        "tasks": tasks,
+        "schema": state.cached_data["schema"].get(sheet_name, {}),
+        "version": state.data_version,
+    }
 
 
-@router.get("/data")
-async def get_data():
-    """Fetch the latest cached data."""
+@router.get("/summary")
+async def get_summary():
+    """Per-sheet and per-file counts, without the task data itself."""
     return {
-        "all_sheets_data": state.cached_data["all_sheets_data"],
+        **summarize(state.rollups, state.cached_data["sheet_names"]),
         "sheet_names": state.cached_data["sheet_names"],
         "version": state.data_version,
         "last_updated": state.cached_data["last_updated"],
+        "stale": state.cached_data["stale"],
+    }
+
+
+@router.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Fetch a single task by its stable ID."""
+    location = state.task_index.get(task_id)
+    if location is not None and is_evicted(location[0]):
+        await asyncio.to_thread(get_sheet, location[0])
+
+    found = lookup(state.cached_data["all_sheets_data"], state.task_index, task_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    sheet_name, task_name, instance_index, entry = found
+    return {
+        "task_id": task_id,
+        "sheet_name": sheet_name,
+        "task_name": task_name,
+        "instance_index": instance_index,
+        "details": entry["details"],
+        "metadata": entry["metadata"],
+        "version": state.data_version,
     }
 
 
 @router.post("/save-task")
 async def save_task(update: TaskUpdate):
-    """Save task changes back to the Excel file."""
+    """Journal task changes; they show up immediately and reach the Excel file in the background."""
     try:
         abs_path = normalize_path(update.file_path)
 
@@ -54,109 +136,58 @@ async def save_task(update: TaskUpdate):
         if not os.path.isfile(abs_path):
             raise HTTPException(status_code=404, detail="File not found")
 
-        _assert_excel_not_open(abs_path)
-
-        with state.write_lock:
-            state.write_in_progress = True
-
-        try:
-            excel_data = safe_read_excel(abs_path, sheet_name=None, engine="openpyxl")
-
-            if update.sheet_name not in excel_data:
-                raise HTTPException(status_code=404, detail="Sheet not found")
-
-            df = excel_data[update.sheet_name]
-
-            if update.row_index < 0 or update.row_index >= len(df):
-                raise HTTPException(status_code=400, detail="Invalid row index")
-
-            task_name_col = df.columns[0]
-            current_task_name = str(df.iloc[update.row_index][task_name_col])
-            if current_task_name != update.task_name:
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"Row position changed. Expected '{update.task_name}' but found '{current_task_name}'. Please refresh and try again.",
-                )
-
-            invalid_update_columns = [
-                str(col) for col in update.updates
-                if str(col).strip() == ""
-            ]
-            invalid_new_columns = [
-                str(col) for col in update.new_columns
-                if str(col).strip() == ""
-            ]
-            if invalid_update_columns or invalid_new_columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Column names cannot be blank",
-                )
-
-            unknown_columns = [col for col in update.updates if col not in df.columns]
-            if unknown_columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unknown column(s): {', '.join(unknown_columns)}",
-                )
-
-            overlapping_columns = set(update.updates).intersection(update.new_columns)
-            if overlapping_columns:
-                overlap_list = ", ".join(sorted(overlapping_columns))
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Columns cannot appear in both updates and new_columns: {overlap_list}",
-                )
-
-            for col, value in update.updates.items():
-                df.at[update.row_index, col] = value if value != "" else None
-
-            if update.new_columns:
-                for col, value in update.new_columns.items():
-                    if col not in df.columns:
-                        df[col] = None
-                    df.at[update.row_index, col] = value if value != "" else None
-
-            excel_data[update.sheet_name] = df
-
-            original_col_widths, original_col_formats, original_tab_colors, original_book_views = _read_formatting(abs_path)
-            _assert_excel_not_open(abs_path)
-
-            try:
-                _write_excel(abs_path, excel_data, original_col_widths, original_col_formats, original_tab_colors, original_book_views)
-            except (PermissionError, OSError) as err:
-                if isinstance(err, PermissionError) or getattr(err, "errno", None) == 13:
-                    raise HTTPException(
-                        status_code=423,
-                        detail=LOCKED_FILE_MESSAGE,
-                    )
-                raise
-
-            logger.info(
-                "Saved changes to %s, sheet '%s', row %d",
-                os.path.basename(abs_path),
-                update.sheet_name,
-                update.row_index,
+        invalid_update_columns = [
+            str(col) for col in update.updates
+            if str(col).strip() == ""
+        ]
+        invalid_new_columns = [
+            str(col) for col in update.new_columns
+            if str(col).strip() == ""
+        ]
+        if invalid_update_columns or invalid_new_columns:
+            raise HTTPException(
+                status_code=400,
+                detail="Column names cannot be blank",
             )
-            time.sleep(0.5)
 
-        finally:
-            with state.write_lock:
-                state.write_in_progress = False
+        overlapping_columns = set(update.updates).intersection(update.new_columns)
+        if overlapping_columns:
+            overlap_list = ", ".join(sorted(overlapping_columns))
+            raise HTTPException(
+                status_code=400,
+                detail=f"Columns cannot appear in both updates and new_columns: {overlap_list}",
+            )
 
-        reload_data()
-        return {"status": "success", "message": "Task updated successfully"}
+        # Values are journaled (and written to the workbook) as typed; only the snapshot shows them normalized.
+        edit = {
+            "op": "update",
+            "file_path": abs_path,
+            "sheet_name": update.sheet_name,
+            "row_index": update.row_index,
+            "task_name": update.task_name,
+            "updates": update.updates,
+            "new_columns": update.new_columns,
+        }
+        entry, version = await asyncio.to_thread(_journal_and_publish, edit, "save_task")
+
+        logger.info(
+            "Journaled changes to %s, sheet '%s', row %d (#%d)",
+            os.path.basename(abs_path),
+            update.sheet_name,
+            update.row_index,
+            entry["seq"],
+        )
+        return {"status": "success", "message": "Task updated successfully", "journal_seq": entry["seq"], "pending": True, "version": version}
 
     except HTTPException:
         raise
     except Exception as e:
-        with state.write_lock:
-            state.write_in_progress = False
         raise HTTPException(status_code=500, detail=f"Error saving task: {str(e)}")
 
 
 @router.post("/add-task")
 async def add_task(request: AddTaskRequest):
-    """Append a brand-new task row to a sheet in the Excel file."""
+    """Journal a brand-new task row; it reaches the Excel file in the background."""
     try:
         abs_path = normalize_path(request.file_path)
 
@@ -176,8 +207,6 @@ async def add_task(request: AddTaskRequest):
         if not request.task_name.strip():
             raise HTTPException(status_code=400, detail="Task name cannot be blank")
 
-        _assert_excel_not_open(abs_path)
-
         invalid_value_columns = [
             str(col) for col in request.values
             if str(col).strip() == ""
@@ -197,186 +226,63 @@ async def add_task(request: AddTaskRequest):
                 detail=f"Columns cannot appear in both values and new_columns: {overlap_list}",
             )
 
-        with state.write_lock:
-            state.write_in_progress = True
-
-        try:
-            excel_data = safe_read_excel(abs_path, sheet_name=None, engine="openpyxl")
-
-            if request.sheet_name not in excel_data:
-                raise HTTPException(status_code=404, detail="Sheet not found")
-
-            df = excel_data[request.sheet_name]
-            task_name_col = df.columns[0]
-
-            unknown_columns = [col for col in request.values if col not in df.columns]
-            if unknown_columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unknown column(s): {', '.join(unknown_columns)}",
-                )
-
-            row_data = {col: None for col in df.columns}
-            row_data[task_name_col] = request.task_name
-
-            for col, value in request.values.items():
-                row_data[col] = value if value != "" else None
-
-            for col, value in request.new_columns.items():
-                if col not in df.columns:
-                    df[col] = None
-                row_data[col] = value if value != "" else None
-
-            for col in df.columns:
-                if col not in row_data:
-                    row_data[col] = None
-
-            new_row_df = pd.DataFrame([row_data], columns=df.columns)
-            df = pd.concat([df, new_row_df], ignore_index=True)
-            excel_data[request.sheet_name] = df
-
-            original_col_widths, original_col_formats, original_tab_colors, original_book_views = _read_formatting(abs_path)
-            _assert_excel_not_open(abs_path)
-
-            try:
-                _write_excel(abs_path, excel_data, original_col_widths, original_col_formats, original_tab_colors, original_book_views)
-            except (PermissionError, OSError) as err:
-                if isinstance(err, PermissionError) or getattr(err, "errno", None) == 13:
-                    raise HTTPException(
-                        status_code=423,
-                        detail=LOCKED_FILE_MESSAGE,
-                    )
-                raise
-
-            logger.info(
-                "Added task '%s' to %s, sheet '%s'",
-                request.task_name,
-                os.path.basename(abs_path),
-                request.sheet_name,
-            )
-            time.sleep(0.5)
-
-        finally:
-            with state.write_lock:
-                state.write_in_progress = False
-
-        reload_data()
-        return {"status": "success", "message": "Task added successfully"}
+        edit = {
+            "op": "add",
+            "file_path": abs_path,
+            "sheet_name": request.sheet_name,
+            "task_name": request.task_name,
+            "values": request.values,
+            "new_columns": request.new_columns,
+        }
+        entry, version = await asyncio.to_thread(_journal_and_publish, edit, "add_task")
+
+        logger.info(
+            "Journaled new task '%s' for %s, sheet '%s' (#%d)",
+            request.task_name,
+            os.path.basename(abs_path),
+            request.sheet_name,
+            entry["seq"],
+        )
+        return {"status": "success", "message": "Task added successfully", "journal_seq": entry["seq"], "pending": True, "version": version}
 
     except HTTPException:
         raise
     except Exception as e:
-        with state.write_lock:
-            state.write_in_progress = False
         raise HTTPException(status_code=500, detail=f"Error adding task: {str(e)}")
 
 
-def _read_formatting(abs_path):
-    """Read original Excel formatting before overwriting."""
-    original_col_widths = {}
-    original_col_formats = {}
-    original_tab_colors = {}
-    original_book_views = None
-
-    try:
-        file_bytes = read_file_with_shared_access(abs_path)
-        temp_wb = load_workbook(io.BytesIO(file_bytes))
-
-        if temp_wb.views:
-            original_book_views = temp_wb.views
-
-        for sheet_name in temp_wb.sheetnames:
-            original_col_widths[sheet_name] = {}
-            original_col_formats[sheet_name] = {}
-            ws = temp_wb[sheet_name]
-
-            if ws.sheet_properties.tabColor:
-                original_tab_colors[sheet_name] = ws.sheet_properties.tabColor
-
-            for col_letter, dim in ws.column_dimensions.items():
-                if dim.width:
-                    original_col_widths[sheet_name][col_letter] = dim.width
-
-            if ws.max_row >= 2:
-                for col_idx in range(1, ws.max_column + 1):
-                    cell = ws.cell(row=2, column=col_idx)
-                    if cell.number_format and cell.number_format != "General":
-                        from openpyxl.utils import get_column_letter
-                        col_letter = get_column_letter(col_idx)
-                        original_col_formats[sheet_name][col_letter] = cell.number_format
-
-        temp_wb.close()
-    except Exception as exc:
-        logger.warning("Could not preserve original workbook formatting: %s", exc)
-
-    return original_col_widths, original_col_formats, original_tab_colors, original_book_views
-
-
-def _write_excel(abs_path, excel_data, col_widths, col_formats, tab_colors, book_views):
-    """Write Excel data back to file atomically, restoring formatting.
+def _journal_and_publish(edit, operation):
+    """Validate an edit against the current snapshot, append it to the journal, then publish it.
 
-    Writes to a temp file in the same directory first, then replaces the
-    original via rename. This prevents data loss if the write fails midway.
+    Runs in a worker thread (it may re-parse an evicted sheet and fsyncs the journal).
+    Returns the journal entry and the data version that includes the edit.
     """
-    dir_name = os.path.dirname(abs_path)
-    tmp_fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp.xlsx")
-    try:
-        os.close(tmp_fd)
-        with pd.ExcelWriter(tmp_path, engine="openpyxl", mode="w") as writer:
-            for sname, sheet_df in excel_data.items():
-                sheet_df.to_excel(writer, sheet_name=sname, index=False)
-
-            if book_views:
-                writer.book.views = book_views
-
-            for sname in writer.sheets:
-                ws = writer.sheets[sname]
-
-                if sname in tab_colors:
-                    ws.sheet_properties.tabColor = tab_colors[sname]
-
-                if sname in col_widths:
-                    for col_letter, width in col_widths[sname].items():
-                        ws.column_dimensions[col_letter].width = width
-
-                if sname in col_formats:
-                    for col_letter, num_format in col_formats[sname].items():
-                        from openpyxl.utils import column_index_from_string
-                        col_idx = column_index_from_string(col_letter)
-                        for row_idx in range(2, ws.max_row + 1):
-                            ws.cell(row=row_idx, column=col_idx).number_format = num_format
-
-        os.replace(tmp_path, abs_path)
-    except Exception:
+    context = {"file": os.path.basename(edit["file_path"]), "sheet": edit["sheet_name"]}
+    with profile_operation(operation, **context), state.snapshot_lock:
+        # An edit to an evicted sheet brings it back first (and counts as a use).
+        get_sheet(edit["sheet_name"])
         try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        raise
-
-
-def _assert_excel_not_open(abs_path):
-    """Best-effort check for Office lock artifacts before writing."""
-    lock_markers = _office_lock_markers(abs_path)
-    if any(os.path.exists(lock_path) for lock_path in lock_markers):
-        raise HTTPException(status_code=423, detail=LOCKED_FILE_MESSAGE)
-
-    # On some systems the lock marker is absent; try opening in read/write mode.
-    # If the file is exclusively locked, this raises PermissionError / errno 13.
-    try:
-        with open(abs_path, "r+b"):
-            pass
-    except (PermissionError, OSError) as err:
-        if isinstance(err, PermissionError) or getattr(err, "errno", None) == 13:
-            raise HTTPException(status_code=423, detail=LOCKED_FILE_MESSAGE)
-        raise
-
-
-def _office_lock_markers(abs_path):
-    """Common lock-file names created by Excel/LibreOffice."""
-    dir_name = os.path.dirname(abs_path)
-    base_name = os.path.basename(abs_path)
-    return [
-        os.path.join(dir_name, f"~${base_name}"),
-        os.path.join(dir_name, f".~lock.{base_name}#"),
-    ]
+            all_sheets_data = apply_to_snapshot(state.cached_data["all_sheets_data"], edit, state.cached_data["schema"])
+        except EditRejected as exc:
+            raise HTTPException(status_code=exc.status_code, detail=str(exc))
+
+        # Only acknowledge (and show) the edit once it is durable on disk.
+        entry = record_edit(edit)
+        publish_snapshot(
+            all_sheets_data,
+            state.cached_data["sheet_names"],
+            stale=state.cached_data["stale"],
+            schema=_schema_with_new_columns(edit),
+        )
+        version = state.data_version
+    return entry, version
+
+
+def _schema_with_new_columns(edit):
+    """Schema including columns the edit adds (as text), or None when nothing changes."""
+    schema = state.cached_data["schema"]
+    sheet_schema = schema.get(edit["sheet_name"], {})
+    added = [col for col in edit["new_columns"] if col not in sheet_schema]
+    if not added:
+        return None
+    return {**schema, edit["sheet_name"]: {**sheet_schema, **{col: {"type": "text"} for col in added}}}
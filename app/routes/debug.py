@@ -0,0 +1,37 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.config import PROFILING_ENABLED
+from app.services import profiling
+
+router = APIRouter()
+
+
+@router.get("/debug/profile")
+async def profile_next_operation(
+    timeout: float = Query(60.0, gt=0, le=600),
+    sort: str = Query("cumulative"),
+    limit: int = Query(40, ge=1, le=500),
+):
+    """Capture a cProfile of the next reload or save and return its sorted stats."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PDO_PROFILING=1)")
+
+    if sort not in profiling.SORT_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort key. Use one of: {', '.join(sorted(profiling.SORT_KEYS))}",
+        )
+
+    try:
+        capture = profiling.arm_capture(sort=sort, limit=limit)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    finished = await asyncio.to_thread(capture["done"].wait, timeout)
+    if not finished:
+        profiling.disarm_capture(capture)
+        raise HTTPException(status_code=408, detail=f"No reload or save happened within {timeout:g}s")
+
+    return capture["result"]
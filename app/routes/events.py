@@ -1,11 +1,13 @@
 import asyncio
+import json
+from collections import deque
 
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
 import time
 
-from app.config import SSE_KEEPALIVE_SECONDS, SSE_POLL_SECONDS
+from app.config import SSE_EVENT_BACKLOG, SSE_KEEPALIVE_SECONDS, SSE_POLL_SECONDS
 import app.state as state
 
 router = APIRouter()
@@ -13,7 +15,8 @@ router = APIRouter()
 
 async def _event_generator():
     """Generate SSE events for a connected client."""
-    client = {"needs_update": False, "last_version": state.data_version}
+    # "events" holds typed events pushed from other threads (see services/deadline_scheduler.py).
+    client = {"needs_update": False, "last_version": state.data_version, "events": deque(maxlen=SSE_EVENT_BACKLOG)}
     state.connected_clients.append(client)
     last_send_time = time.monotonic()
 
@@ -24,6 +27,11 @@ async def _event_generator():
                 client["last_version"] = state.data_version
                 last_send_time = time.monotonic()
                 yield f"data: {state.data_version}\n\n"
+            elif client["events"]:
+                event_type, payload = client["events"].popleft()
+                last_send_time = time.monotonic()
+                yield f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
+                continue
             elif time.monotonic() - last_send_time >= max(SSE_KEEPALIVE_SECONDS, 1):
                 # Keep idle SSE connections alive through proxies/load balancers.
                 last_send_time = time.monotonic()
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.exporter import export_columns, iter_csv, iter_ndjson, iter_task_rows
+from app.services.sheet_cache import load_transient
+import app.state as state
+
+router = APIRouter()
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson"),
+    sheet: Optional[str] = Query(None),
+    file: Optional[str] = Query(None, description="Workbook file name or full path"),
+):
+    """Stream one flattened row per task as NDJSON or CSV, optionally filtered by sheet and file."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    # Published snapshots are never mutated, so the stream reads one consistent version without copying.
+    all_sheets_data = state.cached_data["all_sheets_data"]
+    sheet_names = state.cached_data["sheet_names"]
+    version = state.data_version
+
+    if sheet is not None and sheet not in sheet_names:
+        raise HTTPException(status_code=404, detail="Sheet not found")
+
+    # Evicted sheets are parsed one at a time as the stream reaches them and not kept resident.
+    rows = iter_task_rows(all_sheets_data, sheet_names, sheet=sheet, file=file, load_missing=load_transient)
+    if format == "csv":
+        body = iter_csv(rows, export_columns(state.cached_data["schema"], sheet_names, sheet=sheet))
+    else:
+        body = iter_ndjson(rows)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{format}"',
+            "X-Data-Version": str(version),
+        },
+    )
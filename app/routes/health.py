@@ -2,6 +2,11 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
+from app.services.deadline_scheduler import scheduler_status
+from app.services.edit_journal import journal_status
+from app.services.file_locks import lock_status
+from app.services.history import history_status
+from app.services.sheet_cache import cache_stats
 import app.state as state
 
 router = APIRouter()
@@ -13,5 +18,11 @@ async def health():
         'status': 'ok',
         'data_version': state.data_version,
         'last_updated': state.cached_data.get('last_updated'),
+        'stale': state.cached_data.get('stale', False),
+        'journal': journal_status(),
+        'writes_in_progress': lock_status(),
+        'sheet_cache': cache_stats(),
+        'deadlines': scheduler_status(),
+        'history': history_status(),
         'timestamp': datetime.now(timezone.utc).isoformat(),
     }
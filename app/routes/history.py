@@ -0,0 +1,32 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.history import diff_versions, get_version, list_versions
+import app.state as state
+
+router = APIRouter()
+
+
+@router.get("/history")
+async def get_history():
+    """Versions still retained for /api/data?version= and /api/diff."""
+    return {"current": state.data_version, "versions": list_versions()}
+
+
+@router.get("/diff")
+async def get_diff(
+    from_version: int = Query(..., alias="from"),
+    to_version: Optional[int] = Query(None, alias="to", description="Defaults to the current version"),
+):
+    """Tasks added, removed and changed (per column) between two retained versions."""
+    if to_version is None:
+        to_version = state.data_version
+
+    old = get_version(from_version)
+    new = get_version(to_version)
+    missing = [str(version) for version, entry in ((from_version, old), (to_version, new)) if entry is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Version(s) not retained: {', '.join(missing)}")
+
+    return diff_versions(old, new)
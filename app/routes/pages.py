@@ -4,10 +4,13 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
+from app.services.assets import asset_url
+from app.services.rollups import summarize
 import app.state as state
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
+templates.env.globals["asset_url"] = asset_url
 
 router = APIRouter()
 
@@ -15,11 +18,16 @@ router = APIRouter()
 @router.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     return templates.TemplateResponse(
+        request,
         "index.html",
         {
-            "request": request,
             "all_sheets_data": state.cached_data["all_sheets_data"],
             "sheet_names": state.cached_data["sheet_names"],
             "data_version": state.data_version,
+            "stale": state.cached_data["stale"],
+            "last_updated": state.cached_data["last_updated"],
+            "summary": summarize(state.rollups, state.cached_data["sheet_names"]),
+            "schema": state.cached_data["schema"],
+            "evicted_sheets": state.cached_data["evicted_sheets"],
         },
     )
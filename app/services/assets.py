@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip variants are served.
+    brotli = None
+
+from app.config import ASSET_COMPRESS_MIN_BYTES
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+STATIC_DIR = BASE_DIR / "static"
+
+ASSET_PREFIX = "/assets/"
+ASSET_SUFFIXES = {".css", ".js"}
+# Hashed URLs never change content, so browsers can keep them without revalidating.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Hashed path ("js/app.1a2b3c4d5e6f.js") -> {"body", "gzip", "br", "media_type", "etag"}
+_assets = {}
+# Source path under static/ ("js/app.js") -> hashed URL
+_urls = {}
+
+
+def build_assets():
+    """Fingerprint and precompress static CSS/JS once."""
+    global _assets, _urls
+
+    assets = {}
+    urls = {}
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if not path.is_file() or path.suffix not in ASSET_SUFFIXES:
+            continue
+        source = path.relative_to(STATIC_DIR).as_posix()
+        body = path.read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        hashed = f"{source[:-len(path.suffix)]}.{digest}{path.suffix}"
+
+        assets[hashed] = {
+            "body": body,
+            "gzip": _compress(body, "gzip"),
+            "br": _compress(body, "br"),
+            "media_type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            "etag": f'"{digest}"',
+        }
+        urls[source] = ASSET_PREFIX + hashed
+
+    _assets = assets
+    _urls = urls
+    print(f"Prepared {len(assets)} static assets (brotli {'on' if brotli else 'off'})")
+
+
+def asset_url(source):
+    """Fingerprinted URL for a file under static/, or its plain /static URL before build_assets runs."""
+    return _urls.get(source, f"/static/{source}")
+
+
+def get_asset(hashed):
+    return _assets.get(hashed)
+
+
+def pick_encoding(asset, accept_encoding):
+    """Return (body, content_encoding) for the best precompressed variant the client accepts."""
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and asset[encoding] is not None:
+            return asset[encoding], encoding
+    return asset["body"], None
+
+
+# --- Private helpers ---
+
+def _compress(body, encoding):
+    if len(body) < ASSET_COMPRESS_MIN_BYTES:
+        return None
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=11)
+    return None
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
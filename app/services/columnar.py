@@ -0,0 +1,108 @@
+import json
+import threading
+
+# Interned workbook paths; indexes never change, so cached sheet blocks stay valid.
+_files_lock = threading.Lock()
+_files = []
+_file_ids = {}
+
+# Sheet name -> (tasks dict, encoded JSON block); published sheet dicts are never mutated
+_block_cache = {}
+
+_MAX_SAFE_INTEGER = 2 ** 53
+# Values of these types always render the same in Python and JavaScript.
+_SAFE_TYPES = {str, type(None)}
+
+
+def encode_columnar(all_sheets_data, sheet_names, extra, cache=True):
+    """Encode a snapshot as compact columnar JSON text (see decodeColumnar in static/js/app.js).
+
+    Each sheet sends its distinct column lists once and one array per task:
+    [task_name, task_id, file_index, row_index, column_set_index, *values]. The values follow
+    the column set, skipping the first column (it is the task name). "details" is rebuilt by the
+    client and only sent, as one trailing element, when a value would not render the same in
+    JavaScript. Entries without metadata are sent as [task_name, null, details].
+    Pass cache=False for one-off snapshots (e.g. history) so the current version's blocks stay cached.
+    """
+    global _block_cache
+
+    blocks = []
+    next_cache = {}
+    for sheet_name in sheet_names:
+        tasks = all_sheets_data.get(sheet_name)
+        if tasks is None:
+            continue
+        cached = _block_cache.get(sheet_name)
+        if cached is not None and cached[0] is tasks:
+            block = cached[1]
+        else:
+            block = _encode_sheet(tasks)
+        next_cache[sheet_name] = (tasks, block)
+        blocks.append(f"{json.dumps(sheet_name)}:{block}")
+    if cache:
+        _block_cache = next_cache
+
+    with _files_lock:
+        files = list(_files)
+
+    header = json.dumps({"format": "columnar", "files": files, **extra}, default=str)
+    return f'{header[:-1]}, "sheets": {{{",".join(blocks)}}}}}'
+
+
+def release_sheet(sheet_name):
+    """Drop an evicted sheet's cached block; it is not sent until the sheet is resident again."""
+    _block_cache.pop(sheet_name, None)
+
+
+# --- Private helpers ---
+
+def _encode_sheet(tasks):
+    column_sets = []
+    column_set_ids = {}
+    rows = []
+    for task_name, instances in tasks.items():
+        for instance in instances:
+            metadata = instance.get("metadata") if isinstance(instance, dict) else None
+            if not metadata:
+                details = instance.get("details", "") if isinstance(instance, dict) else instance
+                rows.append([task_name, None, details])
+                continue
+
+            columns = metadata["columns"]
+            key = tuple(columns)
+            column_set = column_set_ids.get(key)
+            if column_set is None:
+                column_set = column_set_ids[key] = len(column_sets)
+                column_sets.append(columns)
+
+            raw_values = metadata["raw_values"]
+            values = [raw_values.get(col) for col in columns[1:]]
+            row = [task_name, metadata["task_id"], _file_id(metadata["file_path"]), metadata["row_index"], column_set, *values]
+            if not _SAFE_TYPES.issuperset(map(type, values)) and not all(map(_renders_same, values)):
+                row.append(instance["details"])
+            rows.append(row)
+
+    return json.dumps({"column_sets": column_sets, "rows": rows}, default=str, separators=(",", ":"))
+
+
+def _file_id(path):
+    file_id = _file_ids.get(path)
+    if file_id is None:
+        with _files_lock:
+            file_id = _file_ids.get(path)
+            if file_id is None:
+                file_id = _file_ids[path] = len(_files)
+                _files.append(path)
+    return file_id
+
+
+def _renders_same(value):
+    # True when JavaScript's String(value) matches Python's str(value) used by build_details.
+    if value is None or isinstance(value, (str, bool)):
+        return True
+    if isinstance(value, int):
+        return abs(value) < _MAX_SAFE_INTEGER
+    if isinstance(value, float):
+        text = repr(value)
+        return not value.is_integer() and "e" not in text and "n" not in text
+    return False
@@ -1,72 +1,107 @@
 import os
 import re
+import threading
 import time
-from datetime import datetime, date
-
-import pandas as pd
+from datetime import datetime
 
 from app.config import FILE_PATHS, MAX_RELOAD_RETRIES, RELOAD_RETRY_DELAY, READ_RETRY_DELAY, READ_RETRY_ATTEMPTS
-from app.services.excel_io import safe_read_excel, safe_get_sheet_names
+from app.services.deadline_scheduler import reschedule
+from app.services.excel_io import safe_open_workbook
+from app.services.history import record_version, share_unchanged_rows
+from app.services.profiling import profile_operation, span
+from app.services.rollups import compute_rollups
+from app.services.schema import infer_schema, merge_schemas, normalize_row
+from app.services.sheet_cache import enforce_budget
+from app.services.snapshot_store import load_snapshot, schedule_snapshot_save
+from app.services.task_index import build_index, task_id_for
 import app.state as state
 
+_ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
 
-def load_all_sheets_data():
-    """Load and parse all sheets from all configured Excel files."""
-    all_data = {}
-    valid_sheet_names = []
-
-    for file_path in FILE_PATHS:
-        abs_file_path = os.path.abspath(file_path)
-
-        sheet_names = None
-        for attempt in range(READ_RETRY_ATTEMPTS):
-            try:
-                sheet_names = safe_get_sheet_names(abs_file_path)
-                break
-            except Exception as e:
-                if attempt < READ_RETRY_ATTEMPTS - 1:
-                    time.sleep(READ_RETRY_DELAY)
-                else:
-                    print(f"Error opening file '{file_path}' after {READ_RETRY_ATTEMPTS} attempts: {e}")
-
-        if sheet_names is None:
-            continue
-
-        for sheet_name in sheet_names:
-            if re.match(r"^sheet\d+$", sheet_name.lower().strip()):
-                print(f"Skipping default sheet name: '{sheet_name}'")
-                continue
+# (abs_file_path, sheet_name) -> {"fingerprint", "tasks", "schema"} from the last load. Parsed task
+# dicts are never mutated after parsing, so an unchanged part is reused as is; "tasks" is None once
+# the sheet has been evicted under the memory budget.
+_parsed_parts = {}
+# Sheet name -> (pieces, merged dict) for sheets that appear in several workbooks
+_merged_sheets = {}
 
-            try:
-                df = _read_sheet_with_retry(abs_file_path, sheet_name)
 
-                if df is None or df.empty or len(df.columns) < 2:
-                    print(f"Warning: Skipping empty sheet '{sheet_name}' in '{file_path}'")
-                    continue
+def load_all_sheets_data():
+    """Load and parse all sheets from all configured Excel files.
 
-                valid_cols = _get_valid_columns(df)
-                if len(valid_cols) < 2:
-                    print(f"Warning: Skipping sheet '{sheet_name}' in '{file_path}' - not enough named columns")
-                    continue
+    Returns (all_data, sheet_names, schema) where schema maps each sheet to its inferred column types.
+    Each workbook is read once; sheets whose zip parts are unchanged since the last load are reused
+    instead of re-parsed.
+    """
+    global _parsed_parts
 
-                all_columns = [str(col) for col in valid_cols]
-                df = df[valid_cols]
-                df = _trim_to_first_empty_row(df)
+    all_data = {}
+    valid_sheet_names = []
+    schema = {}
+    next_parts = {}
+    parsed = reused = 0
+
+    workbooks = []
+    try:
+        # Sheet name -> [(abs_file_path, excel_file, fingerprint)] in first-seen order
+        sheet_sources = {}
+        for file_path in FILE_PATHS:
+            abs_file_path = os.path.abspath(file_path)
+            workbook = _open_workbook_with_retry(abs_file_path, file_path)
+            if workbook is None:
+                continue
+            excel_file, fingerprints = workbook
+            workbooks.append(excel_file)
 
-                if df.empty:
-                    print(f"Warning: Skipping sheet '{sheet_name}' in '{file_path}' - no valid data")
+            for sheet_name in excel_file.sheet_names:
+                if re.match(r"^sheet\d+$", sheet_name.lower().strip()):
+                    print(f"Skipping default sheet name: '{sheet_name}'")
                     continue
+                fingerprint = fingerprints.get(sheet_name) if fingerprints else None
+                sheet_sources.setdefault(sheet_name, []).append((abs_file_path, excel_file, fingerprint))
+
+        evicted = state.cached_data.get("evicted_sheets", {})
+        for sheet_name, sources in sheet_sources.items():
+            if sheet_name in evicted and _still_evicted(sheet_name, sources, evicted[sheet_name]):
+                # Unchanged and evicted under the memory budget: leave it out (see services/sheet_cache.py).
+                sheet_schema = {}
+                for abs_file_path, _, _ in sources:
+                    part = _parsed_parts[(abs_file_path, sheet_name)]
+                    next_parts[(abs_file_path, sheet_name)] = part
+                    sheet_schema = merge_schemas(sheet_schema, part["schema"])
+                valid_sheet_names.append(sheet_name)
+                schema[sheet_name] = sheet_schema
+                reused += len(sources)
+                continue
 
-                if sheet_name not in all_data:
-                    all_data[sheet_name] = {}
-                    valid_sheet_names.append(sheet_name)
-
-                _parse_rows(df, sheet_name, abs_file_path, all_columns, all_data)
-                print(f"Loaded sheet '{sheet_name}' from '{file_path}'")
-
-            except Exception as e:
-                print(f"Error loading sheet '{sheet_name}' from '{file_path}': {e}")
+            pieces = []
+            sheet_schema = {}
+            for abs_file_path, excel_file, fingerprint in sources:
+                part = _parsed_parts.get((abs_file_path, sheet_name))
+                if part is not None and fingerprint is not None and part["fingerprint"] == fingerprint and part["tasks"] is not None:
+                    reused += 1
+                else:
+                    result = _parse_sheet(excel_file, abs_file_path, sheet_name)
+                    if result is None:
+                        continue
+                    # Rows that did not change stay the same objects, so history versions share them.
+                    tasks = share_unchanged_rows(part["tasks"] if part is not None else None, result[0])
+                    part = {"fingerprint": fingerprint, "tasks": tasks, "schema": result[1]}
+                    parsed += 1
+                next_parts[(abs_file_path, sheet_name)] = part
+                pieces.append(part["tasks"])
+                sheet_schema = merge_schemas(sheet_schema, part["schema"])
+
+            if not pieces:
                 continue
+            all_data[sheet_name] = _merge_pieces(sheet_name, pieces)
+            valid_sheet_names.append(sheet_name)
+            schema[sheet_name] = sheet_schema
+    finally:
+        for excel_file in workbooks:
+            excel_file.close()
+
+    _parsed_parts = next_parts
 
     if not valid_sheet_names:
         print("Warning: No valid sheets found, creating default")
@@ -78,15 +113,134 @@ def load_all_sheets_data():
         }
         valid_sheet_names = ["Default"]
 
-    print(f"Total sheets loaded: {len(valid_sheet_names)}")
-    return all_data, valid_sheet_names
+    print(f"Total sheets loaded: {len(valid_sheet_names)} ({parsed} parsed, {reused} unchanged)")
+    return all_data, valid_sheet_names, schema
+
+
+def load_sheet(sheet_name, abs_file_paths, keep=True):
+    """Parse one sheet from the given files. Returns (tasks, schema); tasks is None if nothing loaded.
+
+    With keep=False the parsed rows are not remembered for reuse by the next reload.
+    """
+    pieces = []
+    schema = {}
+    for abs_file_path in abs_file_paths:
+        workbook = _open_workbook_with_retry(abs_file_path, os.path.basename(abs_file_path))
+        if workbook is None:
+            continue
+        excel_file, fingerprints = workbook
+        try:
+            result = _parse_sheet(excel_file, abs_file_path, sheet_name)
+        finally:
+            excel_file.close()
+        if result is None:
+            continue
+
+        tasks, sheet_schema = result
+        pieces.append(tasks)
+        schema = merge_schemas(schema, sheet_schema)
+        if keep:
+            fingerprint = fingerprints.get(sheet_name) if fingerprints else None
+            _parsed_parts[(abs_file_path, sheet_name)] = {"fingerprint": fingerprint, "tasks": tasks, "schema": sheet_schema}
+
+    if not pieces:
+        return None, schema
+    return _merge_pieces(sheet_name, pieces), schema
+
+
+def drop_parsed_rows(sheet_name):
+    """Forget a sheet's parsed rows (kept for reuse) so an evicted sheet really leaves memory."""
+    _merged_sheets.pop(sheet_name, None)
+    for (abs_file_path, name), part in list(_parsed_parts.items()):
+        if name == sheet_name and part["tasks"] is not None:
+            _parsed_parts[(abs_file_path, name)] = {**part, "tasks": None}
 
 
 def reload_data():
     """Reload data from Excel files and notify connected clients."""
+    with profile_operation("reload_data"):
+        _reload_with_retries()
+
+
+def warm_start():
+    """Serve the last persisted snapshot (marked stale) until the first reload finishes."""
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return False
+
+    state.cached_data.update(snapshot["cached_data"])
+    state.cached_data["stale"] = True
+    state.rollups = compute_rollups(state.cached_data["all_sheets_data"], state.cached_data["sheet_names"])
+    state.task_index = build_index(state.cached_data["all_sheets_data"], state.cached_data["sheet_names"])
+    state.data_version = snapshot["data_version"]
+    record_version(
+        state.data_version,
+        state.cached_data["all_sheets_data"],
+        state.cached_data["sheet_names"],
+        state.cached_data["schema"],
+        state.cached_data["last_updated"],
+    )
+    return True
+
+
+def publish_snapshot(all_sheets_data, sheet_names, stale=False, schema=None):
+    """Swap in a new snapshot, bump the version and notify clients.
+
+    Callers must treat published data as immutable and build a new dict to change it.
+    The column schema is kept as is unless a new one is given (edits do not change it).
+    """
+    # Sheets missing from the new data stay evicted; sheets it contains are resident again.
+    state.cached_data["evicted_sheets"] = {
+        name: descriptor
+        for name, descriptor in state.cached_data["evicted_sheets"].items()
+        if name in sheet_names and name not in all_sheets_data
+    }
+    state.cached_data["all_sheets_data"] = all_sheets_data
+    state.cached_data["sheet_names"] = sheet_names
+    if schema is not None:
+        state.cached_data["schema"] = schema
+    state.cached_data["last_updated"] = datetime.now().isoformat()
+    state.cached_data["stale"] = stale
+    state.rollups = compute_rollups(all_sheets_data, sheet_names)
+    state.task_index = build_index(all_sheets_data, sheet_names)
+    enforce_budget()
+    state.data_version += 1
+    record_version(
+        state.data_version,
+        state.cached_data["all_sheets_data"],
+        sheet_names,
+        state.cached_data["schema"],
+        state.cached_data["last_updated"],
+    )
+    reschedule()
+
+    _notify_clients()
+    schedule_snapshot_save(state.cached_data, state.data_version)
+
+
+def build_details(columns, raw_values):
+    """Build the "Column: value" text shown for a task (the first column is the task name)."""
+    details = []
+    for col in columns[1:]:
+        value = raw_values.get(col)
+        if value is not None and str(value).strip():
+            details.append(f"{col}: {_display_value(value)}")
+    return "\n".join(details)
+
+
+def start_background_reload():
+    """Run the initial full reload off the startup path."""
+    thread = threading.Thread(target=reload_data, name="initial-reload", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Private helpers ---
+
+def _reload_with_retries():
     for attempt in range(MAX_RELOAD_RETRIES):
         try:
-            all_sheets_data, sheet_names = load_all_sheets_data()
+            all_sheets_data, sheet_names, schema = load_all_sheets_data()
 
             has_real_data = _validate_data(all_sheets_data)
 
@@ -99,14 +253,13 @@ def reload_data():
                     print(f"[{datetime.now().strftime('%H:%M:%S')}] Warning: Could not read valid data after {MAX_RELOAD_RETRIES} attempts, keeping previous data")
                     return
 
-            state.cached_data["all_sheets_data"] = all_sheets_data
-            state.cached_data["sheet_names"] = sheet_names
-            state.cached_data["last_updated"] = datetime.now().isoformat()
-            state.data_version += 1
+            from app.services.edit_journal import overlay_pending_edits
 
+            with state.snapshot_lock:
+                _keep_rehydrated_sheets(all_sheets_data, sheet_names)
+                # Edits still waiting in the journal are not in the workbook yet; keep showing them.
+                publish_snapshot(overlay_pending_edits(all_sheets_data, schema), sheet_names, schema=schema)
             print(f"[{datetime.now().strftime('%H:%M:%S')}] Data reloaded (version {state.data_version})")
-
-            _notify_clients()
             return
 
         except Exception as e:
@@ -117,20 +270,92 @@ def reload_data():
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] Error reloading data after {MAX_RELOAD_RETRIES} attempts: {e}")
 
 
-# --- Private helpers ---
+def _keep_rehydrated_sheets(all_sheets_data, sheet_names):
+    # A sheet left out as evicted may have been re-read on demand while this load ran.
+    current = state.cached_data["all_sheets_data"]
+    evicted = state.cached_data["evicted_sheets"]
+    for sheet_name in sheet_names:
+        if sheet_name not in all_sheets_data and sheet_name not in evicted and sheet_name in current:
+            all_sheets_data[sheet_name] = current[sheet_name]
 
-def _read_sheet_with_retry(file_path, sheet_name):
-    for read_attempt in range(READ_RETRY_ATTEMPTS):
+
+def _open_workbook_with_retry(abs_file_path, file_path):
+    for attempt in range(READ_RETRY_ATTEMPTS):
         try:
-            return safe_read_excel(file_path, sheet_name=sheet_name)
-        except Exception as read_err:
-            if read_attempt < READ_RETRY_ATTEMPTS - 1:
+            return safe_open_workbook(abs_file_path)
+        except Exception as e:
+            if attempt < READ_RETRY_ATTEMPTS - 1:
                 time.sleep(READ_RETRY_DELAY)
             else:
-                raise read_err
+                print(f"Error opening file '{file_path}' after {READ_RETRY_ATTEMPTS} attempts: {e}")
     return None
 
 
+def _still_evicted(sheet_name, sources, descriptor):
+    """True if every part of an evicted sheet is unchanged since it was last parsed."""
+    if {abs_file_path for abs_file_path, _, _ in sources} != {entry["file_path"] for entry in descriptor["files"]}:
+        return False
+    for abs_file_path, _, fingerprint in sources:
+        part = _parsed_parts.get((abs_file_path, sheet_name))
+        if part is None or fingerprint is None or part["fingerprint"] != fingerprint:
+            return False
+    return True
+
+
+def _parse_sheet(excel_file, abs_file_path, sheet_name):
+    """Parse one sheet of an open workbook. Returns (tasks, schema), or None if the sheet is skipped."""
+    file_name = os.path.basename(abs_file_path)
+    try:
+        with span("pd.read_excel", file=file_name, sheet=sheet_name):
+            # Cells keep the types Excel stored: text such as "1.10" stays text (see services/schema.py).
+            df = excel_file.parse(sheet_name, dtype=object)
+
+        if df is None or df.empty or len(df.columns) < 2:
+            print(f"Warning: Skipping empty sheet '{sheet_name}' in '{file_name}'")
+            return None
+
+        valid_cols = _get_valid_columns(df)
+        if len(valid_cols) < 2:
+            print(f"Warning: Skipping sheet '{sheet_name}' in '{file_name}' - not enough named columns")
+            return None
+
+        all_columns = [str(col) for col in valid_cols]
+        df = df[valid_cols]
+        df = _trim_to_first_empty_row(df)
+
+        if df.empty:
+            print(f"Warning: Skipping sheet '{sheet_name}' in '{file_name}' - no valid data")
+            return None
+
+        with span("_parse_rows", file=file_name, sheet=sheet_name, rows=len(df)):
+            result = _parse_rows(df, sheet_name, abs_file_path, all_columns)
+        print(f"Loaded sheet '{sheet_name}' from '{file_name}'")
+        return result
+
+    except Exception as e:
+        print(f"Error loading sheet '{sheet_name}' from '{file_name}': {e}")
+        return None
+
+
+def _merge_pieces(sheet_name, pieces):
+    # Unchanged sheets keep their identity across reloads, so rollups and the task index reuse
+    # their per-sheet caches: a single-workbook sheet is the parsed dict itself, and a merged
+    # sheet is reused while all of its pieces are.
+    if len(pieces) == 1:
+        return pieces[0]
+
+    cached = _merged_sheets.get(sheet_name)
+    if cached is not None and len(cached[0]) == len(pieces) and all(a is b for a, b in zip(cached[0], pieces)):
+        return cached[1]
+
+    merged = {}
+    for tasks in pieces:
+        for task_name, instances in tasks.items():
+            merged[task_name] = merged.get(task_name, []) + instances
+    _merged_sheets[sheet_name] = (pieces, merged)
+    return merged
+
+
 def _get_valid_columns(df):
     valid_cols = []
     for col in df.columns:
@@ -142,6 +367,8 @@ def _get_valid_columns(df):
 
 
 def _trim_to_first_empty_row(df):
+    import pandas as pd
+
     task_name_col = df.columns[0]
     cut_index = None
     for i, value in enumerate(df[task_name_col]):
@@ -153,30 +380,37 @@ def _trim_to_first_empty_row(df):
     return df
 
 
-def _parse_rows(df, sheet_name, abs_file_path, all_columns, all_data):
+def _parse_rows(df, sheet_name, abs_file_path, all_columns):
+    """Parse one sheet's rows into typed, normalized task entries. Returns (tasks, schema)."""
+    import pandas as pd
+
     task_name_col = df.columns[0]
+    rows = []
     for row_idx, (_, row) in enumerate(df.iterrows()):
         task_name = str(row[task_name_col])
         if task_name == "nan" or not task_name.strip():
             continue
 
-        details = []
         raw_values = {}
         for col in df.columns:
             value = row[col]
-            if pd.isna(value):
-                raw_values[str(col)] = None
-            elif isinstance(value, (pd.Timestamp, datetime, date)):
-                raw_values[str(col)] = value.isoformat()
-            else:
-                raw_values[str(col)] = value
+            raw_values[str(col)] = None if pd.isna(value) else value
+        rows.append((row_idx, task_name, raw_values))
+
+    sheet_schema = infer_schema(all_columns, [raw_values for _, _, raw_values in rows])
+
+    tasks = {}
 
-            if col != task_name_col and pd.notna(value) and str(value).strip():
-                details.append(f"{col}: {value}")
+    for row_idx, task_name, raw_values in rows:
+        raw_values = normalize_row(sheet_schema, raw_values)
+        # The task name is matched against the workbook on save, so it is kept verbatim.
+        raw_values[all_columns[0]] = task_name
+        occurrence = len(tasks.get(task_name, ()))
 
         entry = {
-            "details": "\n".join(details),
+            "details": build_details(all_columns, raw_values),
             "metadata": {
+                "task_id": task_id_for(abs_file_path, sheet_name, task_name, occurrence),
                 "file_path": abs_file_path,
                 "sheet_name": sheet_name,
                 "row_index": row_idx,
@@ -186,9 +420,18 @@ def _parse_rows(df, sheet_name, abs_file_path, all_columns, all_data):
             },
         }
 
-        if task_name not in all_data[sheet_name]:
-            all_data[sheet_name][task_name] = []
-        all_data[sheet_name][task_name].append(entry)
+        if task_name not in tasks:
+            tasks[task_name] = []
+        tasks[task_name].append(entry)
+
+    return tasks, sheet_schema
+
+
+def _display_value(value):
+    # Dates are stored as ISO strings; show them the way pandas prints timestamps.
+    if isinstance(value, str) and _ISO_DATETIME.match(value):
+        return value.replace("T", " ", 1)
+    return value
 
 
 def _validate_data(all_sheets_data):
@@ -0,0 +1,126 @@
+import heapq
+import threading
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from app.config import DEADLINE_RECHECK_SECONDS, DUE_SOON_DAYS
+from app.services.rollups import summarize
+import app.state as state
+
+DUE_SOON = "due_soon"
+OVERDUE = "overdue"
+
+_condition = threading.Condition()
+# (moment, kind, deadline, {sheet_name: open task count}); the earliest threshold is first
+_heap = []
+_rebuild_needed = False
+_thread = None
+
+
+def start_deadline_scheduler():
+    """Start the thread that pushes a `deadline` SSE event whenever open tasks become due soon or overdue."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_scheduler_loop, name="deadline-scheduler", daemon=True)
+        _thread.start()
+    reschedule()
+    return _thread
+
+
+def reschedule():
+    """Rebuild the thresholds from the published rollups (called on every publish)."""
+    global _rebuild_needed
+    with _condition:
+        _rebuild_needed = True
+        _condition.notify()
+
+
+def scheduler_status():
+    """Next upcoming threshold, for /health."""
+    with _condition:
+        if not _heap:
+            return {"scheduled": 0, "next": None}
+        moment, kind, deadline, sheets = _heap[0]
+        return {
+            "scheduled": len(_heap),
+            "next": {"at": moment.isoformat(), "kind": kind, "deadline": deadline.isoformat(), "count": sum(sheets.values())},
+        }
+
+
+# --- Private helpers ---
+
+def _scheduler_loop():
+    global _heap, _rebuild_needed
+
+    while True:
+        with _condition:
+            now = datetime.now()
+            crossed = []
+            # Pop before rebuilding: the new heap starts after now, so a threshold that passed
+            # while we were not running (e.g. a suspend) would otherwise never be announced.
+            while _heap and _heap[0][0] <= now:
+                crossed.append(heapq.heappop(_heap))
+
+            if _rebuild_needed:
+                _rebuild_needed = False
+                _heap = _build_heap(state.rollups, now)
+
+            if not crossed:
+                # Wake at the next threshold, but re-read the clock regularly in case it jumps (sleep, DST).
+                timeout = DEADLINE_RECHECK_SECONDS
+                if _heap:
+                    timeout = min(timeout, max((_heap[0][0] - now).total_seconds(), 0.05))
+                _condition.wait(timeout)
+                continue
+
+        try:
+            _broadcast(crossed)
+        except Exception as exc:
+            print(f"Error sending deadline event: {exc}")
+
+
+def _build_heap(rollups, now):
+    # Rollups keep open tasks per deadline date for every sheet, including evicted ones.
+    per_date = {}
+    for sheet_name, sheet_rollup in rollups["sheets"].items():
+        for deadline, count in sheet_rollup["counts"]["open_deadlines"].items():
+            per_date.setdefault(deadline, Counter())[sheet_name] += count
+
+    heap = []
+    for deadline, sheets in per_date.items():
+        # Same windows as rollups.summarize: due soon from DUE_SOON_DAYS before, overdue the day after.
+        thresholds = (
+            (DUE_SOON, _start_of(deadline - timedelta(days=DUE_SOON_DAYS))),
+            (OVERDUE, _start_of(deadline + timedelta(days=1))),
+        )
+        for kind, moment in thresholds:
+            if moment > now:
+                heap.append((moment, kind, deadline, dict(sheets)))
+    heapq.heapify(heap)
+    return heap
+
+
+def _broadcast(crossed):
+    summary = summarize(state.rollups, state.cached_data["sheet_names"])
+    event = {
+        "crossings": [
+            {"kind": kind, "deadline": deadline.isoformat(), "count": sum(sheets.values()), "sheets": sheets}
+            for _, kind, deadline, sheets in crossed
+        ],
+        "totals": {"overdue": summary["totals"]["overdue"], "due_soon": summary["totals"]["due_soon"]},
+        "sheets": {
+            sheet_name: {"overdue": counts["overdue"], "due_soon": counts["due_soon"]}
+            for sheet_name, counts in summary["sheets"].items()
+        },
+        "version": state.data_version,
+    }
+
+    for client in list(state.connected_clients):
+        client["events"].append(("deadline", event))
+
+    crossed_count = sum(crossing["count"] for crossing in event["crossings"])
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {crossed_count} task(s) crossed a deadline window; notified {len(state.connected_clients)} client(s)")
+
+
+def _start_of(day):
+    return datetime.combine(day, time.min)
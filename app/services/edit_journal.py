@@ -0,0 +1,436 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.config import (
+    JOURNAL_COMPACT_BATCH,
+    JOURNAL_COMPACT_DELAY_SECONDS,
+    JOURNAL_COMPACT_INTERVAL_SECONDS,
+    JOURNAL_COMPACT_WORKERS,
+    JOURNAL_PATH,
+)
+from app.services.file_locks import file_write
+from app.services.path_guard import normalize_path
+from app.services.profiling import profile_operation
+from app.services.schema import normalize_edit
+from app.services.task_index import task_id_for
+from app.services.workbook_writer import EditRejected, apply_edits, is_workbook_locked, journal_mark
+
+# Guards the journal file, the pending list and the sequence counter.
+_journal_lock = threading.RLock()
+_pending = []
+_next_seq = 1
+# Identifies this journal in the marks written into workbooks (see workbook_writer.JOURNAL_MARK_PROPERTY).
+# The journal starts with a header record keeping it and the sequence counter across rewrites.
+_journal_id = uuid.uuid4().hex
+_processed_lines = 0
+_recent_rejections = deque(maxlen=50)
+
+_wake = threading.Event()
+_compactor = None
+
+# Rewrite the journal file once this many applied/rejected records have accumulated.
+_REWRITE_THRESHOLD = 500
+
+
+def load_journal():
+    """Read the journal from disk and restore the edits that have not reached their workbook yet.
+
+    Edits a workbook already holds (written just before a crash, without their "applied"
+    record) are dropped rather than replayed. The journal is then rewritten with only the
+    pending edits.
+    """
+    global _next_seq, _journal_id
+
+    entries = {}
+    done = set()
+    max_seq = 0
+    journal_id = None
+
+    if os.path.isfile(JOURNAL_PATH):
+        with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append was never acknowledged.
+                    print(f"Warning: Skipping unreadable journal line in '{JOURNAL_PATH}'")
+                    continue
+
+                if record.get("op") in ("update", "add"):
+                    entries[record["seq"]] = record
+                    max_seq = max(max_seq, record["seq"])
+                elif record.get("op") == "applied":
+                    done.update(record["seqs"])
+                elif record.get("op") == "rejected":
+                    done.add(record["seq"])
+                elif record.get("op") == "header":
+                    journal_id = record["journal_id"]
+                    max_seq = max(max_seq, record["next_seq"] - 1)
+
+    pending = [entries[seq] for seq in sorted(entries) if seq not in done]
+    if journal_id is not None and pending:
+        marks = {}
+        for entry in pending:
+            if entry["file_path"] not in marks:
+                try:
+                    marks[entry["file_path"]] = journal_mark(entry["file_path"], journal_id)
+                except OSError:
+                    marks[entry["file_path"]] = 0
+        written = [entry for entry in pending if entry["seq"] <= marks[entry["file_path"]]]
+        if written:
+            print(f"Skipping {len(written)} journaled edit(s) already written to Excel")
+            pending = [entry for entry in pending if entry["seq"] > marks[entry["file_path"]]]
+
+    with _journal_lock:
+        _pending[:] = pending
+        _next_seq = max_seq + 1
+        _journal_id = journal_id or uuid.uuid4().hex
+        _rewrite_journal()
+
+    if _pending:
+        print(f"Replaying {len(_pending)} journaled edit(s) not yet written to Excel")
+        _wake.set()
+    return len(_pending)
+
+
+def record_edit(edit):
+    """Durably append an edit (fsync) and return it with its sequence number."""
+    global _next_seq
+
+    with _journal_lock:
+        entry = {"seq": _next_seq, "ts": datetime.now().isoformat(), **edit}
+        _append_records([entry])
+        _next_seq += 1
+        _pending.append(entry)
+
+    _wake.set()
+    return entry
+
+
+def pending_edits():
+    with _journal_lock:
+        return list(_pending)
+
+
+def journal_status():
+    with _journal_lock:
+        pending_files = {entry["file_path"] for entry in _pending}
+        return {
+            "pending": len(_pending),
+            "pending_files": len(pending_files),
+            "recent_rejections": list(_recent_rejections),
+        }
+
+
+def overlay_pending_edits(all_sheets_data, schema, sheet_name=None):
+    """Re-apply edits that are journaled but not yet in the workbook onto freshly loaded data."""
+    for entry in pending_edits():
+        if sheet_name is not None and entry["sheet_name"] != sheet_name:
+            continue
+        try:
+            all_sheets_data = apply_to_snapshot(all_sheets_data, entry, schema)
+        except EditRejected as exc:
+            print(f"Warning: Journaled edit #{entry['seq']} no longer applies to loaded data: {exc}")
+    return all_sheets_data
+
+
+def apply_to_snapshot(all_sheets_data, entry, schema):
+    """Return a new all_sheets_data with the edit applied.
+
+    Only the touched sheet, task lists and entry are copied; everything else is
+    shared with the input, which is never modified. Values are normalized with
+    the sheet's column schema, the way a reload would read them back.
+    """
+    from app.services.data_loader import build_details
+
+    sheet_name = entry["sheet_name"]
+    tasks = all_sheets_data.get(sheet_name)
+    if tasks is None:
+        raise EditRejected("Sheet not found", 404)
+
+    new_tasks = dict(tasks)
+    sheet_schema = schema.get(sheet_name, {})
+
+    if entry["op"] == "add":
+        file_entries = [
+            instance for instances in tasks.values() for instance in instances
+            if _same_file(instance, entry["file_path"])
+        ]
+        if not file_entries:
+            raise EditRejected("Sheet not found", 404)
+
+        columns = list(file_entries[0]["metadata"]["columns"])
+        unknown_columns = [col for col in entry["values"] if col not in columns]
+        if unknown_columns:
+            raise EditRejected(f"Unknown column(s): {', '.join(unknown_columns)}")
+
+        raw_values = {col: None for col in columns}
+        raw_values[columns[0]] = entry["task_name"]
+        _assign_values(raw_values, columns, sheet_schema, entry["values"], entry["new_columns"])
+
+        task_name = entry["task_name"]
+        file_path = file_entries[0]["metadata"]["file_path"]
+        row_index = max(instance["metadata"]["row_index"] for instance in file_entries) + 1
+        # The new row comes last, so it follows every row of this file with the same name.
+        occurrence = sum(1 for instance in tasks.get(task_name, ()) if _same_file(instance, file_path))
+        new_entry = {
+            "details": build_details(columns, raw_values),
+            "metadata": {
+                "task_id": task_id_for(file_path, sheet_name, task_name, occurrence),
+                "file_path": file_path,
+                "sheet_name": sheet_name,
+                "row_index": row_index,
+                "columns": columns,
+                "raw_values": raw_values,
+                "task_name": task_name,
+            },
+        }
+        new_tasks[task_name] = list(new_tasks.get(task_name, [])) + [new_entry]
+    else:
+        # Rows are grouped by task name, so the expected name finds the row without scanning the sheet.
+        found = _find_instance({entry["task_name"]: tasks.get(entry["task_name"], [])}, entry["file_path"], entry["row_index"])
+        if found is None:
+            # Renamed since the client loaded it (reported as a conflict below).
+            found = _find_instance(tasks, entry["file_path"], entry["row_index"])
+        if found is None:
+            raise EditRejected("Invalid row index")
+
+        old_name, position, old_entry = found
+        metadata = old_entry["metadata"]
+        if metadata["task_name"] != entry["task_name"]:
+            raise EditRejected(
+                f"Row position changed. Expected '{entry['task_name']}' but found '{metadata['task_name']}'. Please refresh and try again.",
+                409,
+            )
+
+        columns = list(metadata["columns"])
+        unknown_columns = [col for col in entry["updates"] if col not in columns]
+        if unknown_columns:
+            raise EditRejected(f"Unknown column(s): {', '.join(unknown_columns)}")
+
+        raw_values = dict(metadata["raw_values"])
+        _assign_values(raw_values, columns, sheet_schema, entry["updates"], entry["new_columns"])
+
+        task_name = raw_values.get(columns[0])
+        if task_name is None or not str(task_name).strip():
+            raise EditRejected("Task name cannot be blank")
+        task_name = str(task_name)
+
+        new_entry = {
+            "details": build_details(columns, raw_values),
+            "metadata": {**metadata, "columns": columns, "raw_values": raw_values, "task_name": task_name},
+        }
+
+        instances = list(tasks[old_name])
+        if task_name == old_name:
+            instances[position] = new_entry
+            new_tasks[old_name] = instances
+        else:
+            del instances[position]
+            if instances:
+                new_tasks[old_name] = _renumber(instances, metadata["file_path"], sheet_name, old_name)
+            else:
+                del new_tasks[old_name]
+            new_tasks[task_name] = _renumber(
+                list(new_tasks.get(task_name, [])) + [new_entry], metadata["file_path"], sheet_name, task_name
+            )
+
+    new_data = dict(all_sheets_data)
+    new_data[sheet_name] = new_tasks
+    return new_data
+
+
+def start_compactor():
+    """Start the background thread that writes journaled edits into their workbooks."""
+    global _compactor
+    if _compactor is not None:
+        return _compactor
+    _compactor = threading.Thread(target=_compactor_loop, name="journal-compactor", daemon=True)
+    _compactor.start()
+    return _compactor
+
+
+def compact_once():
+    """Write pending edits into every unlocked workbook. Returns True if any workbook changed.
+
+    Each workbook is written by its own worker under its own file lock, so one
+    slow or locked workbook does not hold up the others.
+    """
+    by_file = {}
+    for entry in pending_edits():
+        by_file.setdefault(entry["file_path"], []).append(entry)
+    if not by_file:
+        return False
+
+    workers = min(len(by_file), JOURNAL_COMPACT_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="journal-compact") as pool:
+        results = list(pool.map(lambda item: _compact_file(*item), by_file.items()))
+    return any(results)
+
+
+# --- Private helpers ---
+
+def _compact_file(abs_path, entries):
+    batch = entries[:JOURNAL_COMPACT_BATCH]
+
+    with file_write(abs_path):
+        try:
+            if is_workbook_locked(abs_path):
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] {os.path.basename(abs_path)} is open elsewhere; {len(entries)} edit(s) waiting")
+                return False
+        except OSError as e:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Cannot compact into {os.path.basename(abs_path)}: {e}")
+            return False
+
+        try:
+            with profile_operation("compact_journal", file=os.path.basename(abs_path), edits=len(batch)):
+                applied, rejected = apply_edits(abs_path, batch, _journal_id)
+        except (PermissionError, OSError) as e:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Could not write {os.path.basename(abs_path)}, will retry: {e}")
+            return False
+
+    _mark_done(applied, rejected)
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Wrote {len(applied)} journaled edit(s) to {os.path.basename(abs_path)}")
+    for seq, reason in rejected:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Warning: Dropped journaled edit #{seq} for {os.path.basename(abs_path)}: {reason}")
+
+    if len(entries) > len(batch):
+        _wake.set()
+    return bool(applied) or bool(rejected)
+
+
+def _compactor_loop():
+    while True:
+        _wake.wait(timeout=JOURNAL_COMPACT_INTERVAL_SECONDS)
+        _wake.clear()
+        if not pending_edits():
+            continue
+
+        # Give bursts of edits a moment to accumulate into one workbook write.
+        time.sleep(JOURNAL_COMPACT_DELAY_SECONDS)
+        try:
+            if compact_once():
+                from app.services.data_loader import reload_data
+                reload_data()
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Error compacting edit journal: {e}")
+
+
+def _mark_done(applied, rejected):
+    global _processed_lines
+
+    if not applied and not rejected:
+        return
+
+    records = []
+    if applied:
+        records.append({"op": "applied", "seqs": applied, "ts": datetime.now().isoformat()})
+    for seq, reason in rejected:
+        records.append({"op": "rejected", "seq": seq, "reason": reason, "ts": datetime.now().isoformat()})
+
+    reasons = dict(rejected)
+    done = set(applied) | set(reasons)
+    with _journal_lock:
+        # Persist first: if the append fails the edits stay pending in memory as on disk,
+        # and the workbook's journal mark keeps the retry from applying them twice.
+        _append_records(records)
+        _processed_lines += len(records)
+
+        for entry in _pending:
+            if entry["seq"] in reasons:
+                _recent_rejections.append({
+                    "seq": entry["seq"],
+                    "file": os.path.basename(entry["file_path"]),
+                    "sheet_name": entry["sheet_name"],
+                    "task_name": entry["task_name"],
+                    "reason": reasons[entry["seq"]],
+                })
+        _pending[:] = [entry for entry in _pending if entry["seq"] not in done]
+
+        if not _pending or _processed_lines >= _REWRITE_THRESHOLD:
+            _rewrite_journal()
+
+
+def _append_records(records):
+    data = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _rewrite_journal():
+    """Replace the journal with its header and the still-pending edits."""
+    global _processed_lines
+
+    abs_path = os.path.abspath(JOURNAL_PATH)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(abs_path), suffix=".tmp")
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "header", "journal_id": _journal_id, "next_seq": _next_seq}) + "\n")
+            for entry in _pending:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, abs_path)
+        _processed_lines = 0
+    except OSError as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        print(f"Warning: Could not rewrite edit journal: {e}")
+
+
+def _same_file(instance, abs_path):
+    metadata = instance.get("metadata") if isinstance(instance, dict) else None
+    if not metadata:
+        return False
+    return metadata["file_path"] == abs_path or normalize_path(metadata["file_path"]) == abs_path
+
+
+def _find_instance(tasks, abs_path, row_index):
+    for task_name, instances in tasks.items():
+        for position, instance in enumerate(instances):
+            metadata = instance.get("metadata")
+            if metadata and metadata["row_index"] == row_index and _same_file(instance, abs_path):
+                return task_name, position, instance
+    return None
+
+
+def _renumber(instances, abs_path, sheet_name, task_name):
+    # A rename changes which rows of a file share a name; number them in row order like the loader.
+    same_file = sorted(
+        (instance for instance in instances if _same_file(instance, abs_path)),
+        key=lambda instance: instance["metadata"]["row_index"],
+    )
+    task_ids = {
+        id(instance): task_id_for(instance["metadata"]["file_path"], sheet_name, task_name, occurrence)
+        for occurrence, instance in enumerate(same_file)
+    }
+    return [
+        {**instance, "metadata": {**instance["metadata"], "task_id": task_ids[id(instance)]}}
+        if id(instance) in task_ids and instance["metadata"]["task_id"] != task_ids[id(instance)]
+        else instance
+        for instance in instances
+    ]
+
+
+def _assign_values(raw_values, columns, sheet_schema, values, new_columns):
+    for col, value in normalize_edit(sheet_schema, values).items():
+        raw_values[col] = value if value != "" else None
+    for col, value in normalize_edit(sheet_schema, new_columns).items():
+        if col not in columns:
+            columns.append(col)
+        raw_values[col] = value if value != "" else None
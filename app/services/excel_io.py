@@ -1,11 +1,28 @@
 import io
+import os
+import posixpath
 import sys
+import zipfile
+from typing import TYPE_CHECKING
+from xml.etree import ElementTree
 
-import pandas as pd
+from app.services.profiling import span
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Relationship types of the parts every worksheet depends on: cell text lives in the shared strings
+# table, and number formats (which decide whether a cell reads back as a date) live in the styles.
+_SHARED_PART_TYPES = ("sharedStrings", "styles")
 
 
 def read_file_with_shared_access(file_path: str) -> bytes:
     """Read a file even if it's open in another program (like Excel)."""
+    with span("read_file_with_shared_access", file=os.path.basename(file_path)):
+        return _read_file_bytes(file_path)
+
+
+def _read_file_bytes(file_path: str) -> bytes:
     if sys.platform == "win32":
         import ctypes
         from ctypes import wintypes
@@ -67,14 +84,98 @@ def read_file_with_shared_access(file_path: str) -> bytes:
             return f.read()
 
 
-def safe_read_excel(file_path: str, **kwargs) -> pd.DataFrame:
+def safe_read_excel(file_path: str, **kwargs) -> "pd.DataFrame":
     """Safely read an Excel file that might be open in Excel."""
+    import pandas as pd
+
     file_bytes = read_file_with_shared_access(file_path)
-    return pd.read_excel(io.BytesIO(file_bytes), **kwargs)
+    with span("pd.read_excel", file=os.path.basename(file_path), sheet=kwargs.get("sheet_name")):
+        return pd.read_excel(io.BytesIO(file_bytes), **kwargs)
 
 
 def safe_get_sheet_names(file_path: str) -> list:
     """Safely get sheet names from an Excel file that might be open."""
+    import pandas as pd
+
     file_bytes = read_file_with_shared_access(file_path)
     with pd.ExcelFile(io.BytesIO(file_bytes)) as excel_file:
         return excel_file.sheet_names
+
+
+def safe_open_workbook(file_path: str):
+    """Read a workbook once for parsing several sheets.
+
+    Returns (pd.ExcelFile, fingerprints) where fingerprints comes from
+    sheet_part_fingerprints. The caller closes the ExcelFile.
+    """
+    import pandas as pd
+
+    file_bytes = read_file_with_shared_access(file_path)
+    return pd.ExcelFile(io.BytesIO(file_bytes)), sheet_part_fingerprints(file_bytes)
+
+
+def sheet_part_fingerprints(file_bytes: bytes):
+    """Map each worksheet name to the CRC and size of its zip part and of the shared parts.
+
+    Only the zip central directory and the small workbook parts are read. Returns None
+    when the file is not an xlsx/xlsm zip (e.g. legacy .xls), so it is always re-parsed.
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            infos = {info.filename: info for info in archive.infolist()}
+            workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+            relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        return None
+
+    targets = {rel.get("Id"): rel.get("Target") for rel in relationships}
+    shared_targets = {rel.get("Type", "").rsplit("/", 1)[-1]: rel.get("Target") for rel in relationships}
+    shared = tuple(
+        _part_checksum(infos, _part_path(shared_targets[part_type])) if part_type in shared_targets else None
+        for part_type in _SHARED_PART_TYPES
+    )
+
+    fingerprints = {}
+    for element in workbook.iter():
+        if _local_name(element.tag) != "sheet":
+            continue
+        rel_id = next((value for key, value in element.attrib.items() if _local_name(key) == "id"), None)
+        target = targets.get(rel_id)
+        if target is None:
+            continue
+        fingerprints[element.get("name")] = (_part_checksum(infos, _part_path(target)),) + shared
+    return fingerprints
+
+
+def read_custom_property(file_bytes: bytes, name: str):
+    """Text of a custom document property (File > Properties > Custom), or None if absent."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            if "docProps/custom.xml" not in archive.namelist():
+                return None
+            properties = ElementTree.fromstring(archive.read("docProps/custom.xml"))
+    except (zipfile.BadZipFile, ElementTree.ParseError):
+        return None
+
+    for element in properties:
+        if _local_name(element.tag) == "property" and element.get("name") == name:
+            return next((value.text for value in element), None)
+    return None
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _part_path(target):
+    # Relationship targets are relative to xl/ unless they start with "/".
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _part_checksum(infos, name):
+    info = infos.get(name)
+    if info is None:
+        return None
+    return info.CRC, info.file_size
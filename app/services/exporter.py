@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+import os
+
+# After the first row, rows are buffered into chunks of roughly this size; each chunk is one hop through the threadpool.
+CHUNK_BYTES = 64 * 1024
+
+BASE_FIELDS = ["task_id", "sheet_name", "file", "row_index", "task_name"]
+# Data columns named like a base field are exported under this prefix instead of being dropped.
+COLUMN_PREFIX = "column:"
+
+
+def iter_task_rows(all_sheets_data, sheet_names, sheet=None, file=None, load_missing=None):
+    """Yield one flat dict per task from a published (immutable) snapshot.
+
+    Sheets listed in sheet_names but absent from the data (evicted) come from load_missing(sheet_name).
+    """
+    for sheet_name in sheet_names:
+        if sheet is not None and sheet_name != sheet:
+            continue
+        tasks = all_sheets_data.get(sheet_name)
+        if tasks is None:
+            tasks = load_missing(sheet_name) if load_missing else {}
+        for task_name, instances in tasks.items():
+            for instance in instances:
+                metadata = instance.get("metadata") if isinstance(instance, dict) else None
+                if not metadata:
+                    continue
+                if file is not None and not _matches_file(metadata["file_path"], file):
+                    continue
+
+                row = {
+                    "task_id": metadata.get("task_id"),
+                    "sheet_name": sheet_name,
+                    "file": os.path.basename(metadata["file_path"]),
+                    "row_index": metadata["row_index"],
+                    "task_name": task_name,
+                }
+                for col, value in metadata["raw_values"].items():
+                    if col != metadata["columns"][0]:
+                        row[export_field(col)] = value
+                yield row
+
+
+def export_field(col):
+    """Field name a data column is exported under."""
+    return COLUMN_PREFIX + col if col in BASE_FIELDS else col
+
+
+def iter_ndjson(rows):
+    """NDJSON text; the first row is sent on its own so the download starts right away."""
+    buffer = []
+    size = 0
+    first = True
+    for row in rows:
+        line = json.dumps(row, default=str, ensure_ascii=False) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if first or size >= CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+            first = False
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(rows, columns):
+    """CSV with a fixed header (BASE_FIELDS + columns); values outside the header are dropped.
+
+    The header is sent before any sheet is read and the first row on its own, then rows are batched.
+    """
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=BASE_FIELDS + [export_field(col) for col in columns], extrasaction="ignore")
+    writer.writeheader()
+    yield _drain(output)
+    first = True
+    for row in rows:
+        writer.writerow(row)
+        if first or output.tell() >= CHUNK_BYTES:
+            yield _drain(output)
+            first = False
+    if output.tell():
+        yield _drain(output)
+
+
+def export_columns(schema, sheet_names, sheet=None):
+    """Union of the schema's data columns (task name excluded) for the exported sheets, in first-seen order."""
+    columns = []
+    for sheet_name in sheet_names:
+        if sheet is not None and sheet_name != sheet:
+            continue
+        for position, col in enumerate(schema.get(sheet_name, {})):
+            if position > 0 and col not in columns:
+                columns.append(col)
+    return columns
+
+
+def _drain(output):
+    text = output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+    return text
+
+
+def _matches_file(abs_path, file):
+    return file in (abs_path, os.path.basename(abs_path))
@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Watchdog reports the rename a moment after the write returns; keep ignoring our own events briefly.
+SUPPRESS_AFTER_WRITE_SECONDS = 1.0
+
+_registry_lock = threading.Lock()
+_locks = {}
+
+
+class _FileLock:
+    """FIFO lock for one workbook: writers are served in the order they arrived."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.next_ticket = 0
+        self.now_serving = 0
+        self.writing = False
+        self.suppress_until = 0.0
+
+    def acquire(self):
+        with self.condition:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            while self.now_serving != ticket:
+                self.condition.wait()
+            self.writing = True
+
+    def release(self):
+        with self.condition:
+            self.writing = False
+            self.suppress_until = time.monotonic() + SUPPRESS_AFTER_WRITE_SECONDS
+            self.now_serving += 1
+            self.condition.notify_all()
+
+    def waiting(self):
+        with self.condition:
+            return self.next_ticket - self.now_serving
+
+
+@contextmanager
+def file_write(abs_path):
+    """Hold the write lock for one workbook; other workbooks are unaffected."""
+    lock = _lock_for(abs_path)
+    lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def is_being_written(abs_path):
+    """True while this app is writing the workbook (or just finished), so watcher events are our own."""
+    with _registry_lock:
+        lock = _locks.get(_key(abs_path))
+    if lock is None:
+        return False
+    return lock.writing or time.monotonic() < lock.suppress_until
+
+
+def lock_status():
+    """Workbooks with a writer active or queued, for /health."""
+    with _registry_lock:
+        items = list(_locks.items())
+    return {
+        os.path.basename(path): lock.waiting()
+        for path, lock in items
+        if lock.waiting()
+    }
+
+
+# --- Private helpers ---
+
+def _key(abs_path):
+    # The watcher sees the configured path, the journal the resolved one; key both the same way.
+    return os.path.normcase(os.path.realpath(abs_path))
+
+
+def _lock_for(abs_path):
+    key = _key(abs_path)
+    with _registry_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _FileLock()
+            _locks[key] = lock
+        return lock
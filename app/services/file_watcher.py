@@ -6,7 +6,7 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
 from app.config import FILE_PATHS, DEBOUNCE_SECONDS
-import app.state as state
+from app.services.file_locks import is_being_written
 
 observer = None
 
@@ -30,10 +30,9 @@ class ExcelFileHandler(FileSystemEventHandler):
         if changed_path not in self.file_paths:
             return
 
-        with state.write_lock:
-            if state.write_in_progress:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Ignoring change during write operation")
-                return
+        if is_being_written(changed_path):
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Ignoring change to {os.path.basename(changed_path)} during write operation")
+            return
 
         current_time = time.time()
         if current_time - self.last_reload > DEBOUNCE_SECONDS:
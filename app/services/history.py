@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+from collections import deque
+
+from app.config import HISTORY_MAX_AGE_SECONDS, HISTORY_MAX_VERSIONS
+
+_lock = threading.Lock()
+# Oldest first: {"version", "published_at", "last_updated", "sheet_names", "schema", "sheets"}.
+# "sheets" holds references to the published sheet dicts, which are never mutated, so
+# versions share every sheet (and row) that did not change between them.
+_versions = deque()
+
+
+def record_version(version, all_sheets_data, sheet_names, schema, last_updated):
+    """Remember a published snapshot; older versions are pruned by count and age."""
+    if HISTORY_MAX_VERSIONS <= 0:
+        return
+    entry = {
+        "version": version,
+        "published_at": time.time(),
+        "last_updated": last_updated,
+        "sheet_names": sheet_names,
+        "schema": schema,
+        "sheets": dict(all_sheets_data),
+    }
+    with _lock:
+        while _versions and _versions[-1]["version"] >= version:
+            _versions.pop()
+        _versions.append(entry)
+        _prune()
+
+
+def get_version(version):
+    """Return the retained snapshot for a version, or None."""
+    with _lock:
+        for entry in _versions:
+            if entry["version"] == version:
+                return entry
+    return None
+
+
+def restore_sheet(version, sheet_name, tasks):
+    """Put a re-read (formerly evicted) sheet back into the history entry of the current version."""
+    with _lock:
+        if _versions and _versions[-1]["version"] == version:
+            _versions[-1]["sheets"][sheet_name] = tasks
+
+
+def forget_sheet(sheet_name):
+    """Drop a sheet from all versions so evicting it under the memory budget frees it."""
+    with _lock:
+        for entry in _versions:
+            entry["sheets"].pop(sheet_name, None)
+
+
+def history_status():
+    """Retained versions and how many distinct sheet objects they hold, for /health."""
+    with _lock:
+        entries = list(_versions)
+    distinct = {id(tasks) for entry in entries for tasks in entry["sheets"].values()}
+    total = sum(len(entry["sheets"]) for entry in entries)
+    return {
+        "versions": len(entries),
+        "oldest": entries[0]["version"] if entries else None,
+        "newest": entries[-1]["version"] if entries else None,
+        "sheet_references": total,
+        "distinct_sheets": len(distinct),
+    }
+
+
+def list_versions():
+    with _lock:
+        entries = list(_versions)
+    return [
+        {
+            "version": entry["version"],
+            "published_at": entry["published_at"],
+            "last_updated": entry["last_updated"],
+            "sheet_names": entry["sheet_names"],
+        }
+        for entry in entries
+    ]
+
+
+def share_unchanged_rows(previous, tasks):
+    """Return tasks with task lists and entries equal to previous reused by reference.
+
+    If nothing changed, previous itself is returned, so the sheet keeps its identity.
+    """
+    if previous is None or previous is tasks:
+        return tasks
+
+    shared = {}
+    reused_all = len(previous) == len(tasks)
+    for task_name, instances in tasks.items():
+        old_instances = previous.get(task_name)
+        if old_instances is None:
+            shared[task_name] = instances
+            reused_all = False
+        elif old_instances == instances:
+            shared[task_name] = old_instances
+        else:
+            shared[task_name] = [
+                old_instances[position] if position < len(old_instances) and old_instances[position] == instance else instance
+                for position, instance in enumerate(instances)
+            ]
+            reused_all = False
+    return previous if reused_all else shared
+
+
+def diff_versions(old, new):
+    """Task-level differences between two retained snapshots, matched by task ID."""
+    old_sheets = old["sheets"]
+    new_sheets = new["sheets"]
+    sheets = {}
+    unavailable = []
+
+    for sheet_name in _ordered_union(old["sheet_names"], new["sheet_names"]):
+        in_old = sheet_name in old["sheet_names"]
+        in_new = sheet_name in new["sheet_names"]
+        if (in_old and sheet_name not in old_sheets) or (in_new and sheet_name not in new_sheets):
+            unavailable.append(sheet_name)
+            continue
+
+        old_tasks = old_sheets.get(sheet_name, {})
+        new_tasks = new_sheets.get(sheet_name, {})
+        # Shared by reference means unchanged; most sheets stop here.
+        if old_tasks is new_tasks:
+            continue
+
+        sheet_diff = _diff_sheet(old_tasks, new_tasks)
+        if any(sheet_diff.values()):
+            sheets[sheet_name] = sheet_diff
+
+    return {
+        "from": old["version"],
+        "to": new["version"],
+        "added_sheets": [name for name in new["sheet_names"] if name not in old["sheet_names"]],
+        "removed_sheets": [name for name in old["sheet_names"] if name not in new["sheet_names"]],
+        "unavailable_sheets": unavailable,
+        "sheets": sheets,
+    }
+
+
+# --- Private helpers ---
+
+def _prune():
+    cutoff = time.time() - HISTORY_MAX_AGE_SECONDS if HISTORY_MAX_AGE_SECONDS > 0 else None
+    # The newest version is always kept.
+    while len(_versions) > 1 and (
+        len(_versions) > HISTORY_MAX_VERSIONS
+        or (cutoff is not None and _versions[0]["published_at"] < cutoff)
+    ):
+        _versions.popleft()
+
+
+def _ordered_union(first, second):
+    names = list(first)
+    names += [name for name in second if name not in first]
+    return names
+
+
+def _diff_sheet(old_tasks, new_tasks):
+    old_entries = _entries_by_id(old_tasks)
+    new_entries = _entries_by_id(new_tasks)
+
+    added = [_describe(entry) for task_id, entry in new_entries.items() if task_id not in old_entries]
+    removed = [_describe(entry) for task_id, entry in old_entries.items() if task_id not in new_entries]
+    changed = []
+    for task_id, entry in new_entries.items():
+        old_entry = old_entries.get(task_id)
+        if old_entry is None or old_entry is entry:
+            continue
+        old_values = old_entry["metadata"]["raw_values"]
+        new_values = entry["metadata"]["raw_values"]
+        changes = {
+            col: {"from": old_values.get(col), "to": new_values.get(col)}
+            for col in _ordered_union(list(old_values), list(new_values))
+            if old_values.get(col) != new_values.get(col)
+        }
+        if changes:
+            changed.append({**_describe(entry), "changes": changes})
+
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def _entries_by_id(tasks):
+    entries = {}
+    for instances in tasks.values():
+        for instance in instances:
+            metadata = instance.get("metadata") if isinstance(instance, dict) else None
+            if metadata and metadata.get("task_id"):
+                entries[metadata["task_id"]] = instance
+    return entries
+
+
+def _describe(entry):
+    metadata = entry["metadata"]
+    return {
+        "task_id": metadata["task_id"],
+        "task_name": metadata["task_name"],
+        "file": os.path.basename(metadata["file_path"]),
+        "row_index": metadata["row_index"],
+        "raw_values": metadata["raw_values"],
+    }
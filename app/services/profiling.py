@@ -0,0 +1,173 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from datetime import datetime
+
+from app.config import PROFILING_ENABLED, SLOW_OPERATION_LOG, SLOW_OPERATION_THRESHOLD_MS
+
+SORT_KEYS = {"cumulative", "tottime", "calls", "ncalls", "time", "filename", "name"}
+
+slow_logger = logging.getLogger("app.slow_operations")
+slow_logger.propagate = False
+
+_handler_lock = threading.Lock()
+_capture_lock = threading.Lock()
+_pending_capture = None
+
+
+class _Span:
+    """Times a block and logs it when it exceeds the slow-operation threshold."""
+
+    __slots__ = ("name", "context", "start")
+
+    def __init__(self, name, context):
+        self.name = name
+        self.context = context
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        if elapsed_ms >= SLOW_OPERATION_THRESHOLD_MS:
+            _log_slow_operation(self.name, elapsed_ms, self.context, exc_type)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ProfiledOperation:
+    """Runs cProfile around one reload/save and hands the stats to a waiting capture."""
+
+    def __init__(self, name, context, capture):
+        self.name = name
+        self.context = context
+        self.capture = capture
+        self.profiler = cProfile.Profile()
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.disable()
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.sort_stats(self.capture["sort"]).print_stats(self.capture["limit"])
+
+        self.capture["result"] = {
+            "operation": self.name,
+            "context": self.context,
+            "duration_ms": round(elapsed_ms, 2),
+            "error": exc_type.__name__ if exc_type else None,
+            "sort": self.capture["sort"],
+            "stats": output.getvalue(),
+        }
+        self.capture["done"].set()
+
+        if elapsed_ms >= SLOW_OPERATION_THRESHOLD_MS:
+            _log_slow_operation(self.name, elapsed_ms, self.context, exc_type)
+        return False
+
+
+def span(name, **context):
+    """Return a timing span for a block; a shared no-op when profiling is off."""
+    if not PROFILING_ENABLED:
+        return _NULL_SPAN
+    return _Span(name, context)
+
+
+def profile_operation(name, **context):
+    """Span for a whole reload/save that also fulfils a pending /debug/profile capture."""
+    if not PROFILING_ENABLED:
+        return _NULL_SPAN
+
+    global _pending_capture
+    with _capture_lock:
+        capture = _pending_capture
+        _pending_capture = None
+
+    if capture is None:
+        return _Span(name, context)
+    return _ProfiledOperation(name, context, capture)
+
+
+def arm_capture(sort="cumulative", limit=40):
+    """Request a cProfile of the next reload or save. Raises RuntimeError if one is already armed."""
+    global _pending_capture
+    capture = {
+        "sort": sort,
+        "limit": limit,
+        "done": threading.Event(),
+        "result": None,
+    }
+    with _capture_lock:
+        if _pending_capture is not None:
+            raise RuntimeError("A profile capture is already waiting for the next operation")
+        _pending_capture = capture
+    return capture
+
+
+def disarm_capture(capture):
+    """Withdraw a capture that is still waiting (e.g. after a timeout)."""
+    global _pending_capture
+    with _capture_lock:
+        if _pending_capture is capture:
+            _pending_capture = None
+
+
+def _log_slow_operation(name, elapsed_ms, context, exc_type):
+    _ensure_slow_log_handler()
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "operation": name,
+        "duration_ms": round(elapsed_ms, 2),
+        "threshold_ms": SLOW_OPERATION_THRESHOLD_MS,
+        "thread": threading.current_thread().name,
+    }
+    if exc_type is not None:
+        record["error"] = exc_type.__name__
+    record.update({key: _json_safe(value) for key, value in context.items()})
+    slow_logger.warning(json.dumps(record))
+
+
+def _ensure_slow_log_handler():
+    if slow_logger.handlers:
+        return
+    with _handler_lock:
+        if slow_logger.handlers:
+            return
+        if SLOW_OPERATION_LOG:
+            handler = logging.FileHandler(SLOW_OPERATION_LOG, encoding="utf-8")
+        else:
+            handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        slow_logger.addHandler(handler)
+        slow_logger.setLevel(logging.INFO)
+
+
+def _json_safe(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
@@ -0,0 +1,201 @@
+import os
+from collections import Counter
+from datetime import date, datetime
+
+from app.config import DUE_SOON_DAYS
+from app.services.schema import parse_date
+
+STATUS_COLUMN = "Status"
+PRIORITY_COLUMN = "Priority"
+DEADLINE_COLUMN = "Deadline"
+COMPLETED_STATUS = "completed"
+
+# Rollups of the last published sheets, keyed by sheet name. Published sheet dicts are
+# never mutated, so an identical object means the cached rollup is still correct.
+_sheet_cache = {}
+
+
+def compute_rollups(all_sheets_data, sheet_names):
+    """Build per-sheet and per-file rollups for a snapshot, reusing unchanged sheets."""
+    global _sheet_cache
+
+    sheets = {}
+    next_cache = {}
+    for sheet_name in sheet_names:
+        cached = _sheet_cache.get(sheet_name)
+        if cached is not None and sheet_name not in all_sheets_data:
+            # Evicted sheets (see services/sheet_cache.py) keep the rollup from when they were resident,
+            # but not the tasks dict, so evicting a sheet frees it.
+            next_cache[sheet_name] = (None, cached[1])
+            sheet_rollup = cached[1]
+        else:
+            tasks = all_sheets_data.get(sheet_name, {})
+            if cached is not None and cached[0] is tasks:
+                sheet_rollup = cached[1]
+            else:
+                sheet_rollup = _rollup_sheet(tasks)
+            next_cache[sheet_name] = (tasks, sheet_rollup)
+        sheets[sheet_name] = sheet_rollup
+    _sheet_cache = next_cache
+
+    mtimes = {}
+    for sheet_rollup in sheets.values():
+        for abs_path in sheet_rollup["by_file"]:
+            if abs_path not in mtimes:
+                mtimes[abs_path] = _file_mtime(abs_path)
+
+    return {"sheets": sheets, "mtimes": mtimes}
+
+
+def release_sheet(sheet_name):
+    """Keep an evicted sheet's rollup but drop the reference to its tasks dict."""
+    cached = _sheet_cache.get(sheet_name)
+    if cached is not None:
+        _sheet_cache[sheet_name] = (None, cached[1])
+
+
+def summarize(rollups, sheet_names, today=None):
+    """Turn stored rollups into the /api/summary payload; deadline counts are relative to today."""
+    today = today or date.today()
+    mtimes = rollups["mtimes"]
+
+    sheets = {}
+    files = {}
+    totals = _empty_counts()
+    for sheet_name in sheet_names:
+        sheet_rollup = rollups["sheets"].get(sheet_name)
+        if sheet_rollup is None:
+            continue
+
+        sheet_mtimes = [mtimes[path] for path in sheet_rollup["by_file"] if mtimes.get(path)]
+        sheets[sheet_name] = {
+            **_public_counts(sheet_rollup["counts"], today),
+            "is_completed": sheet_rollup["counts"]["task_count"] > 0
+            and sheet_rollup["counts"]["completed"] == sheet_rollup["counts"]["task_count"],
+            "files": [os.path.basename(path) for path in sheet_rollup["by_file"]],
+            "last_modified": _iso_mtime(max(sheet_mtimes)) if sheet_mtimes else None,
+        }
+        _merge_counts(totals, sheet_rollup["counts"])
+
+        for abs_path, counts in sheet_rollup["by_file"].items():
+            file_counts = files.setdefault(abs_path, _empty_counts())
+            _merge_counts(file_counts, counts)
+
+    return {
+        "due_soon_days": DUE_SOON_DAYS,
+        "totals": _public_counts(totals, today),
+        "sheets": sheets,
+        "files": {
+            os.path.basename(abs_path): {
+                **_public_counts(counts, today),
+                "file_path": abs_path,
+                "last_modified": _iso_mtime(mtimes.get(abs_path)),
+            }
+            for abs_path, counts in files.items()
+        },
+    }
+
+
+# --- Private helpers ---
+
+def _rollup_sheet(tasks):
+    counts = _empty_counts()
+    by_file = {}
+    for instances in tasks.values():
+        for instance in instances:
+            metadata = instance.get("metadata") if isinstance(instance, dict) else None
+            if not metadata:
+                continue
+
+            file_counts = by_file.setdefault(metadata["file_path"], _empty_counts())
+            for target in (counts, file_counts):
+                _count_task(target, metadata["raw_values"])
+
+    return {"counts": counts, "by_file": by_file}
+
+
+def _empty_counts():
+    return {
+        "task_count": 0,
+        "completed": 0,
+        "status": Counter(),
+        "priority": Counter(),
+        # Open (not completed) tasks per deadline date, so due-soon stays correct across midnight.
+        "open_deadlines": Counter(),
+    }
+
+
+def _count_task(counts, raw_values):
+    status = _label(raw_values.get(STATUS_COLUMN))
+    priority = _label(raw_values.get(PRIORITY_COLUMN))
+
+    counts["task_count"] += 1
+    counts["status"][status or "No Status"] += 1
+    counts["priority"][priority or "No Priority"] += 1
+
+    if status.lower() == COMPLETED_STATUS:
+        counts["completed"] += 1
+        return
+
+    deadline = _parse_deadline(raw_values.get(DEADLINE_COLUMN))
+    if deadline is not None:
+        counts["open_deadlines"][deadline] += 1
+
+
+def _merge_counts(target, source):
+    target["task_count"] += source["task_count"]
+    target["completed"] += source["completed"]
+    target["status"].update(source["status"])
+    target["priority"].update(source["priority"])
+    target["open_deadlines"].update(source["open_deadlines"])
+
+
+def _public_counts(counts, today):
+    overdue = 0
+    due_soon = 0
+    for deadline, count in counts["open_deadlines"].items():
+        days = (deadline - today).days
+        if days < 0:
+            overdue += count
+        elif days <= DUE_SOON_DAYS:
+            due_soon += count
+
+    task_count = counts["task_count"]
+    return {
+        "task_count": task_count,
+        "completed": counts["completed"],
+        "completion_ratio": round(counts["completed"] / task_count, 4) if task_count else 0.0,
+        "status_counts": dict(counts["status"]),
+        "priority_counts": dict(counts["priority"]),
+        "overdue": overdue,
+        "due_soon": due_soon,
+    }
+
+
+def _label(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _parse_deadline(value):
+    # Same parser as the schema normalizer, so counts and the loaded values agree; the day is what matters.
+    if value is None:
+        return None
+    deadline = parse_date(value)
+    if isinstance(deadline, datetime):
+        return deadline.date()
+    return deadline
+
+
+def _file_mtime(abs_path):
+    try:
+        return os.path.getmtime(abs_path)
+    except OSError:
+        return None
+
+
+def _iso_mtime(mtime):
+    if mtime is None:
+        return None
+    return datetime.fromtimestamp(mtime).isoformat()
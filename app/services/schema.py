@@ -0,0 +1,208 @@
+import math
+import re
+from datetime import date, datetime
+
+DATE = "date"
+NUMBER = "number"
+ENUM = "enum"
+TEXT = "text"
+
+# Columns whose values are always normalized to a canonical spelling.
+CANONICAL_VALUES = {
+    "Status": {
+        "not started": "Not Started",
+        "in progress": "In Progress",
+        "completed": "Completed",
+        "complete": "Completed",
+        "done": "Completed",
+        "blocked": "Blocked",
+    },
+    "Priority": {
+        "high": "High",
+        "medium": "Medium",
+        "med": "Medium",
+        "low": "Low",
+    },
+}
+
+# Other text columns become enums when they repeat a handful of values.
+ENUM_MAX_DISTINCT = 8
+ENUM_MIN_ROWS = 4
+
+# Dates must fill the whole cell: "2026-01-05: called client" is text.
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?$")
+_DMY_DATE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})$")
+# Leading zeros ("007") mark codes, not numbers.
+_NUMBER = re.compile(r"^-?(?:0|[1-9]\d*)(?:\.\d+)?$")
+# Larger integers lose digits as floats (and in JavaScript), so such text stays text.
+_MAX_EXACT_INTEGER = 2 ** 53
+
+
+def infer_schema(columns, rows):
+    """Infer a type for each column from one sheet's raw values (the first column is the task name)."""
+    schema = {}
+    for position, col in enumerate(columns):
+        values = [row[col] for row in rows if row.get(col) is not None and str(row[col]).strip()]
+        schema[col] = _infer_column(col, values, first=position == 0)
+    return schema
+
+
+def normalize_row(schema, raw_values):
+    """Return raw_values with each value converted to its column's canonical form."""
+    return {
+        col: normalize_value(schema.get(col), col, value)
+        for col, value in raw_values.items()
+    }
+
+
+def normalize_value(column_schema, col, value):
+    if value is None:
+        return None
+    if column_schema is None:
+        return _plain(value)
+
+    col_type = column_schema["type"]
+    if col_type == DATE:
+        parsed = parse_date(value)
+        return _iso(parsed) if parsed is not None else _plain(value)
+    if col_type == NUMBER:
+        number = _parse_number(value)
+        return number if number is not None else _plain(value)
+    if col_type == ENUM:
+        return canonical_enum(col, value)
+    return _plain(value)
+
+
+def normalize_edit(schema, values):
+    """Normalize edited values (sent as text) for the snapshot; blanks stay blank.
+
+    Journaled edits keep the text as typed, so the workbook gets what the user entered.
+    """
+    return {
+        col: value if value == "" else normalize_value(schema.get(col), col, value)
+        for col, value in values.items()
+    }
+
+
+def merge_schemas(existing, incoming):
+    """Combine the schemas of same-named sheets from different files."""
+    merged = dict(existing)
+    for col, column_schema in incoming.items():
+        current = merged.get(col)
+        if current is None:
+            merged[col] = column_schema
+        elif current["type"] != column_schema["type"]:
+            merged[col] = {"type": TEXT}
+        elif column_schema["type"] == ENUM:
+            values = list(current["values"])
+            values += [value for value in column_schema["values"] if value not in values]
+            merged[col] = {"type": ENUM, "values": values}
+    return merged
+
+
+def canonical_enum(col, value):
+    text = str(value).strip()
+    canonical = CANONICAL_VALUES.get(col)
+    if canonical:
+        return canonical.get(" ".join(text.lower().split()), text)
+    return text
+
+
+def parse_date(value):
+    """Parse a cell value into a date/datetime, or None. Slashed dates are day/month/year."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    try:
+        match = _ISO_DATE.match(text)
+        if match:
+            year, month, day, hour, minute, second = (int(part) if part else 0 for part in match.groups())
+            if hour or minute or second:
+                return datetime(year, month, day, hour, minute, second)
+            return date(year, month, day)
+
+        match = _DMY_DATE.match(text)
+        if match:
+            year = int(match[3])
+            if year < 100:
+                year += 2000
+            return date(year, int(match[2]), int(match[1]))
+    except ValueError:
+        return None
+    return None
+
+
+# --- Private helpers ---
+
+def _infer_column(col, values, first):
+    if first:
+        return {"type": TEXT}
+
+    if col in CANONICAL_VALUES:
+        return _enum_schema(col, values)
+
+    if values and all(parse_date(value) is not None for value in values):
+        return {"type": DATE}
+
+    if values and all(_parse_number(value) is not None for value in values):
+        return {"type": NUMBER}
+
+    if len(values) >= ENUM_MIN_ROWS:
+        distinct = {canonical_enum(col, value) for value in values}
+        if len(distinct) <= ENUM_MAX_DISTINCT and len(distinct) <= len(values) // 2:
+            return _enum_schema(col, values)
+
+    return {"type": TEXT}
+
+
+def _enum_schema(col, values):
+    seen = []
+    for value in values:
+        canonical = canonical_enum(col, value)
+        if canonical not in seen:
+            seen.append(canonical)
+    return {"type": ENUM, "values": seen}
+
+
+def _parse_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int) or (hasattr(value, "dtype") and value.dtype.kind in "iu"):
+        return int(value)
+    if isinstance(value, float) or hasattr(value, "dtype"):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        if math.isnan(number) or math.isinf(number):
+            return None
+        return int(number) if number.is_integer() else number
+
+    # Text only becomes a number when it reads back the same: "1.10" and "-0" stay text.
+    text = str(value).strip()
+    if not _NUMBER.match(text):
+        return None
+    number = int(text) if "." not in text else float(text)
+    if str(number) != text or abs(number) > _MAX_EXACT_INTEGER:
+        return None
+    return number
+
+
+def _iso(value):
+    if isinstance(value, datetime):
+        if value.hour or value.minute or value.second or value.microsecond:
+            return value.replace(microsecond=0).isoformat()
+        return value.date().isoformat()
+    return value.isoformat()
+
+
+def _plain(value):
+    # Stray dates in text columns and numpy scalars (e.g. int64 cells) become JSON-friendly values.
+    if isinstance(value, (datetime, date)):
+        return _iso(value)
+    if hasattr(value, "item") and hasattr(value, "dtype"):
+        return value.item()
+    return value
@@ -0,0 +1,236 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import MEMORY_BUDGET_MB
+import app.state as state
+
+# Rough per-object overhead used by the size estimate (dicts, lists, small strings).
+_ENTRY_OVERHEAD_BYTES = 600
+_VALUE_OVERHEAD_BYTES = 60
+
+_lock = threading.Lock()
+# Sheet name -> None, least recently used first
+_recency = OrderedDict()
+# Resident sheet name -> (tasks dict, estimated bytes); published sheet dicts are immutable
+_sizes = {}
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+    "rehydrations": 0,
+    "transient_loads": 0,
+}
+
+
+def enabled():
+    return MEMORY_BUDGET_MB > 0
+
+
+def touch(sheet_name):
+    """Mark a sheet as recently used."""
+    with _lock:
+        _recency.pop(sheet_name, None)
+        _recency[sheet_name] = None
+
+
+def is_evicted(sheet_name):
+    return sheet_name in state.cached_data.get("evicted_sheets", {})
+
+
+def get_sheet(sheet_name):
+    """Return a sheet's tasks, re-parsing it from its workbooks if it was evicted. None if unknown."""
+    tasks = state.cached_data["all_sheets_data"].get(sheet_name)
+    if tasks is not None:
+        _count("hits")
+        touch(sheet_name)
+        return tasks
+
+    descriptor = state.cached_data.get("evicted_sheets", {}).get(sheet_name)
+    if descriptor is None:
+        return None
+
+    _count("misses")
+    return _rehydrate(sheet_name, descriptor)
+
+
+def load_transient(sheet_name):
+    """Parse an evicted sheet without keeping it resident (used by exports)."""
+    from app.services.edit_journal import overlay_pending_edits
+
+    descriptor = state.cached_data.get("evicted_sheets", {}).get(sheet_name)
+    if descriptor is None:
+        return state.cached_data["all_sheets_data"].get(sheet_name, {})
+    _count("transient_loads")
+    tasks, _ = _parse(sheet_name, descriptor, keep=False)
+    if tasks is None:
+        return {}
+    # Same view as _rehydrate: journaled edits not yet in the workbook are part of the sheet.
+    return overlay_pending_edits({sheet_name: tasks}, state.cached_data["schema"], sheet_name=sheet_name)[sheet_name]
+
+
+def enforce_budget(keep=None):
+    """Evict least recently used sheets until the resident estimate fits the budget.
+
+    Call with state.snapshot_lock held. Evicted sheets are replaced by a descriptor in
+    cached_data["evicted_sheets"]; rollups and the task index keep covering them.
+    """
+    if not enabled():
+        return
+
+    from app.services import columnar, rollups, task_index
+    from app.services.data_loader import drop_parsed_rows
+    from app.services.history import forget_sheet
+
+    all_sheets_data = state.cached_data["all_sheets_data"]
+    sizes = {name: _estimate(name, tasks) for name, tasks in all_sheets_data.items()}
+    resident = sum(sizes.values())
+    budget = MEMORY_BUDGET_MB * 1024 * 1024
+    if resident <= budget:
+        return
+
+    with _lock:
+        recent = [name for name in _recency if name in all_sheets_data]
+    # Sheets nobody has asked for yet are the coldest.
+    candidates = [name for name in all_sheets_data if name not in recent] + recent
+    candidates = [name for name in candidates if name != keep]
+
+    remaining = dict(all_sheets_data)
+    evicted = dict(state.cached_data.get("evicted_sheets", {}))
+    # Always keep at least one sheet resident so the page has something to show.
+    while resident > budget and candidates and len(remaining) > 1:
+        name = candidates.pop(0)
+        evicted[name] = _describe(name, remaining.pop(name), sizes[name])
+        # Nothing may keep the evicted tasks dict alive (tools/check_eviction.py checks this).
+        drop_parsed_rows(name)
+        forget_sheet(name)
+        rollups.release_sheet(name)
+        task_index.release_sheet(name)
+        columnar.release_sheet(name)
+        _sizes.pop(name, None)
+        resident -= sizes[name]
+        _count("evictions")
+        print(f"Evicted sheet '{name}' (~{sizes[name] // 1024} KB) to stay within the memory budget")
+
+    state.cached_data["all_sheets_data"] = remaining
+    state.cached_data["evicted_sheets"] = evicted
+
+
+def cache_stats():
+    """Residency and hit/miss counters, for /health."""
+    all_sheets_data = state.cached_data["all_sheets_data"]
+    resident = sum(_estimate(name, tasks) for name, tasks in all_sheets_data.items())
+    with _lock:
+        stats = dict(_stats)
+    return {
+        "enabled": enabled(),
+        "budget_mb": MEMORY_BUDGET_MB,
+        "resident_mb": round(resident / (1024 * 1024), 2),
+        "resident_sheets": len(all_sheets_data),
+        "evicted_sheets": len(state.cached_data.get("evicted_sheets", {})),
+        **stats,
+    }
+
+
+# --- Private helpers ---
+
+def _rehydrate(sheet_name, descriptor):
+    from app.services.edit_journal import overlay_pending_edits
+    from app.services.history import restore_sheet
+    from app.services.rollups import compute_rollups
+    from app.services.task_index import build_index
+
+    tasks, _ = _parse(sheet_name, descriptor)
+    if tasks is None:
+        return None
+
+    with state.snapshot_lock:
+        current = state.cached_data["all_sheets_data"]
+        if sheet_name in current:
+            # A reload or another request brought it back while we were parsing.
+            touch(sheet_name)
+            return current[sheet_name]
+        if not is_evicted(sheet_name):
+            return None
+
+        # Journaled edits not yet in the workbook are part of the sheet.
+        loaded = overlay_pending_edits({sheet_name: tasks}, state.cached_data["schema"], sheet_name=sheet_name)
+        all_sheets_data = {**current, sheet_name: loaded[sheet_name]}
+        evicted = dict(state.cached_data["evicted_sheets"])
+        del evicted[sheet_name]
+
+        sheet_names = state.cached_data["sheet_names"]
+        state.cached_data["all_sheets_data"] = all_sheets_data
+        state.cached_data["evicted_sheets"] = evicted
+        state.rollups = compute_rollups(all_sheets_data, sheet_names)
+        state.task_index = build_index(all_sheets_data, sheet_names)
+        restore_sheet(state.data_version, sheet_name, all_sheets_data[sheet_name])
+
+        _count("rehydrations")
+        touch(sheet_name)
+        enforce_budget(keep=sheet_name)
+        return all_sheets_data[sheet_name]
+
+
+def _parse(sheet_name, descriptor, keep=True):
+    from app.services.data_loader import load_sheet
+
+    paths = [entry["file_path"] for entry in descriptor["files"]]
+    return load_sheet(sheet_name, paths, keep=keep)
+
+
+def _describe(sheet_name, tasks, estimated_bytes):
+    paths = []
+    task_count = 0
+    for instances in tasks.values():
+        for instance in instances:
+            metadata = instance.get("metadata") if isinstance(instance, dict) else None
+            if not metadata:
+                continue
+            task_count += 1
+            if metadata["file_path"] not in paths:
+                paths.append(metadata["file_path"])
+
+    files = []
+    for path in paths:
+        mtime, size = _fingerprint(path)
+        files.append({"file": os.path.basename(path), "file_path": path, "mtime": mtime, "size": size})
+
+    return {
+        "name": sheet_name,
+        "task_count": task_count,
+        "files": files,
+        "estimated_bytes": estimated_bytes,
+        "evicted_at": time.time(),
+    }
+
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, None
+    return stat.st_mtime, stat.st_size
+
+
+def _estimate(sheet_name, tasks):
+    cached = _sizes.get(sheet_name)
+    if cached is not None and cached[0] is tasks:
+        return cached[1]
+
+    total = 0
+    for task_name, instances in tasks.items():
+        total += len(task_name)
+        for instance in instances:
+            total += _ENTRY_OVERHEAD_BYTES + len(instance.get("details") or "")
+            metadata = instance.get("metadata") or {}
+            for col, value in (metadata.get("raw_values") or {}).items():
+                total += _VALUE_OVERHEAD_BYTES + len(col) + len(str(value))
+    _sizes[sheet_name] = (tasks, total)
+    return total
+
+
+def _count(stat):
+    with _lock:
+        _stats[stat] += 1
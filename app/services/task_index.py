@@ -0,0 +1,78 @@
+import hashlib
+import os
+
+# Per-sheet indexes of the last published snapshot, reused while the sheet dict is unchanged.
+_sheet_cache = {}
+
+
+def task_id_for(abs_file_path, sheet_name, task_name, occurrence=0):
+    """Stable ID for a task row, derived from its file, sheet and task name.
+
+    occurrence numbers rows with the same task name in one sheet of one file, in row
+    order, so only such duplicates depend on position. Inserting, deleting or sorting
+    other rows keeps every ID; renaming a task gives it a new one.
+    """
+    identity = f"{os.path.normcase(abs_file_path)}\0{sheet_name}\0{task_name}\0{occurrence}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def build_index(all_sheets_data, sheet_names):
+    """Map every task ID in a snapshot to (sheet_name, task_name, instance_index)."""
+    global _sheet_cache
+
+    index = {}
+    next_cache = {}
+    for sheet_name in sheet_names:
+        cached = _sheet_cache.get(sheet_name)
+        if cached is not None and sheet_name not in all_sheets_data:
+            # Evicted sheets (see services/sheet_cache.py) keep the index from when they were resident,
+            # but not the tasks dict, so evicting a sheet frees it.
+            next_cache[sheet_name] = (None, cached[1])
+            sheet_index = cached[1]
+        else:
+            tasks = all_sheets_data.get(sheet_name, {})
+            if cached is not None and cached[0] is tasks:
+                sheet_index = cached[1]
+            else:
+                sheet_index = _index_sheet(sheet_name, tasks)
+            next_cache[sheet_name] = (tasks, sheet_index)
+        index.update(sheet_index)
+    _sheet_cache = next_cache
+    return index
+
+
+def release_sheet(sheet_name):
+    """Keep an evicted sheet's index entries but drop the reference to its tasks dict."""
+    cached = _sheet_cache.get(sheet_name)
+    if cached is not None:
+        _sheet_cache[sheet_name] = (None, cached[1])
+
+
+def lookup(all_sheets_data, index, task_id):
+    """Return (sheet_name, task_name, instance_index, entry) for a task ID, or None."""
+    location = index.get(task_id)
+    if location is None:
+        return None
+
+    sheet_name, task_name, position = location
+    try:
+        entry = all_sheets_data[sheet_name][task_name][position]
+    except (KeyError, IndexError):
+        return None
+
+    # The index and the data are swapped separately on publish; never return a mismatched entry.
+    if entry["metadata"]["task_id"] != task_id:
+        return None
+    return sheet_name, task_name, position, entry
+
+
+# --- Private helpers ---
+
+def _index_sheet(sheet_name, tasks):
+    sheet_index = {}
+    for task_name, instances in tasks.items():
+        for position, instance in enumerate(instances):
+            metadata = instance.get("metadata") if isinstance(instance, dict) else None
+            if metadata and metadata.get("task_id"):
+                sheet_index[metadata["task_id"]] = (sheet_name, task_name, position)
+    return sheet_index
@@ -0,0 +1,276 @@
+import io
+import logging
+import os
+import tempfile
+
+from app.services.excel_io import read_custom_property, read_file_with_shared_access
+from app.services.profiling import span
+
+logger = logging.getLogger(__name__)
+
+# Custom document property recording the last journal edit written into the workbook ("<journal id>:<seq>").
+# It is saved by the same atomic replace as the data, so replaying the journal after a crash skips
+# edits the workbook already holds instead of, for example, adding a row twice.
+JOURNAL_MARK_PROPERTY = "PDO Journal Seq"
+
+
+class EditRejected(ValueError):
+    """An edit that cannot be applied to the current data (carries the HTTP status to report)."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def apply_edits(abs_path, entries, journal_id):
+    """Apply journaled edits to one workbook with a single read-modify-write.
+
+    Entries must be in sequence order. Those at or below the workbook's journal mark
+    were already written and count as applied without being applied again.
+    Returns (applied_seqs, rejected) where rejected is a list of (seq, reason).
+    Write errors (e.g. the file is locked) propagate so the caller can retry later.
+    """
+    import pandas as pd
+
+    file_bytes = read_file_with_shared_access(abs_path)
+    mark = _parse_mark(read_custom_property(file_bytes, JOURNAL_MARK_PROPERTY), journal_id)
+    with span("pd.read_excel", file=os.path.basename(abs_path), sheet=None):
+        # dtype=object keeps untouched cells as stored (text stays text, integers stay exact).
+        excel_data = pd.read_excel(io.BytesIO(file_bytes), sheet_name=None, engine="openpyxl", dtype=object)
+
+    applied = []
+    rejected = []
+    written = []
+    for entry in entries:
+        if entry["seq"] <= mark:
+            applied.append(entry["seq"])
+            continue
+        try:
+            if entry["op"] == "add":
+                _apply_add(excel_data, entry)
+            else:
+                _apply_update(excel_data, entry)
+            applied.append(entry["seq"])
+            written.append(entry["seq"])
+        except EditRejected as exc:
+            rejected.append((entry["seq"], str(exc)))
+
+    if written:
+        original_col_widths, original_col_formats, original_tab_colors, original_book_views = _read_formatting(abs_path)
+        _write_excel(
+            abs_path,
+            excel_data,
+            original_col_widths,
+            original_col_formats,
+            original_tab_colors,
+            original_book_views,
+            journal_mark=f"{journal_id}:{max(written)}",
+        )
+
+    return applied, rejected
+
+
+def journal_mark(abs_path, journal_id):
+    """Sequence number of the last edit from this journal written into the workbook (0 if none)."""
+    file_bytes = read_file_with_shared_access(abs_path)
+    return _parse_mark(read_custom_property(file_bytes, JOURNAL_MARK_PROPERTY), journal_id)
+
+
+def is_workbook_locked(abs_path):
+    """Best-effort check whether Excel (or LibreOffice) currently holds the workbook."""
+    if any(os.path.exists(lock_path) for lock_path in _office_lock_markers(abs_path)):
+        return True
+
+    # On some systems the lock marker is absent; try opening in read/write mode.
+    # If the file is exclusively locked, this raises PermissionError / errno 13.
+    try:
+        with open(abs_path, "r+b"):
+            pass
+    except (PermissionError, OSError) as err:
+        if isinstance(err, PermissionError) or getattr(err, "errno", None) == 13:
+            return True
+        raise
+    return False
+
+
+# --- Private helpers ---
+
+def _parse_mark(value, journal_id):
+    # Marks left by another (e.g. deleted) journal say nothing about this one's edits.
+    owner, _, seq = (value or "").rpartition(":")
+    if owner != journal_id or not seq.isdigit():
+        return 0
+    return int(seq)
+
+
+def _apply_update(excel_data, entry):
+    sheet_name = entry["sheet_name"]
+    if sheet_name not in excel_data:
+        raise EditRejected("Sheet not found", 404)
+
+    df = excel_data[sheet_name]
+    row_index = entry["row_index"]
+    if row_index < 0 or row_index >= len(df):
+        raise EditRejected("Invalid row index")
+
+    task_name_col = df.columns[0]
+    current_task_name = str(df.iloc[row_index][task_name_col])
+    if current_task_name != entry["task_name"]:
+        raise EditRejected(
+            f"Row position changed. Expected '{entry['task_name']}' but found '{current_task_name}'.",
+            409,
+        )
+
+    unknown_columns = [col for col in entry["updates"] if col not in df.columns]
+    if unknown_columns:
+        raise EditRejected(f"Unknown column(s): {', '.join(unknown_columns)}")
+
+    for col, value in entry["updates"].items():
+        _set_cell(df, row_index, col, value)
+
+    for col, value in entry["new_columns"].items():
+        if col not in df.columns:
+            df[col] = None
+        _set_cell(df, row_index, col, value)
+
+    excel_data[sheet_name] = df
+
+
+def _apply_add(excel_data, entry):
+    import pandas as pd
+
+    sheet_name = entry["sheet_name"]
+    if sheet_name not in excel_data:
+        raise EditRejected("Sheet not found", 404)
+
+    df = excel_data[sheet_name]
+    task_name_col = df.columns[0]
+
+    unknown_columns = [col for col in entry["values"] if col not in df.columns]
+    if unknown_columns:
+        raise EditRejected(f"Unknown column(s): {', '.join(unknown_columns)}")
+
+    row_data = {col: None for col in df.columns}
+    row_data[task_name_col] = entry["task_name"]
+
+    for col, value in entry["values"].items():
+        row_data[col] = value if value != "" else None
+
+    for col, value in entry["new_columns"].items():
+        if col not in df.columns:
+            df[col] = None
+        row_data[col] = value if value != "" else None
+
+    new_row_df = pd.DataFrame([row_data], columns=df.columns)
+    excel_data[sheet_name] = pd.concat([df, new_row_df], ignore_index=True)
+
+
+def _set_cell(df, row_index, col, value):
+    # Edited values arrive as text; widen typed columns (dates, numbers) so pandas accepts them.
+    if df[col].dtype != object:
+        df[col] = df[col].astype(object)
+    df.at[row_index, col] = value if value != "" else None
+
+
+def _read_formatting(abs_path):
+    """Read original Excel formatting before overwriting."""
+    from openpyxl import load_workbook
+
+    with span("_read_formatting", file=os.path.basename(abs_path)):
+        original_col_widths = {}
+        original_col_formats = {}
+        original_tab_colors = {}
+        original_book_views = None
+
+        try:
+            file_bytes = read_file_with_shared_access(abs_path)
+            temp_wb = load_workbook(io.BytesIO(file_bytes))
+
+            if temp_wb.views:
+                original_book_views = temp_wb.views
+
+            for sheet_name in temp_wb.sheetnames:
+                original_col_widths[sheet_name] = {}
+                original_col_formats[sheet_name] = {}
+                ws = temp_wb[sheet_name]
+
+                if ws.sheet_properties.tabColor:
+                    original_tab_colors[sheet_name] = ws.sheet_properties.tabColor
+
+                for col_letter, dim in ws.column_dimensions.items():
+                    if dim.width:
+                        original_col_widths[sheet_name][col_letter] = dim.width
+
+                if ws.max_row >= 2:
+                    for col_idx in range(1, ws.max_column + 1):
+                        cell = ws.cell(row=2, column=col_idx)
+                        if cell.number_format and cell.number_format != "General":
+                            from openpyxl.utils import get_column_letter
+                            col_letter = get_column_letter(col_idx)
+                            original_col_formats[sheet_name][col_letter] = cell.number_format
+
+            temp_wb.close()
+        except Exception as exc:
+            logger.warning("Could not preserve original workbook formatting: %s", exc)
+
+        return original_col_widths, original_col_formats, original_tab_colors, original_book_views
+
+
+def _write_excel(abs_path, excel_data, col_widths, col_formats, tab_colors, book_views, journal_mark=None):
+    """Write Excel data back to file atomically, restoring formatting.
+
+    Writes to a temp file in the same directory first, then replaces the
+    original via rename. This prevents data loss if the write fails midway.
+    """
+    import pandas as pd
+
+    with span("_write_excel", file=os.path.basename(abs_path), sheets=len(excel_data)):
+        dir_name = os.path.dirname(abs_path)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp.xlsx")
+        try:
+            os.close(tmp_fd)
+            with pd.ExcelWriter(tmp_path, engine="openpyxl", mode="w") as writer:
+                for sname, sheet_df in excel_data.items():
+                    sheet_df.to_excel(writer, sheet_name=sname, index=False)
+
+                if book_views:
+                    writer.book.views = book_views
+
+                if journal_mark:
+                    from openpyxl.packaging.custom import StringProperty
+                    writer.book.custom_doc_props.append(StringProperty(name=JOURNAL_MARK_PROPERTY, value=journal_mark))
+
+                for sname in writer.sheets:
+                    ws = writer.sheets[sname]
+
+                    if sname in tab_colors:
+                        ws.sheet_properties.tabColor = tab_colors[sname]
+
+                    if sname in col_widths:
+                        for col_letter, width in col_widths[sname].items():
+                            ws.column_dimensions[col_letter].width = width
+
+                    if sname in col_formats:
+                        for col_letter, num_format in col_formats[sname].items():
+                            from openpyxl.utils import column_index_from_string
+                            col_idx = column_index_from_string(col_letter)
+                            for row_idx in range(2, ws.max_row + 1):
+                                ws.cell(row=row_idx, column=col_idx).number_format = num_format
+
+            os.replace(tmp_path, abs_path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def _office_lock_markers(abs_path):
+    """Common lock-file names created by Excel/LibreOffice."""
+    dir_name = os.path.dirname(abs_path)
+    base_name = os.path.basename(abs_path)
+    return [
+        os.path.join(dir_name, f"~${base_name}"),
+        os.path.join(dir_name, f".~lock.{base_name}#"),
+    ]
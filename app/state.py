@@ -4,12 +4,23 @@ cached_data = {
     "all_sheets_data": {},
     "sheet_names": [],
     "last_updated": None,
+    "stale": False,
+    # Sheet name -> column name -> {"type": date|number|enum|text, "values": [...] for enums}
+    "schema": {},
+    # Sheet name -> descriptor of a sheet evicted under the memory budget (see services/sheet_cache.py)
+    "evicted_sheets": {},
 }
 
 data_version = 0
 
+# Per-sheet/per-file counts for the published snapshot (see services/rollups.py)
+rollups = {"sheets": {}, "mtimes": {}}
+
+# Task ID -> (sheet_name, task_name, instance_index) for the published snapshot
+task_index = {}
+
 connected_clients = []
 
-write_in_progress = False
-write_lock = threading.Lock()
+# Serializes read-modify-publish of cached_data between edits and reloads
+snapshot_lock = threading.RLock()
 
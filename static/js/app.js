@@ -1,6 +1,13 @@
 // ===== GLOBAL STATE =====
 let allSheetsData = window.AppConfig?.allSheetsData || {};
 let currentDataVersion = window.AppConfig?.dataVersion || 0;
+let dataIsStale = window.AppConfig?.stale || false;
+let projectSummary = window.AppConfig?.summary || null;
+let dataSchema = window.AppConfig?.schema || {};
+// Sheets the server evicted under its memory budget; fetched from /api/sheets/{name} when opened
+let evictedSheets = window.AppConfig?.evictedSheets || {};
+const sheetLoads = new Map();
+let summaryVersion = projectSummary ? currentDataVersion : 0;
 let availableSheetNames = window.AppConfig?.sheetNames || Object.keys(allSheetsData || {});
 let currentSheet = window.AppConfig?.initialSheet || '';
 let buttonData = allSheetsData[currentSheet];
@@ -10,6 +17,23 @@ let filterBarOpen = false;
 let originalDetails = {};
 let addTaskKnownColumns = [];
 
+// Keyed task model: one entry per task instance, reused across refreshes while unchanged
+let taskModel = new Map();
+let sheetTaskKeys = new Map();
+let sheetFileColumns = new Map();
+let taskRevision = 0;
+const taskDomIds = new Map();
+let nextTaskDomId = 0;
+
+// Virtualized lists (created in init)
+let taskButtonList = null;
+let dueSoonList = null;
+const detailNodes = new Map();
+const editingTaskKeys = new Set();
+const dueSoonExpandedKeys = new Set();
+const dueSoonEditingKeys = new Set();
+const projectButtons = new Map();
+
 const PROJECT_PANEL_MIN_HEIGHT = 120;
 const PROJECT_PANEL_HEIGHT_STORAGE_KEY = 'project_panel_top_height_px';
 
@@ -107,6 +131,404 @@ function parseTaskDetails(details) {
   return { description, status, priority, assignedTo, deadline };
 }
 
+function escapeHtml(value) {
+  return String(value ?? '')
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;')
+    .replace(/'/g, '&#39;');
+}
+
+function formatDetailsForDisplay(details) {
+  return (details || '').replace(/Deadline:\s*(\d{4}-\d{2}-\d{2})(?:\s*\d{2}:\d{2}:\d{2})?/g, (m, d) => {
+    const p = d.split('-');
+    return 'Deadline: ' + p[2] + '/' + p[1] + '/' + p[0].slice(-2);
+  });
+}
+
+// ===== COLUMNAR PAYLOADS =====
+// /api/data?format=columnar sends each sheet as column sets plus one array per task
+// (see app/services/columnar.py); rebuild the usual all_sheets_data shape from it.
+const ISO_DATETIME = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}/;
+
+function displayValue(value) {
+  if (typeof value === 'boolean') return value ? 'True' : 'False';
+  const text = String(value);
+  return ISO_DATETIME.test(text) ? text.replace('T', ' ') : text;
+}
+
+// Same text as build_details in app/services/data_loader.py.
+function buildDetails(columns, rawValues) {
+  const lines = [];
+  for (let i = 1; i < columns.length; i++) {
+    const value = rawValues[columns[i]];
+    if (value !== null && value !== undefined && displayValue(value).trim()) {
+      lines.push(`${columns[i]}: ${displayValue(value)}`);
+    }
+  }
+  return lines.join('\n');
+}
+
+function decodeColumnar(payload) {
+  const allSheetsData = {};
+  Object.entries(payload.sheets).forEach(([sheetName, block]) => {
+    const tasks = {};
+    block.rows.forEach(row => {
+      const taskName = row[0];
+      if (!tasks[taskName]) tasks[taskName] = [];
+      if (row[1] === null) {
+        tasks[taskName].push({ details: row[2], metadata: null });
+        return;
+      }
+
+      const columns = block.column_sets[row[4]];
+      const rawValues = { [columns[0]]: taskName };
+      for (let i = 1; i < columns.length; i++) {
+        rawValues[columns[i]] = row[4 + i];
+      }
+      tasks[taskName].push({
+        details: row.length > 4 + columns.length ? row[4 + columns.length] : buildDetails(columns, rawValues),
+        metadata: {
+          task_id: row[1],
+          file_path: payload.files[row[2]],
+          sheet_name: sheetName,
+          row_index: row[3],
+          columns,
+          raw_values: rawValues,
+          task_name: taskName,
+        },
+      });
+    });
+    allSheetsData[sheetName] = tasks;
+  });
+
+  const { sheets, files, format, ...rest } = payload;
+  return { ...rest, all_sheets_data: allSheetsData };
+}
+
+// ===== KEYED TASK MODEL =====
+function taskKeyFor(sheetName, taskName, index, metadata) {
+  // Server-assigned stable ID (file + sheet + row); the fallbacks cover placeholder rows.
+  if (metadata && metadata.task_id) {
+    return metadata.task_id;
+  }
+  if (metadata) {
+    return `${metadata.file_path}::${metadata.sheet_name}::${metadata.row_index}`;
+  }
+  return `${sheetName}::${taskName}::${index}`;
+}
+
+function domIdForKey(key) {
+  let id = taskDomIds.get(key);
+  if (!id) {
+    id = `t${nextTaskDomId++}`;
+    taskDomIds.set(key, id);
+  }
+  return id;
+}
+
+// Rebuild the model from the server payload, keeping task objects whose data did not change.
+// Returns the set of keys that were added, changed or removed.
+function buildTaskModel(data) {
+  const previous = taskModel;
+  const next = new Map();
+  const nextSheetKeys = new Map();
+  const nextColumns = new Map();
+  const changed = new Set();
+
+  Object.keys(data || {}).forEach(sheetName => {
+    const keys = [];
+    const tasks = data[sheetName] || {};
+
+    Object.keys(tasks).forEach(taskName => {
+      tasks[taskName].forEach((instance, index) => {
+        const details = typeof instance === 'string' ? instance : instance.details;
+        const metadata = typeof instance === 'object' && instance.metadata ? instance.metadata : null;
+        const key = taskKeyFor(sheetName, taskName, index, metadata);
+        keys.push(key);
+        if (metadata && Array.isArray(metadata.columns)) {
+          addKnownColumns(nextColumns, `${sheetName}\u0000`, metadata.columns);
+          addKnownColumns(nextColumns, `${sheetName}\u0000${metadata.file_path}`, metadata.columns);
+        }
+
+        const old = previous.get(key);
+        if (old && old.name === taskName && old.project === sheetName && old.instanceIndex === index && old.details === details) {
+          old.metadata = metadata;
+          next.set(key, old);
+          return;
+        }
+
+        const { description, status, priority, assignedTo, deadline, deadlineDate } = taskFields(sheetName, details, metadata);
+        next.set(key, {
+          key, revision: ++taskRevision,
+          name: taskName, project: sheetName, instanceIndex: index,
+          description, status, priority, assignedTo, deadline, deadlineDate,
+          details: details || '', metadata
+        });
+        changed.add(key);
+      });
+    });
+
+    nextSheetKeys.set(sheetName, keys);
+  });
+
+  previous.forEach((_, key) => {
+    if (!next.has(key)) changed.add(key);
+  });
+
+  taskModel = next;
+  sheetTaskKeys = nextSheetKeys;
+  sheetFileColumns = new Map(Array.from(nextColumns, ([key, cols]) => [key, Array.from(cols)]));
+  return changed;
+}
+
+function addKnownColumns(columnsByKey, key, columns) {
+  let known = columnsByKey.get(key);
+  if (!known) {
+    known = new Set();
+    columnsByKey.set(key, known);
+  }
+  columns.forEach(col => known.add(col));
+}
+
+// The server normalizes values once (ISO dates, canonical Status/Priority), so read them directly;
+// only placeholder rows without metadata fall back to parsing the details text.
+function taskFields(sheetName, details, metadata) {
+  const raw = metadata && metadata.raw_values;
+  if (!raw) {
+    const parsed = parseTaskDetails(details || '');
+    return { ...parsed, deadlineDate: parseDeadlineToDate(parsed.deadline) };
+  }
+
+  const text = col => (raw[col] === null || raw[col] === undefined) ? '' : String(raw[col]);
+  const deadlineType = dataSchema[sheetName]?.Deadline?.type;
+  const deadlineDate = deadlineType === 'date' ? dateFromIso(raw.Deadline) : parseDeadlineToDate(text('Deadline'));
+
+  return {
+    description: text('Description'),
+    status: text('Status'),
+    priority: text('Priority'),
+    assignedTo: text('Assigned To'),
+    deadline: deadlineDate ? formatShortDate(deadlineDate) : text('Deadline'),
+    deadlineDate,
+  };
+}
+
+function dateFromIso(value) {
+  const match = typeof value === 'string' && value.match(/^(\d{4})-(\d{2})-(\d{2})/);
+  if (!match) return null;
+  return new Date(parseInt(match[1]), parseInt(match[2]) - 1, parseInt(match[3]));
+}
+
+function formatShortDate(date) {
+  return `${String(date.getDate()).padStart(2, '0')}/${String(date.getMonth() + 1).padStart(2, '0')}/${String(date.getFullYear()).slice(-2)}`;
+}
+
+function getSheetTasks(sheetName) {
+  return (sheetTaskKeys.get(sheetName) || []).map(key => taskModel.get(key));
+}
+
+// ===== DOM PATCHING / VIRTUALIZATION =====
+// Make `container` hold exactly `nodes` in order, moving only nodes that are out of place.
+function patchChildren(container, nodes) {
+  let cursor = container.firstChild;
+  for (const node of nodes) {
+    if (node === cursor) {
+      cursor = cursor.nextSibling;
+    } else {
+      container.insertBefore(node, cursor);
+    }
+  }
+  while (cursor) {
+    const next = cursor.nextSibling;
+    container.removeChild(cursor);
+    cursor = next;
+  }
+}
+
+// Renders only the items inside the scroll viewport (plus overscan). Items are
+// { key, signature, render }; a node is rebuilt only when its signature changes.
+// Sizes are measured once rendered and estimated until then.
+class VirtualList {
+  constructor(scrollEl, contentEl, options = {}) {
+    this.scrollEl = scrollEl;
+    this.contentEl = contentEl;
+    this.horizontal = options.axis === 'x';
+    this.estimateSize = options.estimateSize || (() => 48);
+    this.overscan = options.overscan ?? 6;
+    this.isPinned = options.isPinned || (() => false);
+    this.onRender = options.onRender || null;
+    this.items = [];
+    this.keyIndex = new Map();
+    this.sizes = new Map();
+    this.nodes = new Map();
+    this.offsets = [0];
+    this.frame = null;
+    this.startSpacer = this.createSpacer();
+    this.endSpacer = this.createSpacer();
+
+    scrollEl.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+    window.addEventListener('resize', () => this.scheduleRender());
+  }
+
+  createSpacer() {
+    const spacer = document.createElement('div');
+    spacer.className = 'vlist-spacer';
+    spacer.setAttribute('aria-hidden', 'true');
+    return spacer;
+  }
+
+  gap() {
+    if (!this.horizontal) return 0;
+    return parseFloat(getComputedStyle(this.contentEl).columnGap) || 0;
+  }
+
+  setItems(items) {
+    this.items = items;
+    this.keyIndex = new Map(items.map((item, index) => [item.key, index]));
+
+    for (const [key, entry] of this.nodes) {
+      if (!this.keyIndex.has(key) && !this.isPinned(key)) {
+        entry.node.remove();
+        this.nodes.delete(key);
+      }
+    }
+    for (const key of this.sizes.keys()) {
+      if (!this.keyIndex.has(key)) this.sizes.delete(key);
+    }
+
+    this.computeOffsets();
+    this.render();
+  }
+
+  computeOffsets() {
+    const offsets = new Array(this.items.length + 1);
+    offsets[0] = 0;
+    for (let i = 0; i < this.items.length; i++) {
+      const item = this.items[i];
+      offsets[i + 1] = offsets[i] + (this.sizes.get(item.key) ?? this.estimateSize(item));
+    }
+    this.offsets = offsets;
+  }
+
+  indexAt(position) {
+    let lo = 0;
+    let hi = this.items.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (this.offsets[mid] <= position) lo = mid;
+      else hi = mid - 1;
+    }
+    return Math.max(lo, 0);
+  }
+
+  contentStart() {
+    const scrollRect = this.scrollEl.getBoundingClientRect();
+    const contentRect = this.contentEl.getBoundingClientRect();
+    const style = getComputedStyle(this.contentEl);
+    if (this.horizontal) {
+      return contentRect.left - scrollRect.left + this.scrollEl.scrollLeft + (parseFloat(style.paddingLeft) || 0);
+    }
+    return contentRect.top - scrollRect.top + this.scrollEl.scrollTop + (parseFloat(style.paddingTop) || 0);
+  }
+
+  scheduleRender() {
+    if (this.frame !== null) return;
+    this.frame = requestAnimationFrame(() => this.render());
+  }
+
+  nodeFor(item) {
+    const entry = this.nodes.get(item.key);
+    if (entry && (entry.signature === item.signature || this.isPinned(item.key))) {
+      return entry.node;
+    }
+    const node = item.render();
+    if (entry) entry.node.remove();
+    this.nodes.set(item.key, { signature: item.signature, node });
+    return node;
+  }
+
+  render() {
+    if (this.frame !== null) {
+      cancelAnimationFrame(this.frame);
+      this.frame = null;
+    }
+
+    const count = this.items.length;
+    const scrollPos = this.horizontal ? this.scrollEl.scrollLeft : this.scrollEl.scrollTop;
+    const viewportSize = this.horizontal ? this.scrollEl.clientWidth : this.scrollEl.clientHeight;
+    const start = Math.max(0, scrollPos - this.contentStart());
+
+    let first = 0;
+    let last = -1;
+    if (count > 0) {
+      first = Math.max(0, this.indexAt(start) - this.overscan);
+      last = Math.min(count - 1, this.indexAt(start + viewportSize) + this.overscan);
+    }
+
+    const visible = [];
+    for (let i = first; i <= last; i++) {
+      visible.push(this.nodeFor(this.items[i]));
+    }
+    patchChildren(this.contentEl, [this.startSpacer, ...visible, this.endSpacer]);
+
+    // Nodes scrolled out of view are dropped unless they hold user state (expanded/editing).
+    for (const [key, entry] of this.nodes) {
+      if (!entry.node.isConnected && !this.isPinned(key)) this.nodes.delete(key);
+    }
+
+    const gap = this.gap();
+    let resized = false;
+    for (let i = first; i <= last; i++) {
+      const node = visible[i - first];
+      const measured = this.horizontal ? node.offsetWidth : node.offsetHeight;
+      if (measured > 0) {
+        const size = measured + gap;
+        if (this.sizes.get(this.items[i].key) !== size) {
+          this.sizes.set(this.items[i].key, size);
+          resized = true;
+        }
+      }
+    }
+    if (resized) this.computeOffsets();
+
+    this.setSpacerSize(this.startSpacer, count > 0 ? this.offsets[first] : 0, gap);
+    this.setSpacerSize(this.endSpacer, count > 0 ? this.offsets[count] - this.offsets[last + 1] : 0, gap);
+
+    if (this.onRender) this.onRender();
+  }
+
+  setSpacerSize(spacer, size, gap) {
+    if (size <= 0) {
+      spacer.style.display = 'none';
+      return;
+    }
+    spacer.style.display = '';
+    const px = `${Math.max(0, size - gap)}px`;
+    if (this.horizontal) {
+      spacer.style.width = px;
+      spacer.style.flex = '0 0 auto';
+    } else {
+      spacer.style.height = px;
+    }
+  }
+
+  renderedNodes() {
+    return Array.from(this.nodes.values(), entry => entry.node);
+  }
+
+  scrollToKey(key, behavior = 'smooth') {
+    const index = this.keyIndex.get(key);
+    if (index === undefined) return;
+    const itemStart = this.offsets[index] + this.contentStart();
+    const itemSize = this.offsets[index + 1] - this.offsets[index];
+    const viewportSize = this.horizontal ? this.scrollEl.clientWidth : this.scrollEl.clientHeight;
+    const target = Math.max(0, itemStart - (viewportSize - itemSize) / 2);
+    this.scrollEl.scrollTo(this.horizontal ? { left: target, behavior } : { top: target, behavior });
+  }
+}
+
 function truncateDescription(description, maxWords = 5) {
   if (!description) return '';
   const words = description.split(' ');
@@ -122,7 +544,7 @@ function getStatusBadge(status) {
     'Blocked': 'bg-rose-500/20 text-rose-400'
   };
   const color = statusConfig[status] || 'bg-gray-500/20 text-gray-400';
-  return `<span class="inline-flex items-center px-2 py-0.5 rounded-md text-xs font-medium ${color}">${status}</span>`;
+  return `<span class="inline-flex items-center px-2 py-0.5 rounded-md text-xs font-medium ${color}">${escapeHtml(status)}</span>`;
 }
 
 function getPriorityIndicator(priority) {
@@ -168,61 +590,63 @@ function applyFilters() {
 }
 
 // ===== BUTTON CREATION =====
-function createButtons(sheetName, shouldApplyFilters = false) {
-  const container = document.getElementById('buttonContainer');
-  container.innerHTML = '';
-
-  allTasks = [];
-  const taskNames = Object.keys(allSheetsData[sheetName] || {});
-
-  taskNames.forEach(taskName => {
-    const instances = allSheetsData[sheetName][taskName];
+const DETAILS_PLACEHOLDER_HTML = `
+  <div class="flex flex-col items-center justify-center h-32 text-gray-600">
+    <svg class="w-10 h-10 mb-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+      <path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2"></path>
+    </svg>
+    <p class="text-sm">Click a task to view details</p>
+  </div>`;
+
+function showDetailsPlaceholder() {
+  detailNodes.clear();
+  editingTaskKeys.clear();
+  document.getElementById('textDisplay').innerHTML = DETAILS_PLACEHOLDER_HTML;
+}
 
-    instances.forEach((instance, index) => {
-      const details = typeof instance === 'string' ? instance : instance.details;
-      const metadata = typeof instance === 'object' && instance.metadata ? instance.metadata : null;
-      const { description, status, priority, assignedTo, deadline } = parseTaskDetails(details);
+function createTaskButton(taskName, index) {
+  const button = document.createElement('button');
+  button.textContent = taskName;
+  button.onclick = () => showTaskDetails(taskName);
+  button.id = `task-${index}`;
+  button.dataset.taskName = taskName;
+
+  const colorClass = buttonColors[index % buttonColors.length];
+  button.className = `task-button ${colorClass} text-white`;
+  if (taskName === selectedTask) {
+    button.classList.add('task-button-selected');
+  }
+  return button;
+}
 
-      allTasks.push({
-        name: taskName,
-        instanceIndex: index,
-        description, status, priority, assignedTo, deadline,
-        details, metadata
-      });
-    });
-  });
+function createButtons(sheetName, shouldApplyFilters = false) {
+  allTasks = getSheetTasks(sheetName);
 
   const tasksToDisplay = shouldApplyFilters ? getFilteredTasks() : allTasks;
   updateTaskCounter(tasksToDisplay.length, allTasks.length);
 
   const uniqueTaskNames = [...new Set(tasksToDisplay.map(t => t.name))];
 
-  uniqueTaskNames.forEach((taskName, index) => {
-    const button = document.createElement('button');
-    button.textContent = taskName;
-    button.onclick = () => showTaskDetails(taskName);
-    button.id = `task-${index}`;
-
-    const colorClass = buttonColors[index % buttonColors.length];
-    button.className = `task-button ${colorClass} text-white`;
-
-    container.appendChild(button);
-  });
+  taskButtonList.setItems(uniqueTaskNames.map((taskName, index) => ({
+    key: taskName,
+    signature: `${index}`,
+    render: () => createTaskButton(taskName, index),
+  })));
 
   if (selectedTask && !uniqueTaskNames.includes(selectedTask)) {
     selectedTask = null;
-    document.getElementById('textDisplay').innerHTML = `
-      <div class="flex flex-col items-center justify-center h-32 text-gray-600">
-        <svg class="w-10 h-10 mb-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-          <path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2"></path>
-        </svg>
-        <p class="text-sm">Click a task to view details</p>
-      </div>`;
+    showDetailsPlaceholder();
   }
 
   updateScrollIndicators();
 }
 
+function markSelectedTaskButton() {
+  taskButtonList.renderedNodes().forEach(btn => {
+    btn.classList.toggle('task-button-selected', btn.dataset.taskName === selectedTask);
+  });
+}
+
 // ===== TASK INSTANCE TOGGLE =====
 function toggleTaskInstance(instanceId) {
   const instance = document.getElementById(`instance-${instanceId}`);
@@ -245,117 +669,137 @@ function toggleTaskInstance(instanceId) {
 }
 
 // ===== TASK DETAILS =====
-function showTaskDetails(taskName) {
-  selectedTask = taskName;
+function renderTaskInstance(task, index) {
+  const instanceId = domIdForKey(task.key);
+  const shortDesc = truncateDescription(task.description, 4);
+  const statusBadge = getStatusBadge(task.status);
+  const priorityIndicator = getPriorityIndicator(task.priority);
+  const deadlineText = task.deadline ? `Due: ${task.deadline}` : '';
+  const hasMetadata = task.metadata !== null;
+  const borderColor = index % 2 === 0 ? 'border-l-violet-500/50' : 'border-l-blue-500/50';
+  const sourceFile = hasMetadata ? task.metadata.file_path.split(/[\\\/]/).pop() : '';
+
+  const wrapper = document.createElement('div');
+  wrapper.id = `instance-${instanceId}`;
+  wrapper.dataset.taskKey = task.key;
+  wrapper.className = `task-instance task-instance-expanded bg-white/[0.02] border border-white/5 border-l-2 ${borderColor} rounded-lg mb-3 overflow-hidden`;
+  wrapper.innerHTML = `
+    <!-- Header -->
+    <div class="p-4 cursor-pointer hover:bg-white/[0.03] transition flex items-center justify-between" onclick="toggleTaskInstance('${instanceId}')">
+      <div class="flex items-center gap-3 flex-1 min-w-0">
+        <svg id="icon-${instanceId}" class="toggle-icon toggle-icon-expanded w-4 h-4 text-gray-500 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+          <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5l7 7-7 7"></path>
+        </svg>
+        <div class="flex-1 flex flex-wrap items-center gap-2 min-w-0">
+          <span class="font-semibold text-sm text-white">${escapeHtml(task.name)}</span>
+          ${shortDesc ? `<span class="text-gray-500 text-xs truncate">${escapeHtml(shortDesc)}</span>` : ''}
+          ${statusBadge}
+          ${priorityIndicator}
+          ${deadlineText ? `<span class="text-xs text-orange-400/80">${escapeHtml(deadlineText)}</span>` : ''}
+        </div>
+      </div>
+      ${hasMetadata ? `
+        <button onclick="event.stopPropagation(); startEdit('${instanceId}')"
+                class="edit-btn bg-accent-500/20 hover:bg-accent-500/30 text-accent-400 px-3 py-1 rounded-md text-xs font-medium ml-2 transition">
+          Edit
+        </button>
+      ` : ''}
+    </div>
+
+    <!-- Details -->
+    <div id="details-${instanceId}" class="task-details task-details-visible px-4 pb-4 pt-0">
+      <!-- View Mode -->
+      <div id="view-${instanceId}" class="pl-7 border-l border-white/5 ml-2 space-y-2">
+        <div class="whitespace-pre-line text-gray-400 text-sm leading-relaxed">${escapeHtml(formatDetailsForDisplay(task.details))}</div>
+      </div>
+
+      <!-- Edit Mode -->
+      <div id="edit-${instanceId}" class="hidden pl-7 border-l border-accent-500/30 ml-2 space-y-4">
+        <textarea id="textarea-${instanceId}"
+                  class="edit-textarea"
+                  data-task-key="${escapeHtml(task.key)}">${escapeHtml(task.details)}</textarea>
+
+        <div class="flex gap-2">
+          <button onclick="saveEdit('${instanceId}')"
+                  id="save-btn-${instanceId}"
+                  class="bg-emerald-600 hover:bg-emerald-700 text-white px-4 py-1.5 rounded-lg text-sm font-medium transition">
+            Save Changes
+          </button>
+          <button onclick="cancelEdit('${instanceId}')"
+                  class="bg-white/5 hover:bg-white/10 text-gray-300 px-4 py-1.5 rounded-lg text-sm font-medium transition">
+            Cancel
+          </button>
+        </div>
+
+        <div class="text-xs text-gray-600">
+          <p>Format: <code class="bg-white/5 px-1.5 py-0.5 rounded text-gray-400">ColumnName: value</code></p>
+          <p>Add new columns by adding new lines in this format.</p>
+          ${hasMetadata ? `<p class="mt-1 text-gray-600">Source: ${escapeHtml(sourceFile)}</p>` : ''}
+        </div>
+      </div>
+    </div>
+  `;
+  return wrapper;
+}
 
+function showTaskDetails(taskName) {
   const display = document.getElementById('textDisplay');
   const filteredTasks = getFilteredTasks();
   const instances = filteredTasks.filter(t => t.name === taskName);
 
   if (instances.length === 0) return;
 
-  let html = '';
+  if (selectedTask !== taskName) {
+    detailNodes.clear();
+    editingTaskKeys.clear();
+  }
+  selectedTask = taskName;
+
+  const nodes = [];
 
   const totalInstances = allTasks.filter(t => t.name === taskName).length;
   if (totalInstances > 1) {
-    html += `<div class="mb-4 text-xs text-gray-500">
-      <span class="font-semibold text-gray-400">${taskName}</span> &mdash; ${instances.length} ${instances.length !== totalInstances ? `of ${totalInstances}` : ''} instance${instances.length !== 1 ? 's' : ''}
-    </div>`;
+    const summary = document.createElement('div');
+    summary.className = 'mb-4 text-xs text-gray-500';
+    summary.innerHTML = `<span class="font-semibold text-gray-400">${escapeHtml(taskName)}</span> &mdash; ${instances.length} ${instances.length !== totalInstances ? `of ${totalInstances}` : ''} instance${instances.length !== 1 ? 's' : ''}`;
+    nodes.push(summary);
   }
 
+  // Reuse instance cards whose data did not change; keep cards being edited untouched.
+  const liveKeys = new Set();
   instances.forEach((task, index) => {
-    const shortDesc = truncateDescription(task.description, 4);
-    const statusBadge = getStatusBadge(task.status);
-    const priorityIndicator = getPriorityIndicator(task.priority);
-    const deadlineText = task.deadline ? `Due: ${task.deadline}` : '';
-    const hasMetadata = task.metadata !== null;
-    const taskIndex = allTasks.indexOf(task);
-
-    const borderColor = index % 2 === 0 ? 'border-l-violet-500/50' : 'border-l-blue-500/50';
-
-    const collapsedClass = 'task-instance-expanded';
-    const detailsClass = 'task-details-visible';
-    const iconClass = 'toggle-icon-expanded';
-
-    const sourceFile = hasMetadata ? task.metadata.file_path.split(/[\\\/]/).pop() : '';
-
-    html += `
-      <div id="instance-${taskName}-${index}" class="task-instance ${collapsedClass} bg-white/[0.02] border border-white/5 border-l-2 ${borderColor} rounded-lg mb-3 overflow-hidden">
-        <!-- Header -->
-        <div class="p-4 cursor-pointer hover:bg-white/[0.03] transition flex items-center justify-between" onclick="toggleTaskInstance('${taskName}-${index}')">
-          <div class="flex items-center gap-3 flex-1 min-w-0">
-            <svg id="icon-${taskName}-${index}" class="toggle-icon ${iconClass} w-4 h-4 text-gray-500 flex-shrink-0" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-              <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5l7 7-7 7"></path>
-            </svg>
-            <div class="flex-1 flex flex-wrap items-center gap-2 min-w-0">
-              <span class="font-semibold text-sm text-white">${taskName}</span>
-              ${shortDesc ? `<span class="text-gray-500 text-xs truncate">${shortDesc}</span>` : ''}
-              ${statusBadge}
-              ${priorityIndicator}
-              ${deadlineText ? `<span class="text-xs text-orange-400/80">${deadlineText}</span>` : ''}
-            </div>
-          </div>
-          ${hasMetadata ? `
-            <button onclick="event.stopPropagation(); startEdit('${taskName}-${index}', ${taskIndex})"
-                    class="edit-btn bg-accent-500/20 hover:bg-accent-500/30 text-accent-400 px-3 py-1 rounded-md text-xs font-medium ml-2 transition">
-              Edit
-            </button>
-          ` : ''}
-        </div>
-
-        <!-- Details -->
-        <div id="details-${taskName}-${index}" class="task-details ${detailsClass} px-4 pb-4 pt-0">
-          <!-- View Mode -->
-          <div id="view-${taskName}-${index}" class="pl-7 border-l border-white/5 ml-2 space-y-2">
-            <div class="whitespace-pre-line text-gray-400 text-sm leading-relaxed">${task.details.replace(/Deadline:\s*(\d{4}-\d{2}-\d{2})\s*\d{2}:\d{2}:\d{2}/g, (m, d) => { const p = d.split('-'); return 'Deadline: ' + p[2] + '/' + p[1] + '/' + p[0].slice(-2); })}</div>
-          </div>
-
-          <!-- Edit Mode -->
-          <div id="edit-${taskName}-${index}" class="hidden pl-7 border-l border-accent-500/30 ml-2 space-y-4">
-            <textarea id="textarea-${taskName}-${index}"
-                      class="edit-textarea"
-                      data-task-index="${taskIndex}">${task.details}</textarea>
-
-            <div class="flex gap-2">
-              <button onclick="saveEdit('${taskName}-${index}')"
-                      id="save-btn-${taskName}-${index}"
-                      class="bg-emerald-600 hover:bg-emerald-700 text-white px-4 py-1.5 rounded-lg text-sm font-medium transition">
-                Save Changes
-              </button>
-              <button onclick="cancelEdit('${taskName}-${index}')"
-                      class="bg-white/5 hover:bg-white/10 text-gray-300 px-4 py-1.5 rounded-lg text-sm font-medium transition">
-                Cancel
-              </button>
-            </div>
+    const signature = `${task.revision}:${index % 2}`;
+    const entry = detailNodes.get(task.key);
+    liveKeys.add(task.key);
 
-            <div class="text-xs text-gray-600">
-              <p>Format: <code class="bg-white/5 px-1.5 py-0.5 rounded text-gray-400">ColumnName: value</code></p>
-              <p>Add new columns by adding new lines in this format.</p>
-              ${hasMetadata ? `<p class="mt-1 text-gray-600">Source: ${sourceFile}</p>` : ''}
-            </div>
-          </div>
-        </div>
-      </div>
-    `;
+    if (entry && (entry.signature === signature || editingTaskKeys.has(task.key))) {
+      nodes.push(entry.node);
+      return;
+    }
+    const node = renderTaskInstance(task, index);
+    detailNodes.set(task.key, { signature, node });
+    nodes.push(node);
   });
 
-  display.innerHTML = html;
-
-  document.querySelectorAll('.task-button').forEach(btn => {
-    btn.classList.remove('task-button-selected');
-    if (btn.textContent === taskName) {
-      btn.classList.add('task-button-selected');
+  for (const key of detailNodes.keys()) {
+    if (!liveKeys.has(key)) {
+      detailNodes.delete(key);
+      editingTaskKeys.delete(key);
     }
-  });
+  }
+
+  patchChildren(display, nodes);
+  markSelectedTaskButton();
 }
 
 // ===== EDIT FUNCTIONALITY =====
-function startEdit(instanceId, taskIndex) {
+function startEdit(instanceId) {
   const viewDiv = document.getElementById(`view-${instanceId}`);
   const editDiv = document.getElementById(`edit-${instanceId}`);
   const textarea = document.getElementById(`textarea-${instanceId}`);
 
   originalDetails[instanceId] = textarea.value;
+  editingTaskKeys.add(textarea.dataset.taskKey);
 
   viewDiv.classList.add('hidden');
   editDiv.classList.remove('hidden');
@@ -373,23 +817,19 @@ function cancelEdit(instanceId) {
 
   editDiv.classList.add('hidden');
   viewDiv.classList.remove('hidden');
-}
 
-async function saveEdit(instanceId) {
-  const textarea = document.getElementById(`textarea-${instanceId}`);
-  const saveBtn = document.getElementById(`save-btn-${instanceId}`);
-  const taskIndex = parseInt(textarea.dataset.taskIndex);
-  const task = allTasks[taskIndex];
-
-  if (!task || !task.metadata) {
-    showNotification('Error: Cannot save - missing metadata', 'error');
-    return;
+  // A refresh may have arrived while editing; re-render the card with current data.
+  const wasEditing = editingTaskKeys.delete(textarea.dataset.taskKey);
+  if (wasEditing && selectedTask) {
+    showTaskDetails(selectedTask);
   }
+}
 
-  const newDetails = textarea.value;
+// Build the updates/new_columns payload from an edited "Key: Value" textarea.
+function buildTaskChanges(newDetails, metadata) {
   const updates = {};
   const newColumns = {};
-  const existingColumns = task.metadata.columns;
+  const existingColumns = metadata.columns;
   const newColumnValues = {};
 
   newDetails.split('\n').forEach(line => {
@@ -400,7 +840,10 @@ async function saveEdit(instanceId) {
       newColumnValues[key] = value;
 
       if (existingColumns.includes(key)) {
-        updates[key] = value;
+        // Only changed lines are sent, so saving never rewrites untouched cells with their displayed text.
+        if (value !== displayedText(metadata.raw_values[key])) {
+          updates[key] = value;
+        }
       } else {
         newColumns[key] = value;
       }
@@ -409,7 +852,7 @@ async function saveEdit(instanceId) {
 
   existingColumns.forEach(col => {
     if (col !== existingColumns[0]) {
-      const oldValue = task.metadata.raw_values[col];
+      const oldValue = metadata.raw_values[col];
       const hasNewValue = newColumnValues.hasOwnProperty(col);
       if (oldValue && !hasNewValue) {
         updates[col] = '';
@@ -417,6 +860,33 @@ async function saveEdit(instanceId) {
     }
   });
 
+  return { updates, newColumns };
+}
+
+function displayedText(value) {
+  return value === null || value === undefined ? '' : displayValue(value).trim();
+}
+
+function hasTaskChanges({ updates, newColumns }) {
+  return Object.keys(updates).length > 0 || Object.keys(newColumns).length > 0;
+}
+
+async function saveEdit(instanceId) {
+  const textarea = document.getElementById(`textarea-${instanceId}`);
+  const saveBtn = document.getElementById(`save-btn-${instanceId}`);
+  const task = taskModel.get(textarea.dataset.taskKey);
+
+  if (!task || !task.metadata) {
+    showNotification('Error: Cannot save - missing metadata', 'error');
+    return;
+  }
+
+  const { updates, newColumns } = buildTaskChanges(textarea.value, task.metadata);
+  if (!hasTaskChanges({ updates, newColumns })) {
+    cancelEdit(instanceId);
+    return;
+  }
+
   saveBtn.disabled = true;
   const originalBtnText = saveBtn.innerHTML;
   saveBtn.innerHTML = '<span class="saving-spinner">&#x21bb;</span> Saving...';
@@ -439,6 +909,7 @@ async function saveEdit(instanceId) {
 
     if (response.ok) {
       showNotification('Changes saved successfully!', 'success');
+      delete originalDetails[instanceId];
       cancelEdit(instanceId);
     } else {
       throw new Error(result.detail || 'Failed to save');
@@ -480,36 +951,26 @@ function isCompletedStatus(statusValue) {
 }
 
 function isProjectCompleted(sheetName) {
-  const tasks = allSheetsData[sheetName] || {};
-  let hasAnyTask = false;
+  const sheetSummary = currentSummary()?.sheets?.[sheetName];
+  if (sheetSummary) return sheetSummary.is_completed;
 
-  for (const taskName in tasks) {
-    const instances = tasks[taskName] || [];
-    for (const instance of instances) {
-      hasAnyTask = true;
-      const details = typeof instance === 'string' ? instance : instance.details;
-      const { status } = parseTaskDetails(details || '');
-      if (!isCompletedStatus(status)) {
-        return false;
-      }
-    }
-  }
-
-  return hasAnyTask;
+  const tasks = getSheetTasks(sheetName);
+  return tasks.length > 0 && tasks.every(task => isCompletedStatus(task.status));
 }
 
-function createProjectSheetButton(sheetName) {
-  const button = document.createElement('button');
-  button.onclick = () => switchSheet(sheetName);
-  button.className = 'sheet-btn w-full text-left px-4 py-2.5 rounded-lg text-sm font-medium transition-all duration-200 truncate';
-  button.dataset.sheet = sheetName;
-  button.textContent = sheetName;
-  button.title = sheetName;
-
-  if (sheetName === currentSheet) {
-    button.classList.add('sheet-btn-active');
+function getProjectSheetButton(sheetName) {
+  let button = projectButtons.get(sheetName);
+  if (!button) {
+    button = document.createElement('button');
+    button.onclick = () => switchSheet(sheetName);
+    button.className = 'sheet-btn w-full text-left px-4 py-2.5 rounded-lg text-sm font-medium transition-all duration-200 truncate';
+    button.dataset.sheet = sheetName;
+    button.textContent = sheetName;
+    button.title = sheetName;
+    projectButtons.set(sheetName, button);
   }
 
+  button.classList.toggle('sheet-btn-active', sheetName === currentSheet);
   return button;
 }
 
@@ -531,11 +992,13 @@ function renderProjectPanels(sheetNames = availableSheetNames) {
     }
   });
 
-  incompleteContainer.innerHTML = '';
-  completedContainer.innerHTML = '';
-
-  incompleteSheets.forEach(sheetName => incompleteContainer.appendChild(createProjectSheetButton(sheetName)));
-  completedSheets.forEach(sheetName => completedContainer.appendChild(createProjectSheetButton(sheetName)));
+  // Existing buttons are reused and only moved when their panel or position changes.
+  const liveSheets = new Set(sheetNames);
+  for (const sheetName of projectButtons.keys()) {
+    if (!liveSheets.has(sheetName)) projectButtons.delete(sheetName);
+  }
+  patchChildren(incompleteContainer, incompleteSheets.map(getProjectSheetButton));
+  patchChildren(completedContainer, completedSheets.map(getProjectSheetButton));
 
   if (incompleteCount) incompleteCount.textContent = String(incompleteSheets.length);
   if (completedCount) completedCount.textContent = String(completedSheets.length);
@@ -613,6 +1076,9 @@ function initProjectPanelResize() {
 function switchSheet(sheetName) {
   currentSheet = sheetName;
   buttonData = allSheetsData[sheetName];
+  if (!buttonData && evictedSheets[sheetName]) {
+    loadEvictedSheet(sheetName);
+  }
 
   document.getElementById('pageTitle').textContent = sheetName;
 
@@ -621,28 +1087,52 @@ function switchSheet(sheetName) {
   document.getElementById('priorityFilter').value = 'All';
   document.getElementById('hideCompleted').checked = true;
 
+  selectedTask = null;
+  scrollContainer.scrollLeft = 0;
   createButtons(sheetName, true);
   updateActiveFilterBadge();
+  showDetailsPlaceholder();
 
-  document.getElementById('textDisplay').innerHTML = `
-    <div class="flex flex-col items-center justify-center h-32 text-gray-600">
-      <svg class="w-10 h-10 mb-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2"></path>
-      </svg>
-      <p class="text-sm">Click a task to view details</p>
-    </div>`;
-
-  document.querySelectorAll('.sheet-btn').forEach(btn => {
-    btn.classList.remove('sheet-btn-active');
-    if (btn.dataset.sheet === sheetName) {
-      btn.classList.add('sheet-btn-active');
-    }
+  projectButtons.forEach((btn, name) => {
+    btn.classList.toggle('sheet-btn-active', name === sheetName);
   });
 
   updateExcelButton();
   updateAddTaskButton();
 }
 
+// Merge an evicted sheet into allSheetsData; concurrent calls share one request.
+function fetchSheet(sheetName) {
+  if (!sheetLoads.has(sheetName)) {
+    const load = fetch(`/api/sheets/${encodeURIComponent(sheetName)}`)
+      .then(response => (response.ok ? response.json() : null))
+      .then(data => {
+        if (!data || allSheetsData[sheetName]) return;
+        allSheetsData = { ...allSheetsData, [sheetName]: data.tasks };
+        dataSchema = { ...dataSchema, [sheetName]: data.schema || {} };
+        const { [sheetName]: _loaded, ...stillEvicted } = evictedSheets;
+        evictedSheets = stillEvicted;
+      })
+      .catch(err => console.error(`Failed to load sheet '${sheetName}':`, err))
+      .finally(() => sheetLoads.delete(sheetName));
+    sheetLoads.set(sheetName, load);
+  }
+  return sheetLoads.get(sheetName);
+}
+
+async function loadEvictedSheet(sheetName) {
+  await fetchSheet(sheetName);
+  if (!allSheetsData[sheetName]) return;
+
+  buildTaskModel(allSheetsData);
+  if (currentSheet === sheetName) {
+    buttonData = allSheetsData[sheetName];
+    createButtons(sheetName, true);
+    updateExcelButton();
+    updateAddTaskButton();
+  }
+}
+
 // ===== HORIZONTAL SCROLL =====
 function updateScrollIndicators() {
   const container = scrollContainer;
@@ -663,6 +1153,13 @@ function updateScrollIndicators() {
   }
 }
 
+// ===== STALE SNAPSHOT NOTICE =====
+function updateStaleNotice() {
+  const notice = document.getElementById('staleNotice');
+  if (!notice) return;
+  notice.classList.toggle('hidden', !dataIsStale);
+}
+
 // ===== SSE (Real-time Updates) =====
 let eventSource = null;
 let reconnectAttempts = 0;
@@ -675,15 +1172,26 @@ function connectSSE() {
 
   eventSource.onopen = function() {
     reconnectAttempts = 0;
+    // The startup reload may have finished before this connection was registered.
+    if (dataIsStale || availableSheetNames.length === 0) {
+      fetchSummary();
+      fetchLatestData(false);
+    }
   };
 
   eventSource.onmessage = function(event) {
     const newVersion = parseInt(event.data);
     if (newVersion > currentDataVersion) {
+      fetchSummary();
       fetchLatestData();
     }
   };
 
+  // Pushed when open tasks cross into the due-soon or overdue window, without any data change.
+  eventSource.addEventListener('deadline', function(event) {
+    applyDeadlineEvent(JSON.parse(event.data));
+  });
+
   eventSource.onerror = function() {
     eventSource.close();
     if (reconnectAttempts < maxReconnectAttempts) {
@@ -693,19 +1201,70 @@ function connectSSE() {
   };
 }
 
+function applyDeadlineEvent(payload) {
+  if (projectSummary && payload.version === summaryVersion) {
+    const sheets = { ...projectSummary.sheets };
+    Object.entries(payload.sheets).forEach(([sheetName, counts]) => {
+      if (sheets[sheetName]) sheets[sheetName] = { ...sheets[sheetName], ...counts };
+    });
+    projectSummary = { ...projectSummary, totals: { ...projectSummary.totals, ...payload.totals }, sheets };
+    renderProjectPanels(availableSheetNames);
+  } else {
+    fetchSummary();
+  }
+
+  updateDueSoonBadge(payload.totals.overdue + payload.totals.due_soon);
+  if (!document.getElementById('dueSoonModal').classList.contains('hidden')) {
+    filterDueSoonTasks();
+  }
+}
+
+// Panels and the due-soon badge only need the rollups, which arrive before the full data.
+function currentSummary() {
+  // A summary older than the task data would undo the newer data; fall back to scanning then.
+  return summaryVersion >= currentDataVersion ? projectSummary : null;
+}
+
+async function fetchSummary() {
+  try {
+    const response = await fetch('/api/summary');
+    const summary = await response.json();
+    if (summary.version < summaryVersion) return;
+
+    projectSummary = summary;
+    summaryVersion = summary.version;
+    renderProjectPanels(availableSheetNames);
+    updateDueSoonBadgeOnLoad();
+  } catch (err) {
+    console.error('Failed to fetch summary:', err);
+  }
+}
+
 async function fetchLatestData(showToast = true) {
   try {
-    const response = await fetch('/api/data');
-    const data = await response.json();
+    const response = await fetch('/api/data?format=columnar');
+    const data = decodeColumnar(await response.json());
 
     if (data.version > currentDataVersion) {
       allSheetsData = data.all_sheets_data;
+      dataSchema = data.schema || {};
       currentDataVersion = data.version;
+      dataIsStale = Boolean(data.stale);
+      updateStaleNotice();
       availableSheetNames = data.sheet_names;
+      evictedSheets = data.evicted_sheets || {};
+
+      const previousSheet = currentSheet;
       ensureValidCurrentSheet();
+      if (!allSheetsData[currentSheet] && evictedSheets[currentSheet]) {
+        // Keep the open sheet on screen even if the server evicted it.
+        await fetchSheet(currentSheet);
+      }
+      buildTaskModel(allSheetsData);
       renderProjectPanels(availableSheetNames);
 
-      if (allSheetsData[currentSheet]) {
+      // Keyed renders below only touch nodes whose task data changed.
+      if (allSheetsData[currentSheet] && currentSheet === previousSheet) {
         buttonData = allSheetsData[currentSheet];
         createButtons(currentSheet, true);
 
@@ -713,18 +1272,14 @@ async function fetchLatestData(showToast = true) {
           showTaskDetails(selectedTask);
         } else if (selectedTask) {
           selectedTask = null;
-          document.getElementById('textDisplay').innerHTML = `
-            <div class="flex flex-col items-center justify-center h-32 text-gray-600">
-              <svg class="w-10 h-10 mb-3" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2"></path>
-              </svg>
-              <p class="text-sm">Click a task to view details</p>
-            </div>`;
-        }
-      } else {
-        if (availableSheetNames.length > 0) {
-          switchSheet(availableSheetNames[0]);
+          showDetailsPlaceholder();
         }
+      } else if (availableSheetNames.length > 0) {
+        switchSheet(currentSheet);
+      }
+
+      if (!document.getElementById('dueSoonModal').classList.contains('hidden')) {
+        filterDueSoonTasks();
       }
 
       if (showToast) {
@@ -771,30 +1326,7 @@ document.addEventListener('keydown', (e) => {
 });
 
 function getAllTasksAcrossProjects() {
-  const allProjectTasks = [];
-
-  Object.keys(allSheetsData).forEach(sheetName => {
-    const taskNames = Object.keys(allSheetsData[sheetName] || {});
-
-    taskNames.forEach(taskName => {
-      const instances = allSheetsData[sheetName][taskName];
-
-      instances.forEach((instance, index) => {
-        const details = typeof instance === 'string' ? instance : instance.details;
-        const metadata = typeof instance === 'object' && instance.metadata ? instance.metadata : null;
-        const { description, status, priority, assignedTo, deadline } = parseTaskDetails(details);
-
-        allProjectTasks.push({
-          name: taskName, project: sheetName, instanceIndex: index,
-          description, status, priority, assignedTo, deadline,
-          deadlineDate: parseDeadlineToDate(deadline),
-          details, metadata
-        });
-      });
-    });
-  });
-
-  return allProjectTasks;
+  return Array.from(taskModel.values());
 }
 
 function parseDeadlineToDate(deadline) {
@@ -934,20 +1466,95 @@ function getGroupIndicator(groupBy, key) {
   }
 }
 
+function renderDueSoonGroupHeader(groupBy, groupKey, count, isFirst) {
+  const row = document.createElement('div');
+  row.className = `vlist-row${isFirst ? '' : ' due-soon-group-gap'}`;
+  row.innerHTML = `
+    <div class="due-soon-group-header">
+      ${getGroupIndicator(groupBy, groupKey)}
+      <h3>${escapeHtml(groupKey)}</h3>
+      <span class="due-soon-group-badge">${count}</span>
+    </div>`;
+  return row;
+}
+
+function renderDueSoonTask(task) {
+  const taskId = domIdForKey(task.key);
+  const daysUntil = getDaysUntilDeadline(task.deadlineDate);
+  const deadlineClass = getDeadlineClass(daysUntil);
+  const deadlineText = getDeadlineText(daysUntil, task.deadline);
+  const statusBadge = getStatusBadge(task.status);
+  const priorityIndicator = getPriorityIndicator(task.priority);
+  const hasMetadata = task.metadata !== null;
+
+  const row = document.createElement('div');
+  row.className = 'vlist-row';
+  row.innerHTML = `
+    <div class="due-soon-task${dueSoonExpandedKeys.has(task.key) ? ' expanded' : ''}" id="task-${taskId}" data-task-key="${escapeHtml(task.key)}">
+      <div class="due-soon-task-header" onclick="toggleDueSoonTask('${taskId}')">
+        <svg class="due-soon-toggle-icon" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+          <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5l7 7-7 7"></path>
+        </svg>
+        <div class="due-soon-task-name">
+          <span title="${escapeHtml(task.name)}">${escapeHtml(task.name)}</span>
+          <div class="due-soon-task-project">${escapeHtml(task.project)}</div>
+        </div>
+        <div class="due-soon-task-meta">
+          ${statusBadge}
+          ${priorityIndicator}
+          ${deadlineText ? `<span class="due-soon-deadline ${deadlineClass}">${escapeHtml(deadlineText)}</span>` : ''}
+        </div>
+      </div>
+      <div class="due-soon-task-details">
+        <div class="due-soon-task-details-content">
+          <div id="view-${taskId}">
+            <pre>${escapeHtml(formatDetailsForDisplay(task.details))}</pre>
+            <div class="mt-3 flex gap-2">
+              ${hasMetadata ? `
+                <button onclick="event.stopPropagation(); startDueSoonEdit('${taskId}')"
+                        class="bg-accent-500/20 hover:bg-accent-500/30 text-accent-400 px-3 py-1.5 rounded-md text-xs font-medium transition">
+                  Edit Task
+                </button>
+              ` : ''}
+              <button onclick="event.stopPropagation(); goToTask('${taskId}')"
+                      class="bg-white/5 hover:bg-white/10 text-gray-400 px-3 py-1.5 rounded-md text-xs font-medium transition">
+                Go to Project
+              </button>
+            </div>
+          </div>
+          <div id="edit-${taskId}" class="hidden">
+            <div class="due-soon-edit-area">
+              <textarea id="textarea-${taskId}" class="due-soon-edit-textarea"
+                        data-task-key="${escapeHtml(task.key)}">${escapeHtml(task.details)}</textarea>
+              <div class="due-soon-edit-buttons">
+                <button onclick="saveDueSoonEdit('${taskId}')"
+                        id="save-btn-${taskId}"
+                        class="bg-emerald-600 hover:bg-emerald-700 text-white px-4 py-1.5 rounded-lg text-sm font-medium transition">
+                  Save Changes
+                </button>
+                <button onclick="cancelDueSoonEdit('${taskId}')"
+                        class="bg-white/5 hover:bg-white/10 text-gray-300 px-4 py-1.5 rounded-lg text-sm font-medium transition">
+                  Cancel
+                </button>
+              </div>
+              <p class="text-xs text-gray-600 mt-2">Format: <code class="bg-white/5 px-1 rounded text-gray-400">ColumnName: value</code></p>
+            </div>
+          </div>
+        </div>
+      </div>
+    </div>`;
+  return row;
+}
+
 function renderDueSoonTasks(tasks, groupBy) {
-  const container = document.getElementById('dueSoonTaskList');
+  const empty = document.getElementById('dueSoonEmpty');
 
   if (tasks.length === 0) {
-    container.innerHTML = `
-      <div class="due-soon-empty">
-        <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
-          <path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-        </svg>
-        <h3>No tasks due soon</h3>
-        <p>All caught up! No urgent tasks require your attention.</p>
-      </div>`;
+    empty.classList.remove('hidden');
+    dueSoonList.setItems([]);
     return;
   }
+  empty.classList.add('hidden');
 
   const groups = groupTasks(tasks, groupBy);
   const groupOrder = getGroupOrder(groupBy);
@@ -962,127 +1569,102 @@ function renderDueSoonTasks(tasks, groupBy) {
     sortedKeys = Object.keys(groups).sort();
   }
 
-  let html = '';
-
-  sortedKeys.forEach(groupKey => {
+  // Flatten groups into header + task rows so the list can be windowed.
+  const items = [];
+  sortedKeys.forEach((groupKey, groupIndex) => {
     const groupTaskList = groups[groupKey];
-    const indicator = getGroupIndicator(groupBy, groupKey);
-
-    html += `
-      <div class="due-soon-group">
-        <div class="due-soon-group-header">
-          ${indicator}
-          <h3>${groupKey}</h3>
-          <span class="due-soon-group-badge">${groupTaskList.length}</span>
-        </div>
-        <div class="due-soon-group-tasks">
-    `;
+    const isFirst = groupIndex === 0;
 
-    groupTaskList.forEach((task) => {
-      const taskId = `duesoon-${task.project}-${task.name}-${task.instanceIndex}`.replace(/[^a-zA-Z0-9-]/g, '_');
-      const daysUntil = getDaysUntilDeadline(task.deadlineDate);
-      const deadlineClass = getDeadlineClass(daysUntil);
-      const deadlineText = getDeadlineText(daysUntil, task.deadline);
-      const statusBadge = getStatusBadge(task.status);
-      const priorityIndicator = getPriorityIndicator(task.priority);
-      const hasMetadata = task.metadata !== null;
-
-      html += `
-        <div class="due-soon-task" id="task-${taskId}">
-          <div class="due-soon-task-header" onclick="toggleDueSoonTask('${taskId}')">
-            <svg class="due-soon-toggle-icon" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-              <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5l7 7-7 7"></path>
-            </svg>
-            <div class="due-soon-task-name">
-              <span title="${task.name}">${task.name}</span>
-              <div class="due-soon-task-project">${task.project}</div>
-            </div>
-            <div class="due-soon-task-meta">
-              ${statusBadge}
-              ${priorityIndicator}
-              ${deadlineText ? `<span class="due-soon-deadline ${deadlineClass}">${deadlineText}</span>` : ''}
-            </div>
-          </div>
-          <div class="due-soon-task-details">
-            <div class="due-soon-task-details-content">
-              <div id="view-${taskId}">
-                <pre>${task.details.replace(/Deadline:\s*(\d{4}-\d{2}-\d{2})\s*\d{2}:\d{2}:\d{2}/g, (m, d) => { const p = d.split('-'); return 'Deadline: ' + p[2] + '/' + p[1] + '/' + p[0].slice(-2); })}</pre>
-                <div class="mt-3 flex gap-2">
-                  ${hasMetadata ? `
-                    <button onclick="event.stopPropagation(); startDueSoonEdit('${taskId}', '${task.project}', '${task.name}', ${task.instanceIndex})"
-                            class="bg-accent-500/20 hover:bg-accent-500/30 text-accent-400 px-3 py-1.5 rounded-md text-xs font-medium transition">
-                      Edit Task
-                    </button>
-                  ` : ''}
-                  <button onclick="event.stopPropagation(); goToTask('${task.project}', '${task.name}')"
-                          class="bg-white/5 hover:bg-white/10 text-gray-400 px-3 py-1.5 rounded-md text-xs font-medium transition">
-                    Go to Project
-                  </button>
-                </div>
-              </div>
-              <div id="edit-${taskId}" class="hidden">
-                <div class="due-soon-edit-area">
-                  <textarea id="textarea-${taskId}" class="due-soon-edit-textarea"
-                            data-project="${task.project}"
-                            data-task-name="${task.name}"
-                            data-instance-index="${task.instanceIndex}">${task.details}</textarea>
-                  <div class="due-soon-edit-buttons">
-                    <button onclick="saveDueSoonEdit('${taskId}')"
-                            id="save-btn-${taskId}"
-                            class="bg-emerald-600 hover:bg-emerald-700 text-white px-4 py-1.5 rounded-lg text-sm font-medium transition">
-                      Save Changes
-                    </button>
-                    <button onclick="cancelDueSoonEdit('${taskId}')"
-                            class="bg-white/5 hover:bg-white/10 text-gray-300 px-4 py-1.5 rounded-lg text-sm font-medium transition">
-                      Cancel
-                    </button>
-                  </div>
-                  <p class="text-xs text-gray-600 mt-2">Format: <code class="bg-white/5 px-1 rounded text-gray-400">ColumnName: value</code></p>
-                </div>
-              </div>
-            </div>
-          </div>
-        </div>
-      `;
+    items.push({
+      key: `group::${groupBy}::${groupKey}`,
+      signature: `${groupTaskList.length}:${isFirst}`,
+      height: 52,
+      render: () => renderDueSoonGroupHeader(groupBy, groupKey, groupTaskList.length, isFirst),
     });
 
-    html += `
-        </div>
-      </div>
-    `;
+    groupTaskList.forEach(task => {
+      const daysUntil = getDaysUntilDeadline(task.deadlineDate);
+      items.push({
+        key: task.key,
+        signature: `${task.revision}:${daysUntil}`,
+        height: 56,
+        render: () => renderDueSoonTask(task),
+      });
+    });
   });
 
-  container.innerHTML = html;
+  dueSoonList.setItems(items);
 }
 
 function toggleDueSoonTask(taskId) {
   const task = document.getElementById(`task-${taskId}`);
-  if (task) task.classList.toggle('expanded');
+  if (!task) return;
+  task.classList.toggle('expanded');
+
+  const key = task.dataset.taskKey;
+  if (task.classList.contains('expanded')) {
+    dueSoonExpandedKeys.add(key);
+  } else {
+    dueSoonExpandedKeys.delete(key);
+  }
+  dueSoonList.scheduleRender();
 }
 
-function goToTask(project, taskName) {
+function goToTask(taskId) {
   closeDueSoonPopup();
-  switchSheet(project);
-  setTimeout(() => {
-    showTaskDetails(taskName);
-    const buttons = document.querySelectorAll('.task-button');
-    buttons.forEach(btn => {
-      if (btn.textContent === taskName) {
-        btn.scrollIntoView({ behavior: 'smooth', inline: 'center' });
+  openTaskById(document.getElementById(`task-${taskId}`).dataset.taskKey);
+}
+
+// Deep links use #task=<id>; the ID is stable for a row across reloads.
+async function openTaskById(taskId) {
+  let task = taskModel.get(taskId);
+  if (!task) {
+    try {
+      const response = await fetch(`/api/tasks/${encodeURIComponent(taskId)}`);
+      if (!response.ok) {
+        showNotification('Task not found', 'error');
+        return;
       }
-    });
+      const found = await response.json();
+      if (found.version > currentDataVersion) {
+        await fetchLatestData(false);
+      }
+      if (!taskModel.get(taskId) && evictedSheets[found.sheet_name]) {
+        await loadEvictedSheet(found.sheet_name);
+      }
+      task = taskModel.get(taskId);
+    } catch (err) {
+      console.error('Failed to look up task:', err);
+    }
+    if (!task) return;
+  }
+
+  history.replaceState(null, '', `#task=${encodeURIComponent(taskId)}`);
+  if (task.project !== currentSheet) {
+    switchSheet(task.project);
+  }
+  setTimeout(() => {
+    showTaskDetails(task.name);
+    taskButtonList.scrollToKey(task.name);
   }, 100);
 }
 
-function startDueSoonEdit(taskId, project, taskName, instanceIndex) {
+function taskIdFromHash() {
+  const match = window.location.hash.match(/^#task=(.+)$/);
+  return match ? decodeURIComponent(match[1]) : null;
+}
+
+function startDueSoonEdit(taskId) {
   const viewDiv = document.getElementById(`view-${taskId}`);
   const editDiv = document.getElementById(`edit-${taskId}`);
   const textarea = document.getElementById(`textarea-${taskId}`);
 
   dueSoonOriginalDetails[taskId] = textarea.value;
+  dueSoonEditingKeys.add(textarea.dataset.taskKey);
   viewDiv.classList.add('hidden');
   editDiv.classList.remove('hidden');
   textarea.focus();
+  dueSoonList.scheduleRender();
 }
 
 function cancelDueSoonEdit(taskId) {
@@ -1096,59 +1678,32 @@ function cancelDueSoonEdit(taskId) {
 
   editDiv.classList.add('hidden');
   viewDiv.classList.remove('hidden');
+  dueSoonEditingKeys.delete(textarea.dataset.taskKey);
+  dueSoonList.scheduleRender();
 }
 
 async function saveDueSoonEdit(taskId) {
   const textarea = document.getElementById(`textarea-${taskId}`);
   const saveBtn = document.getElementById(`save-btn-${taskId}`);
-  const project = textarea.dataset.project;
-  const taskName = textarea.dataset.taskName;
-  const instanceIndex = parseInt(textarea.dataset.instanceIndex);
+  const task = taskModel.get(textarea.dataset.taskKey);
 
-  const instances = allSheetsData[project]?.[taskName];
-  if (!instances || !instances[instanceIndex]) {
+  if (!task) {
     showNotification('Error: Task not found', 'error');
     return;
   }
 
-  const instance = instances[instanceIndex];
-  const metadata = typeof instance === 'object' && instance.metadata ? instance.metadata : null;
+  const metadata = task.metadata;
 
   if (!metadata) {
     showNotification('Error: Cannot save - missing metadata', 'error');
     return;
   }
 
-  const newDetails = textarea.value;
-  const updates = {};
-  const newColumns = {};
-  const existingColumns = metadata.columns;
-  const newColumnValues = {};
-
-  newDetails.split('\n').forEach(line => {
-    const colonIndex = line.indexOf(':');
-    if (colonIndex > 0) {
-      const key = line.substring(0, colonIndex).trim();
-      const value = line.substring(colonIndex + 1).trim();
-      newColumnValues[key] = value;
-
-      if (existingColumns.includes(key)) {
-        updates[key] = value;
-      } else {
-        newColumns[key] = value;
-      }
-    }
-  });
-
-  existingColumns.forEach(col => {
-    if (col !== existingColumns[0]) {
-      const oldValue = metadata.raw_values[col];
-      const hasNewValue = newColumnValues.hasOwnProperty(col);
-      if (oldValue && !hasNewValue) {
-        updates[col] = '';
-      }
-    }
-  });
+  const { updates, newColumns } = buildTaskChanges(textarea.value, metadata);
+  if (!hasTaskChanges({ updates, newColumns })) {
+    cancelDueSoonEdit(taskId);
+    return;
+  }
 
   saveBtn.disabled = true;
   const originalBtnText = saveBtn.innerHTML;
@@ -1172,6 +1727,7 @@ async function saveDueSoonEdit(taskId) {
 
     if (response.ok) {
       showNotification('Changes saved successfully!', 'success');
+      delete dueSoonOriginalDetails[taskId];
       cancelDueSoonEdit(taskId);
       setTimeout(() => filterDueSoonTasks(), 500);
     } else {
@@ -1186,6 +1742,12 @@ async function saveDueSoonEdit(taskId) {
 }
 
 function updateDueSoonBadgeOnLoad() {
+  const summary = currentSummary();
+  if (summary?.totals) {
+    updateDueSoonBadge(summary.totals.overdue + summary.totals.due_soon);
+    return;
+  }
+
   let tasks = getAllTasksAcrossProjects();
   tasks = tasks.filter(t => t.status !== 'Completed');
   tasks = tasks.filter(t => getDaysUntilDeadline(t.deadlineDate) <= 7);
@@ -1198,6 +1760,7 @@ window.closeDueSoonPopup = closeDueSoonPopup;
 window.filterDueSoonTasks = filterDueSoonTasks;
 window.toggleDueSoonTask = toggleDueSoonTask;
 window.goToTask = goToTask;
+window.openTaskById = openTaskById;
 window.startDueSoonEdit = startDueSoonEdit;
 window.cancelDueSoonEdit = cancelDueSoonEdit;
 window.saveDueSoonEdit = saveDueSoonEdit;
@@ -1219,30 +1782,7 @@ function getExcelFilesForSheet(sheetName) {
 }
 
 function getColumnsForSheetFile(sheetName, filePath) {
-  const tasks = allSheetsData[sheetName];
-  if (!tasks) return [];
-
-  const columns = [];
-  const seen = new Set();
-
-  for (const taskName in tasks) {
-    for (const instance of tasks[taskName]) {
-      if (!instance.metadata || !Array.isArray(instance.metadata.columns)) {
-        continue;
-      }
-      if (filePath && instance.metadata.file_path !== filePath) {
-        continue;
-      }
-      for (const col of instance.metadata.columns) {
-        if (!seen.has(col)) {
-          seen.add(col);
-          columns.push(col);
-        }
-      }
-    }
-  }
-
-  return columns;
+  return sheetFileColumns.get(`${sheetName}\u0000${filePath || ''}`) || [];
 }
 
 function updateAddTaskButton() {
@@ -1522,6 +2062,19 @@ window.submitAddTask = submitAddTask;
 
 // ===== INITIALIZATION =====
 function init() {
+  // Keyed model and virtualized lists
+  buildTaskModel(allSheetsData);
+  taskButtonList = new VirtualList(scrollContainer, document.getElementById('buttonContainer'), {
+    axis: 'x',
+    overscan: 10,
+    estimateSize: item => item.key.length * 7.5 + 54,
+    onRender: updateScrollIndicators,
+  });
+  dueSoonList = new VirtualList(document.getElementById('dueSoonTaskList'), document.getElementById('dueSoonRows'), {
+    estimateSize: item => item.height,
+    isPinned: key => dueSoonEditingKeys.has(key),
+  });
+
   // Scroll buttons
   scrollLeftBtn.addEventListener('click', () => {
     scrollContainer.scrollBy({ left: -300, behavior: 'smooth' });
@@ -1550,6 +2103,7 @@ function init() {
   });
 
   // Initialize view
+  updateStaleNotice();
   ensureValidCurrentSheet();
   renderProjectPanels(availableSheetNames);
   initProjectPanelResize();
@@ -1558,6 +2112,14 @@ function init() {
   // Due soon badge
   updateDueSoonBadgeOnLoad();
 
+  // Deep link to a task
+  const linkedTaskId = taskIdFromHash();
+  if (linkedTaskId) openTaskById(linkedTaskId);
+  window.addEventListener('hashchange', () => {
+    const taskId = taskIdFromHash();
+    if (taskId) openTaskById(taskId);
+  });
+
   // Excel button
   updateExcelButton();
   updateAddTaskButton();
@@ -0,0 +1,13 @@
+// Used by tools/build_css.py (Tailwind v3 standalone CLI) to build the committed static/css/tailwind.css,
+// and by tools/tailwind_subset.py for the theme colors of the hand-built file (see README, "Static Assets").
+module.exports = {
+  content: ['./templates/**/*.html', './static/js/**/*.js'],
+  theme: {
+    extend: {
+      colors: {
+        surface: { 50: '#f8fafc', 100: '#f1f5f9', 700: '#1e293b', 800: '#0f172a', 900: '#020617' },
+        accent: { 300: '#c4b5fd', 400: '#a78bfa', 500: '#8b5cf6', 600: '#7c3aed' },
+      },
+    },
+  },
+};
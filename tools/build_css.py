@@ -0,0 +1,167 @@
+"""Build or check the purged Tailwind stylesheet, static/css/tailwind.css.
+
+The page loads only this committed file, never the Tailwind CDN, so it works
+offline and the server does not run a build at startup. Rebuild it after
+adding Tailwind classes to the templates or scripts, with the Tailwind v3
+standalone CLI (https://github.com/tailwindlabs/tailwindcss/releases):
+
+    python tools/build_css.py --cli /path/to/tailwindcss
+
+Until then, the committed file is hand-built, not CLI output: --subset writes
+it from tools/tailwind_subset.py, which holds Tailwind v3's preflight and a
+hand-written definition of each utility in use.
+
+--check (run in CI, no CLI needed) fails when a Tailwind class used in the
+templates or scripts has no rule in the committed stylesheet, i.e. when the
+build is out of date. For the hand-built file it also fails when the file is
+not exactly what tools/tailwind_subset.py writes.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import tailwind_subset
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(REPO_ROOT, "tailwind.config.js")
+INPUT = os.path.join(REPO_ROOT, "tailwind.input.css")
+OUTPUT = os.path.join(REPO_ROOT, "static", "css", "tailwind.css")
+CUSTOM_CSS = os.path.join(REPO_ROOT, "static", "css", "styles.css")
+CONTENT_DIRS = [("templates", ".html"), (os.path.join("static", "js"), ".js")]
+
+# Stand-alone utilities and utility prefixes. Tokens like these are Tailwind classes;
+# everything else is a custom class (see styles.css) or plain text.
+UTILITIES = {
+    "absolute", "antialiased", "block", "border", "fixed", "flex", "grid", "grow", "hidden", "inline",
+    "inline-block", "inline-flex", "italic", "relative", "rounded", "scroll-auto", "scroll-smooth", "shadow",
+    "shrink", "sticky", "transition", "truncate", "underline", "uppercase", "visible",
+}
+UTILITY_PREFIXES = (
+    "appearance-", "backdrop-", "bg-", "border-", "bottom-", "col-", "cursor-", "duration-", "ease-",
+    "flex-", "font-", "from-", "gap-", "grid-", "h-", "inset-", "items-", "justify-", "leading-", "left-",
+    "m-", "max-", "mb-", "min-", "ml-", "mr-", "mt-", "mx-", "my-", "opacity-", "outline-", "overflow-",
+    "p-", "pb-", "pl-", "placeholder-", "pointer-", "pr-", "pt-", "px-", "py-", "right-", "ring-",
+    "rounded-", "select-", "shadow-", "shrink-", "space-", "text-", "to-", "top-", "tracking-",
+    "transition-", "translate-", "via-", "w-", "whitespace-", "z-",
+)
+
+_CLASS_ATTR = re.compile(r"""class(?:Name)?\s*=\s*["'`]([^"'`]*)["'`]""")
+_CLASS_LIST = re.compile(r"classList\.(?:add|remove|toggle)\(([^)]*)\)")
+_STRING = re.compile(r"""'([^'\n]*)'|"([^"\n]*)"|`([^`]*)`""")
+_INTERPOLATION = re.compile(r"\$\{[^}]*\}|\{\{.*?\}\}|\{%.*?%\}")
+_TOKEN = re.compile(r"^-?(?:[a-z0-9-]+:)*-?[a-z][a-z0-9]*(?:-[a-z0-9.\[\]/%#]+)*(?:/(?:\d+|\[[0-9.]+\]))?$")
+_SELECTOR_CLASS = re.compile(r"\.((?:\\.|[A-Za-z0-9_-])+)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check static/css/tailwind.css")
+    parser.add_argument("--cli", default=os.environ.get("PDO_TAILWIND_CLI") or shutil.which("tailwindcss"),
+                        help="Tailwind v3 standalone CLI (default: $PDO_TAILWIND_CLI or tailwindcss on PATH)")
+    parser.add_argument("--subset", action="store_true",
+                        help="write the hand-built subset from tools/tailwind_subset.py instead of running the CLI")
+    parser.add_argument("--check", action="store_true", help="only check that the stylesheet covers every class in use")
+    args = parser.parse_args()
+
+    if args.check:
+        _check_subset()
+    elif args.subset:
+        with open(OUTPUT, "w", encoding="utf-8", newline="\n") as f:
+            f.write(_subset())
+        print(f"Wrote hand-built {os.path.relpath(OUTPUT, REPO_ROOT)}")
+    else:
+        if not args.cli:
+            sys.exit("No Tailwind CLI found; pass --cli or set PDO_TAILWIND_CLI (or use --subset for the hand-built file)")
+        subprocess.run([args.cli, "-c", CONFIG, "-i", INPUT, "-o", OUTPUT, "--minify"], cwd=REPO_ROOT, check=True)
+        print(f"Built {os.path.relpath(OUTPUT, REPO_ROOT)}")
+
+    missing = sorted(used_utilities() - stylesheet_classes(OUTPUT))
+    if missing:
+        print(f"{os.path.relpath(OUTPUT, REPO_ROOT)} is out of date; no rule for: {', '.join(missing)}")
+        print("Rebuild it with: python tools/build_css.py --cli /path/to/tailwindcss")
+        sys.exit(1)
+    print(f"{os.path.relpath(OUTPUT, REPO_ROOT)} covers every Tailwind class in use")
+
+
+def used_utilities():
+    """Tailwind classes referenced by the templates and scripts."""
+    custom = stylesheet_classes(CUSTOM_CSS)
+    used = set()
+    for text in _content():
+        for chunk in _class_chunks(text):
+            for token in _INTERPOLATION.sub(" ", chunk).split():
+                if _is_utility(token) and token not in custom:
+                    used.add(token)
+    return used
+
+
+def stylesheet_classes(path):
+    """Class names (unescaped) that appear in a stylesheet's selectors."""
+    if not os.path.isfile(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        css = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.S)
+    classes = set()
+    # Only selectors: the text before each "{" back to the previous "}" or ";".
+    for selector in re.findall(r"(?:^|[};])([^{};]+)\{", css):
+        for match in _SELECTOR_CLASS.finditer(selector):
+            classes.add(re.sub(r"\\(.)", r"\1", match.group(1)))
+    return classes
+
+
+# --- Private helpers ---
+
+def _subset():
+    try:
+        return tailwind_subset.generate(sorted(used_utilities()))
+    except tailwind_subset.UnknownUtility as e:
+        sys.exit(str(e))
+
+
+def _check_subset():
+    # A CLI build is checked for coverage only; the hand-built file must also be reproducible.
+    with open(OUTPUT, encoding="utf-8") as f:
+        committed = f.read()
+    if not committed.startswith(tailwind_subset.BANNER):
+        return
+    if committed != _subset():
+        print(f"{os.path.relpath(OUTPUT, REPO_ROOT)} is not what tools/tailwind_subset.py generates")
+        print("Regenerate it with: python tools/build_css.py --subset")
+        sys.exit(1)
+    print(f"{os.path.relpath(OUTPUT, REPO_ROOT)} matches tools/tailwind_subset.py")
+
+
+def _content():
+    for directory, suffix in CONTENT_DIRS:
+        for root, _, files in os.walk(os.path.join(REPO_ROOT, directory)):
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        yield f.read()
+
+
+def _class_chunks(text):
+    # class="..." attributes, className assignments, classList calls, and string literals (class tables in JS).
+    yield from _CLASS_ATTR.findall(text)
+    for args in _CLASS_LIST.findall(text):
+        for match in _STRING.finditer(args):
+            yield next(group for group in match.groups() if group is not None)
+    for match in _STRING.finditer(text):
+        literal = next(group for group in match.groups() if group is not None)
+        tokens = _INTERPOLATION.sub(" ", literal).split()
+        if tokens and all(_TOKEN.match(token) for token in tokens):
+            yield literal
+
+
+def _is_utility(token):
+    if not _TOKEN.match(token):
+        return False
+    utility = token.rsplit(":", 1)[-1].lstrip("-")
+    return utility in UTILITIES or utility.startswith(UTILITY_PREFIXES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Check that evicting a sheet under the memory budget releases its parsed tasks.
+
+Loads synthetic workbooks in-process with a small memory budget, so all but one
+sheet are evicted. It then re-reads evicted sheets on demand, which evicts the
+resident ones, and reloads. After each step, the tasks dict of every sheet that
+was just evicted must no longer be referenced by the app (module caches,
+rollups, the task index, history, ...). Exits non-zero if one is still alive.
+Example:
+
+    python tools/check_eviction.py
+"""
+
+import gc
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from load_test import _make_workbooks  # noqa: E402
+
+MEMORY_BUDGET_MB = "0.3"
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix="pdo-eviction-check-")
+    try:
+        file_paths = _make_workbooks(work_dir, files=1, sheets=4, rows=300)
+        # Read by app.config at import time.
+        os.environ.update({
+            "PDO_FILE_PATHS": os.pathsep.join(file_paths),
+            "PDO_SNAPSHOT_PATH": os.path.join(work_dir, ".pdo_snapshot.json.gz"),
+            "PDO_JOURNAL_PATH": os.path.join(work_dir, "edit_journal.jsonl"),
+            "PDO_MEMORY_BUDGET_MB": MEMORY_BUDGET_MB,
+        })
+        problems = _check()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print("OK: evicted sheets are no longer referenced")
+
+
+def _check():
+    import app.state as state
+    from app.services.columnar import encode_columnar
+    from app.services.data_loader import reload_data
+    from app.services.sheet_cache import get_sheet
+    from app.services.snapshot_store import flush_snapshot
+
+    problems = []
+    reload_data()
+    evicted = list(state.cached_data["evicted_sheets"])
+    if not evicted:
+        return [f"nothing was evicted with a {MEMORY_BUDGET_MB} MB budget"]
+
+    # Each step evicts the sheets that are resident before it.
+    steps = [
+        ("re-reading an evicted sheet", lambda: get_sheet(evicted[0])),
+        ("re-reading another evicted sheet", lambda: get_sheet(evicted[-1])),
+        ("reloading", reload_data),
+    ]
+    for label, step in steps:
+        data = state.cached_data
+        encode_columnar(data["all_sheets_data"], data["sheet_names"], {})
+        resident = dict(data["all_sheets_data"])
+        step()
+        flush_snapshot()
+        data = None
+
+        gone = [name for name in resident if name in state.cached_data["evicted_sheets"]]
+        kept = {name: resident[name] for name in gone}
+        resident = None
+        if not gone and label != "reloading":
+            problems.append(f"{label} evicted nothing")
+        for name in gone:
+            # The dict itself, and one of its rows (rows can be shared with other versions).
+            instances = next(iter(kept[name].values()))
+            holders = _holders(kept[name], kept) + _holders(instances[0], instances)
+            instances = None
+            if holders:
+                problems.append(f"sheet '{name}' is still referenced after {label}: {', '.join(holders)}")
+    return problems
+
+
+def _holders(tasks, own):
+    """Describe what still references tasks, apart from this script."""
+    gc.collect()
+    holders = []
+    for referrer in gc.get_referrers(tasks):
+        if referrer is own or inspect.isframe(referrer):
+            continue
+        holders.append(_owner(referrer) or type(referrer).__name__)
+    return holders
+
+
+def _owner(obj, depth=3):
+    # Walk up a few referrers to the app module global that keeps obj alive.
+    modules = {id(module.__dict__): name for name, module in sys.modules.items() if name.startswith("app")}
+    frontier = [obj]
+    for _ in range(depth):
+        parents = []
+        for item in frontier:
+            for referrer in gc.get_referrers(item):
+                if id(referrer) in modules:
+                    return next(
+                        f"{modules[id(referrer)]}.{key}" for key, value in referrer.items() if value is item
+                    )
+                if isinstance(referrer, (dict, list, tuple)) and referrer is not frontier and referrer is not parents:
+                    parents.append(referrer)
+        frontier = parents
+    return None
+
+
+if __name__ == "__main__":
+    main()
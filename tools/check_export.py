@@ -0,0 +1,113 @@
+"""Check that /api/export agrees with /api/sheets for an evicted sheet with pending edits.
+
+Starts the app on 127.0.0.1 against synthetic workbooks with a tiny memory budget,
+so every sheet but one is evicted. The workbook is marked as open in Excel, so a
+saved edit stays in the journal. The edited sheet is then evicted again, and its
+export (parsed on the fly) must match the re-read sheet served by /api/sheets,
+edit included. Exits non-zero on a mismatch. Example:
+
+    python tools/check_export.py
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import _Connection, _free_port, _make_workbooks, _start_server, _wait_ready  # noqa: E402
+
+EDITED_VALUE = "Edited by check_export"
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix="pdo-export-check-")
+    server = None
+    try:
+        file_paths = _make_workbooks(work_dir, files=1, sheets=3, rows=50)
+        # Excel's lock marker keeps the compactor from writing the edit into the workbook.
+        open(os.path.join(work_dir, "~$" + os.path.basename(file_paths[0])), "w").close()
+        os.environ["PDO_MEMORY_BUDGET_MB"] = "0.01"
+        port = _free_port()
+        server = _start_server(work_dir, file_paths, port)
+        problems = asyncio.run(_check(port))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print("OK: export of an evicted sheet matches /api/sheets, pending edit included")
+
+
+async def _check(port):
+    await _wait_ready(port)
+    conn = _Connection(port)
+    try:
+        data = await _get_json(conn, "/api/data")
+        sheet, other = data["sheet_names"][:2]
+
+        tasks = (await _get_json(conn, f"/api/sheets/{quote(sheet)}"))["tasks"]
+        task_name, instances = next(iter(tasks.items()))
+        metadata = instances[0]["metadata"]
+        status, body = await conn.request("POST", "/api/save-task", {
+            "file_path": metadata["file_path"],
+            "sheet_name": sheet,
+            "row_index": metadata["row_index"],
+            "task_name": task_name,
+            "updates": {"Description": EDITED_VALUE},
+        })
+        if status != 200:
+            return [f"save-task returned {status}: {body[:200]!r}"]
+
+        # Using another sheet pushes the edited one out again.
+        await _get_json(conn, f"/api/sheets/{quote(other)}")
+        data = await _get_json(conn, "/api/data")
+        if sheet not in data["evicted_sheets"]:
+            return [f"sheet '{sheet}' was not evicted; cannot check the transient export"]
+
+        status, body = await conn.request("GET", f"/api/export?format=ndjson&sheet={quote(sheet)}")
+        if status != 200:
+            return [f"export returned {status}"]
+        exported = {row["task_id"]: row for row in map(json.loads, body.decode("utf-8").splitlines())}
+
+        tasks = (await _get_json(conn, f"/api/sheets/{quote(sheet)}"))["tasks"]
+    finally:
+        conn.close()
+
+    problems = []
+    served = {
+        instance["metadata"]["task_id"]: instance["metadata"]
+        for instances in tasks.values() for instance in instances
+    }
+    if set(exported) != set(served):
+        problems.append(f"exported {len(exported)} task(s), /api/sheets has {len(served)}")
+    for task_id, served_metadata in served.items():
+        row = exported.get(task_id)
+        if row is None:
+            continue
+        for col, value in served_metadata["raw_values"].items():
+            if col != served_metadata["columns"][0] and row.get(col) != value:
+                problems.append(f"task {task_id} column '{col}': export {row.get(col)!r}, /api/sheets {value!r}")
+    if exported.get(metadata["task_id"], {}).get("Description") != EDITED_VALUE:
+        problems.append("the pending edit is missing from the export")
+    return problems
+
+
+async def _get_json(conn, path):
+    status, body = await conn.request("GET", path)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    return json.loads(body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Local load test for Management PDO.
+
+Starts the app on 127.0.0.1 against synthetic workbooks in a temporary
+directory. It then holds N SSE connections open on /events while workers
+request /api/data and post /api/save-task. At the end it reports:
+
+- how long an edit takes to reach every SSE subscriber
+- request latency percentiles and throughput
+- the server's resident memory
+
+Nothing leaves localhost. Example:
+
+    python tools/load_test.py --sse-clients 50 --readers 8 --saves-per-minute 120 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLUMNS = ["Task Name", "Description", "Status", "Priority", "Assigned To", "Deadline"]
+STATUSES = ["Not Started", "In Progress", "Blocked", "Completed"]
+PRIORITIES = ["High", "Medium", "Low"]
+PEOPLE = ["Alex", "Sam", "Jordan", "Taylor", "Casey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end HTTP/SSE load test on localhost")
+    parser.add_argument("--files", type=int, default=2, help="synthetic workbooks")
+    parser.add_argument("--sheets", type=int, default=4, help="sheets (projects) per workbook")
+    parser.add_argument("--rows", type=int, default=200, help="tasks per sheet")
+    parser.add_argument("--sse-clients", type=int, default=25, help="concurrent /events subscribers")
+    parser.add_argument("--readers", type=int, default=4, help="workers fetching /api/data in a loop")
+    parser.add_argument("--saves-per-minute", type=float, default=60, help="target /api/save-task rate")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--port", type=int, default=0, help="server port (default: a free port)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary directory")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pdo-load-")
+    port = args.port or _free_port()
+    server = None
+    try:
+        file_paths = _make_workbooks(work_dir, args.files, args.sheets, args.rows)
+        server = _start_server(work_dir, file_paths, port)
+        report = asyncio.run(_run(args, port, server.pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if args.keep:
+            print(f"Kept {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+# --- Setup ---
+
+def _make_workbooks(work_dir, files, sheets, rows):
+    from openpyxl import Workbook
+
+    rng = random.Random(42)
+    today = date.today()
+    paths = []
+    for file_no in range(files):
+        workbook = Workbook(write_only=True)
+        for sheet_no in range(sheets):
+            ws = workbook.create_sheet(f"Project {sheet_no + 1:02d}")
+            ws.append(COLUMNS)
+            for row_no in range(rows):
+                ws.append([
+                    f"Task {file_no + 1}-{sheet_no + 1}-{row_no + 1}",
+                    f"Synthetic task {row_no + 1} for load testing",
+                    rng.choice(STATUSES),
+                    rng.choice(PRIORITIES),
+                    rng.choice(PEOPLE),
+                    today + timedelta(days=rng.randint(-30, 60)),
+                ])
+        path = os.path.join(work_dir, f"Engineer{file_no + 1}.xlsx")
+        workbook.save(path)
+        paths.append(path)
+    return paths
+
+
+def _start_server(work_dir, file_paths, port):
+    env = dict(os.environ)
+    env.update({
+        "PDO_FILE_PATHS": os.pathsep.join(file_paths),
+        "PDO_SNAPSHOT_PATH": os.path.join(work_dir, ".pdo_snapshot.json.gz"),
+        "PDO_JOURNAL_PATH": os.path.join(work_dir, "edit_journal.jsonl"),
+    })
+    log = open(os.path.join(work_dir, "server.log"), "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_ROOT,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# --- Minimal HTTP/1.1 client (keep-alive, no dependencies) ---
+
+class _Connection:
+    def __init__(self, port):
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(payload)}\r\n"
+        if body is not None:
+            head += "Content-Type: application/json\r\n"
+        self.writer.write(head.encode() + b"\r\n" + payload)
+        await self.writer.drain()
+
+        status, headers = await _read_head(self.reader)
+        if headers.get("transfer-encoding") == "chunked":
+            data = await _read_chunked(self.reader)
+        else:
+            data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _read_head(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return status, headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        if size == 0:
+            await reader.readline()
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+# --- Load ---
+
+class _Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.bytes = {}
+        self.save_versions = {}
+        self.sse_seen = []
+        self.rss_samples = []
+
+    def record(self, name, seconds, status, size=0):
+        self.latencies.setdefault(name, []).append(seconds)
+        self.bytes[name] = self.bytes.get(name, 0) + size
+        if status >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def _run(args, port, server_pid):
+    await _wait_ready(port)
+
+    conn = _Connection(port)
+    _, body = await conn.request("GET", "/api/data")
+    conn.close()
+    targets = _save_targets(json.loads(body))
+
+    stats = _Stats()
+    stop = asyncio.Event()
+    sse_ready = []
+
+    sse_tasks = [asyncio.create_task(_sse_client(port, stats, stop, sse_ready)) for _ in range(args.sse_clients)]
+    while len(sse_ready) < args.sse_clients:
+        await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(_reader(port, stats, stop)) for _ in range(args.readers)]
+    if args.saves_per_minute > 0 and targets:
+        workers.append(asyncio.create_task(_saver(port, stats, stop, targets, args.saves_per_minute)))
+    workers.append(asyncio.create_task(_sample_rss(server_pid, stats, stop)))
+
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*workers, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    # Give the last notifications time to arrive before closing the subscribers.
+    await asyncio.sleep(1.5)
+    for task in sse_tasks:
+        task.cancel()
+    await asyncio.gather(*sse_tasks, return_exceptions=True)
+
+    return _build_report(args, stats, elapsed)
+
+
+async def _wait_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = _Connection(port)
+        try:
+            status, body = await conn.request("GET", "/health")
+            health = json.loads(body)
+            if status == 200 and health["data_version"] > 0 and not health["stale"]:
+                return
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            conn.close()
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not load data within {timeout}s")
+
+
+def _save_targets(data):
+    targets = []
+    for sheet_name, tasks in data["all_sheets_data"].items():
+        for task_name, instances in tasks.items():
+            for instance in instances:
+                metadata = instance.get("metadata")
+                if metadata:
+                    targets.append({
+                        "file_path": metadata["file_path"],
+                        "sheet_name": sheet_name,
+                        "row_index": metadata["row_index"],
+                        "task_name": task_name,
+                    })
+    return targets
+
+
+async def _sse_client(port, stats, stop, ready):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    seen = {}
+    stats.sse_seen.append(seen)
+    try:
+        writer.write(b"GET /events HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n")
+        await writer.drain()
+        await _read_head(reader)
+        ready.append(True)
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            text = line.decode("utf-8", "replace").strip()
+            # Chunk-size lines and keepalive comments are skipped; only "data: <version>" matters.
+            if text.startswith("data:"):
+                try:
+                    version = int(text[5:].strip())
+                except ValueError:
+                    continue
+                seen.setdefault(version, time.perf_counter())
+    finally:
+        writer.close()
+
+
+async def _reader(port, stats, stop):
+    conn = _Connection(port)
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            status, body = await conn.request("GET", "/api/data")
+            stats.record("GET /api/data", time.perf_counter() - start, status, len(body))
+    finally:
+        conn.close()
+
+
+async def _saver(port, stats, stop, targets, per_minute):
+    conn = _Connection(port)
+    interval = 60.0 / per_minute
+    rng = random.Random(7)
+    next_at = time.perf_counter()
+    counter = 0
+    try:
+        while not stop.is_set():
+            target = rng.choice(targets)
+            counter += 1
+            start = time.perf_counter()
+            status, body = await conn.request("POST", "/api/save-task", {
+                **target,
+                "updates": {"Description": f"Load test edit {counter}"},
+            })
+            stats.record("POST /api/save-task", time.perf_counter() - start, status, len(body))
+            if status == 200:
+                stats.save_versions[json.loads(body)["version"]] = start
+
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    finally:
+        conn.close()
+
+
+async def _sample_rss(pid, stats, stop):
+    while not stop.is_set():
+        rss = _read_rss_kb(pid)
+        if rss is not None:
+            stats.rss_samples.append(rss)
+        await asyncio.sleep(0.5)
+
+
+def _read_rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+# --- Report ---
+
+def _build_report(args, stats, elapsed):
+    requests = {}
+    for name, values in stats.latencies.items():
+        requests[name] = {
+            "count": len(values),
+            "errors": stats.errors.get(name, 0),
+            "throughput_per_s": round(len(values) / elapsed, 2),
+            "mb_per_s": round(stats.bytes[name] / elapsed / 1e6, 2),
+            **_percentiles(values),
+        }
+
+    # Fan-out: from sending a save to each subscriber seeing a version that includes it.
+    fanout = []
+    missed = 0
+    for version, sent_at in stats.save_versions.items():
+        for seen in stats.sse_seen:
+            arrivals = [at for seen_version, at in seen.items() if seen_version >= version]
+            if arrivals:
+                fanout.append(min(arrivals) - sent_at)
+            else:
+                missed += 1
+
+    return {
+        "config": {
+            "files": args.files, "sheets": args.sheets, "rows": args.rows,
+            "sse_clients": args.sse_clients, "readers": args.readers,
+            "saves_per_minute": args.saves_per_minute, "duration_s": round(elapsed, 2),
+        },
+        "requests": requests,
+        "sse_fanout": {"deliveries": len(fanout), "missed": missed, **_percentiles(fanout)},
+        "server_rss_mb": {
+            "peak": round(max(stats.rss_samples) / 1024, 1) if stats.rss_samples else None,
+            "last": round(stats.rss_samples[-1] / 1024, 1) if stats.rss_samples else None,
+        },
+    }
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+    return {"p50_ms": pick(0.5), "p90_ms": pick(0.9), "p99_ms": pick(0.99), "max_ms": round(ordered[-1] * 1000, 1)}
+
+
+def _print_report(report):
+    cfg = report["config"]
+    print(f"Workbooks: {cfg['files']} x {cfg['sheets']} sheets x {cfg['rows']} rows")
+    print(f"Load: {cfg['sse_clients']} SSE clients, {cfg['readers']} readers, "
+          f"{cfg['saves_per_minute']:g} saves/min for {cfg['duration_s']}s")
+    print()
+    print(f"{'request':<22}{'count':>7}{'err':>5}{'req/s':>8}{'MB/s':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for name, row in report["requests"].items():
+        print(f"{name:<22}{row['count']:>7}{row['errors']:>5}{row['throughput_per_s']:>8}{row['mb_per_s']:>7}"
+              f"{_ms(row['p50_ms'])}{_ms(row['p90_ms'])}{_ms(row['p99_ms'])}{_ms(row['max_ms'])}")
+
+    fanout = report["sse_fanout"]
+    print()
+    print(f"SSE fan-out (save sent -> subscriber notified): {fanout['deliveries']} deliveries, {fanout['missed']} missed")
+    print(f"  p50{_ms(fanout['p50_ms'])}  p90{_ms(fanout['p90_ms'])}  p99{_ms(fanout['p99_ms'])}  max{_ms(fanout['max_ms'])}")
+
+    rss = report["server_rss_mb"]
+    if rss["peak"] is not None:
+        print(f"Server RSS: peak {rss['peak']} MB, last {rss['last']} MB")
+    else:
+        print("Server RSS: not available on this platform")
+
+
+def _ms(value):
+    return f"{'-':>9}" if value is None else f"{value:>7.1f}ms"
+
+
+if __name__ == "__main__":
+    main()
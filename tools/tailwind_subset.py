@@ -0,0 +1,345 @@
+"""Hand-built subset of Tailwind CSS v3, used by tools/build_css.py --subset.
+
+This is not the Tailwind compiler. It writes Tailwind v3's preflight and, for
+each utility class the templates and scripts use, the declarations Tailwind v3
+emits for it, transcribed by hand from Tailwind's defaults. The theme colors
+come from tailwind.config.js. A class it has no definition for is an error:
+add the definition here, or build with the real CLI (tools/build_css.py --cli),
+whose output replaces this stylesheet entirely.
+"""
+
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(REPO_ROOT, "tailwind.config.js")
+
+# First line of every stylesheet this module writes; tools/build_css.py --check looks for it.
+BANNER = "/*! Hand-built subset of tailwindcss v3 (tools/tailwind_subset.py), not CLI output | MIT License | https://tailwindcss.com */"
+
+# Tailwind v3 default palette, for the shades in use.
+PALETTE = {
+    "white": "#ffffff",
+    "gray-200": "#e5e7eb", "gray-300": "#d1d5db", "gray-400": "#9ca3af", "gray-500": "#6b7280", "gray-600": "#4b5563",
+    "amber-400": "#fbbf24", "amber-500": "#f59e0b", "amber-600": "#d97706",
+    "blue-400": "#60a5fa", "blue-500": "#3b82f6", "blue-600": "#2563eb",
+    "cyan-500": "#06b6d4", "cyan-600": "#0891b2", "cyan-700": "#0e7490",
+    "emerald-400": "#34d399", "emerald-500": "#10b981", "emerald-600": "#059669", "emerald-700": "#047857",
+    "indigo-500": "#6366f1", "indigo-600": "#4f46e5",
+    "orange-400": "#fb923c", "orange-500": "#f97316", "orange-600": "#ea580c",
+    "pink-500": "#ec4899", "pink-600": "#db2777",
+    "rose-400": "#fb7185", "rose-500": "#f43f5e", "rose-600": "#e11d48",
+    "teal-500": "#14b8a6", "teal-600": "#0d9488",
+    "violet-500": "#8b5cf6", "violet-600": "#7c3aed",
+}
+
+SPACING = {
+    "0": "0", "0.5": ".125rem", "1": ".25rem", "1.5": ".375rem", "2": ".5rem", "2.5": ".625rem", "3": ".75rem",
+    "3.5": ".875rem", "4": "1rem", "5": "1.25rem", "6": "1.5rem", "7": "1.75rem", "8": "2rem", "10": "2.5rem",
+    "32": "8rem", "72": "18rem", "1/2": "50%", "full": "100%", "auto": "auto",
+}
+FONT_SIZES = {"xs": (".75rem", "1rem"), "sm": (".875rem", "1.25rem"), "lg": ("1.125rem", "1.75rem"), "3xl": ("1.875rem", "2.25rem")}
+RADII = {"": ".25rem", "md": ".375rem", "lg": ".5rem", "xl": ".75rem", "full": "9999px"}
+
+_TRANSFORM = (
+    "transform:translate(var(--tw-translate-x),var(--tw-translate-y)) rotate(var(--tw-rotate)) skewX(var(--tw-skew-x))"
+    " skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))"
+)
+_BACKDROP = (
+    "var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) var(--tw-backdrop-grayscale)"
+    " var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) var(--tw-backdrop-opacity) var(--tw-backdrop-saturate)"
+    " var(--tw-backdrop-sepia)"
+)
+_EASE = "transition-timing-function:cubic-bezier(.4,0,.2,1);transition-duration:.15s"
+_TRANSITION_COLORS = "color,background-color,border-color,text-decoration-color,fill,stroke,opacity,box-shadow,transform,filter"
+
+# Utilities without a value part: class -> (group, declarations)
+FIXED = {
+    "pointer-events-none": ("pointer-events", "pointer-events:none"),
+    "visible": ("visibility", "visibility:visible"),
+    "fixed": ("position", "position:fixed"),
+    "absolute": ("position", "position:absolute"),
+    "relative": ("position", "position:relative"),
+    "inset-0": ("inset", "inset:0"),
+    "mx-auto": ("margin", "margin-left:auto;margin-right:auto"),
+    "ml-auto": ("margin", "margin-left:auto"),
+    "flex": ("display", "display:flex"),
+    "inline-flex": ("display", "display:inline-flex"),
+    "hidden": ("display", "display:none"),
+    "h-screen": ("height", "height:100vh"),
+    "min-h-screen": ("min-height", "min-height:100vh"),
+    "min-h-[200px]": ("min-height", "min-height:200px"),
+    "min-w-0": ("min-width", "min-width:0"),
+    "min-w-max": ("min-width", "min-width:-moz-max-content;min-width:max-content"),
+    "min-w-[200px]": ("min-width", "min-width:200px"),
+    "max-w-6xl": ("max-width", "max-width:72rem"),
+    "flex-1": ("flex", "flex:1 1 0%"),
+    "flex-shrink-0": ("flex-shrink", "flex-shrink:0"),
+    "cursor-pointer": ("cursor", "cursor:pointer"),
+    "select-none": ("user-select", "-webkit-user-select:none;-moz-user-select:none;user-select:none"),
+    "appearance-none": ("appearance", "-webkit-appearance:none;-moz-appearance:none;appearance:none"),
+    "flex-col": ("flex-direction", "flex-direction:column"),
+    "flex-wrap": ("flex-wrap", "flex-wrap:wrap"),
+    "items-center": ("align-items", "align-items:center"),
+    "items-end": ("align-items", "align-items:flex-end"),
+    "justify-between": ("justify-content", "justify-content:space-between"),
+    "justify-center": ("justify-content", "justify-content:center"),
+    "overflow-hidden": ("overflow", "overflow:hidden"),
+    "overflow-x-auto": ("overflow", "overflow-x:auto"),
+    "overflow-y-auto": ("overflow", "overflow-y:auto"),
+    "truncate": ("text-overflow", "overflow:hidden;text-overflow:ellipsis;white-space:nowrap"),
+    "scroll-smooth": ("scroll-behavior", "scroll-behavior:smooth"),
+    "whitespace-pre-line": ("whitespace", "white-space:pre-line"),
+    "border": ("border-width", "border-width:1px"),
+    "border-b": ("border-width", "border-bottom-width:1px"),
+    "border-l": ("border-width", "border-left-width:1px"),
+    "border-r": ("border-width", "border-right-width:1px"),
+    "border-l-2": ("border-width", "border-left-width:2px"),
+    "bg-gradient-to-l": ("background-image", "background-image:linear-gradient(to left,var(--tw-gradient-stops))"),
+    "bg-gradient-to-r": ("background-image", "background-image:linear-gradient(to right,var(--tw-gradient-stops))"),
+    "to-transparent": ("gradient-to", "--tw-gradient-to:transparent var(--tw-gradient-to-position)"),
+    "text-left": ("text-align", "text-align:left"),
+    "font-medium": ("font-weight", "font-weight:500"),
+    "font-semibold": ("font-weight", "font-weight:600"),
+    "font-bold": ("font-weight", "font-weight:700"),
+    "leading-relaxed": ("line-height", "line-height:1.625"),
+    "tracking-tight": ("letter-spacing", "letter-spacing:-.025em"),
+    "antialiased": ("font-smoothing", "-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale"),
+    "shadow-lg": (
+        "box-shadow",
+        "--tw-shadow:0 10px 15px -3px rgba(0,0,0,.1),0 4px 6px -4px rgba(0,0,0,.1);"
+        "--tw-shadow-colored:0 10px 15px -3px var(--tw-shadow-color),0 4px 6px -4px var(--tw-shadow-color);"
+        "box-shadow:var(--tw-ring-offset-shadow,0 0 #0000),var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow)",
+    ),
+    "outline-none": ("outline", "outline:2px solid transparent;outline-offset:2px"),
+    "ring-1": (
+        "ring-width",
+        "--tw-ring-offset-shadow:var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color);"
+        "--tw-ring-shadow:var(--tw-ring-inset) 0 0 0 calc(1px + var(--tw-ring-offset-width)) var(--tw-ring-color);"
+        "box-shadow:var(--tw-ring-offset-shadow),var(--tw-ring-shadow),var(--tw-shadow,0 0 #0000)",
+    ),
+    "backdrop-blur": ("backdrop-filter", f"--tw-backdrop-blur:blur(8px);-webkit-backdrop-filter:{_BACKDROP};backdrop-filter:{_BACKDROP}"),
+    "backdrop-blur-xl": ("backdrop-filter", f"--tw-backdrop-blur:blur(24px);-webkit-backdrop-filter:{_BACKDROP};backdrop-filter:{_BACKDROP}"),
+    "transition": (
+        "transition-property",
+        f"transition-property:{_TRANSITION_COLORS},-webkit-backdrop-filter;transition-property:{_TRANSITION_COLORS},backdrop-filter;"
+        f"transition-property:{_TRANSITION_COLORS},backdrop-filter,-webkit-backdrop-filter;{_EASE}",
+    ),
+    "transition-all": ("transition-property", f"transition-property:all;{_EASE}"),
+    "transition-opacity": ("transition-property", f"transition-property:opacity;{_EASE}"),
+    "transition-transform": ("transition-property", f"transition-property:transform;{_EASE}"),
+}
+
+# Tailwind v3 emits utilities in plugin order; rules of one group keep class-name order.
+ORDER = [
+    "pointer-events", "visibility", "position", "inset", "top", "right", "bottom", "left", "z-index", "margin",
+    "display", "height", "min-height", "width", "min-width", "max-width", "flex", "flex-shrink", "transform", "cursor",
+    "user-select", "appearance", "flex-direction", "flex-wrap", "align-items", "justify-content", "gap", "space",
+    "overflow", "text-overflow", "scroll-behavior", "whitespace", "border-radius", "border-width", "border-color",
+    "background-color", "background-image", "gradient-from", "gradient-to", "padding", "text-align", "font-size",
+    "font-weight", "line-height", "letter-spacing", "text-color", "placeholder-color", "font-smoothing", "opacity",
+    "box-shadow", "outline", "ring-width", "ring-color", "backdrop-filter", "transition-property", "transition-duration",
+]
+VARIANTS = {"": "", "hover": ":hover", "focus": ":focus"}
+
+_SIDES = {"": [""], "x": ["-left", "-right"], "y": ["-top", "-bottom"], "t": ["-top"], "r": ["-right"], "b": ["-bottom"], "l": ["-left"]}
+_COLOR_PROPERTIES = {
+    # prefix -> (group, property, opacity variable, selector suffix)
+    "bg": ("background-color", "background-color", "--tw-bg-opacity", ""),
+    "text": ("text-color", "color", "--tw-text-opacity", ""),
+    "border": ("border-color", "border-color", "--tw-border-opacity", ""),
+    "border-l": ("border-color", "border-left-color", "--tw-border-opacity", ""),
+    "ring": ("ring-color", "--tw-ring-color", "--tw-ring-opacity", ""),
+    "placeholder": ("placeholder-color", "color", "--tw-placeholder-opacity", "::placeholder"),
+}
+
+_VARS = (
+    "--tw-border-spacing-x:0;--tw-border-spacing-y:0;--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-skew-x:0;"
+    "--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-pan-x: ;--tw-pan-y: ;--tw-pinch-zoom: ;"
+    "--tw-scroll-snap-strictness:proximity;--tw-gradient-from-position: ;--tw-gradient-via-position: ;"
+    "--tw-gradient-to-position: ;--tw-ordinal: ;--tw-slashed-zero: ;--tw-numeric-figure: ;--tw-numeric-spacing: ;"
+    "--tw-numeric-fraction: ;--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;"
+    "--tw-ring-color:rgb(59 130 246/.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000;"
+    "--tw-shadow-colored:0 0 #0000;--tw-blur: ;--tw-brightness: ;--tw-contrast: ;--tw-grayscale: ;--tw-hue-rotate: ;"
+    "--tw-invert: ;--tw-saturate: ;--tw-sepia: ;--tw-drop-shadow: ;--tw-backdrop-blur: ;--tw-backdrop-brightness: ;"
+    "--tw-backdrop-contrast: ;--tw-backdrop-grayscale: ;--tw-backdrop-hue-rotate: ;--tw-backdrop-invert: ;"
+    "--tw-backdrop-opacity: ;--tw-backdrop-saturate: ;--tw-backdrop-sepia: ;--tw-contain-size: ;--tw-contain-layout: ;"
+    "--tw-contain-paint: ;--tw-contain-style: "
+)
+
+PREFLIGHT = (
+    '*,:after,:before{box-sizing:border-box;border:0 solid #e5e7eb}:after,:before{--tw-content:""}'
+    ":host,html{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;-o-tab-size:4;tab-size:4;"
+    "font-family:ui-sans-serif,system-ui,sans-serif,Apple Color Emoji,Segoe UI Emoji,Segoe UI Symbol,Noto Color Emoji;"
+    "font-feature-settings:normal;font-variation-settings:normal;-webkit-tap-highlight-color:transparent}"
+    "body{margin:0;line-height:inherit}hr{height:0;color:inherit;border-top-width:1px}"
+    "abbr:where([title]){-webkit-text-decoration:underline dotted;text-decoration:underline dotted}"
+    "h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}a{color:inherit;text-decoration:inherit}b,strong{font-weight:bolder}"
+    "code,kbd,pre,samp{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,Liberation Mono,Courier New,monospace;"
+    "font-feature-settings:normal;font-variation-settings:normal;font-size:1em}"
+    "small{font-size:80%}sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}sub{bottom:-.25em}sup{top:-.5em}"
+    "table{text-indent:0;border-color:inherit;border-collapse:collapse}"
+    "button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;"
+    "font-size:100%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}"
+    "button,select{text-transform:none}button,input:where([type=button]),input:where([type=reset]),input:where([type=submit])"
+    "{-webkit-appearance:button;background-color:transparent;background-image:none}"
+    ":-moz-focusring{outline:auto}:-moz-ui-invalid{box-shadow:none}progress{vertical-align:baseline}"
+    "::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}"
+    "[type=search]{-webkit-appearance:textfield;outline-offset:-2px}::-webkit-search-decoration{-webkit-appearance:none}"
+    "::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}summary{display:list-item}"
+    "blockquote,dd,dl,figure,h1,h2,h3,h4,h5,h6,hr,p,pre{margin:0}fieldset{margin:0}fieldset,legend{padding:0}"
+    "menu,ol,ul{list-style:none;margin:0;padding:0}dialog{padding:0}textarea{resize:vertical}"
+    "input::-moz-placeholder,textarea::-moz-placeholder{opacity:1;color:#9ca3af}"
+    "input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}"
+    "[role=button],button{cursor:pointer}:disabled{cursor:default}"
+    "audio,canvas,embed,iframe,img,object,svg,video{display:block;vertical-align:middle}img,video{max-width:100%;height:auto}"
+    "[hidden]:where(:not([hidden=until-found])){display:none}"
+)
+
+
+class UnknownUtility(ValueError):
+    pass
+
+
+def generate(classes):
+    """Return the stylesheet (banner, variables, preflight, utilities) for the given Tailwind classes."""
+    colors = {**PALETTE, **theme_colors()}
+    rules = []
+    unknown = []
+    for cls in classes:
+        variant, _, utility = cls.rpartition(":")
+        try:
+            if variant not in VARIANTS:
+                raise UnknownUtility(cls)
+            group, declarations, suffix = _definition(utility, colors)
+        except (UnknownUtility, KeyError):
+            unknown.append(cls)
+            continue
+        # Tailwind puts display:none last among display utilities, so "flex hidden" hides.
+        sort_key = (list(VARIANTS).index(variant), ORDER.index(group), _side_rank(utility), "~" if utility == "hidden" else cls)
+        selector = "." + _escape(cls) + VARIANTS[variant]
+        if suffix == "::placeholder":
+            rule = f"{selector}::-moz-placeholder{{{declarations}}}{selector}::placeholder{{{declarations}}}"
+        else:
+            rule = f"{selector}{suffix}{{{declarations}}}"
+        rules.append((sort_key, rule))
+    if unknown:
+        raise UnknownUtility(
+            f"no hand-written definition for: {', '.join(sorted(unknown))}. Add it to tools/tailwind_subset.py "
+            "or build with the Tailwind CLI (tools/build_css.py --cli)."
+        )
+    utilities = "".join(rule for _, rule in sorted(rules))
+    return f"{BANNER}\n*,:after,:before{{{_VARS}}}::backdrop{{{_VARS}}}{PREFLIGHT}{utilities}\n"
+
+
+def theme_colors():
+    """Colors from theme.extend.colors in tailwind.config.js, as {"accent-500": "#8b5cf6", ...}."""
+    with open(CONFIG, encoding="utf-8") as f:
+        config = f.read()
+    colors = {}
+    for name, shades in re.findall(r"(\w+):\s*\{([^{}]*)\}", config):
+        for shade, value in re.findall(r"(\d+):\s*'(#[0-9a-fA-F]{6})'", shades):
+            colors[f"{name}-{shade}"] = value.lower()
+    return colors
+
+
+# --- Private helpers ---
+
+def _definition(utility, colors):
+    """(group, declarations, selector suffix) for one utility class without a variant."""
+    if utility in FIXED:
+        return FIXED[utility] + ("",)
+
+    negative = utility.startswith("-")
+    base = utility.lstrip("-")
+
+    match = re.fullmatch(r"(top|right|bottom|left)-(.+)", base)
+    if match:
+        return match[1], f"{match[1]}:{_spacing(match[2], negative)}", ""
+    match = re.fullmatch(r"z-(\d+)", base)
+    if match:
+        return "z-index", f"z-index:{match[1]}", ""
+    match = re.fullmatch(r"([mp])([xytrbl]?)-(.+)", base)
+    if match:
+        prop, group = ("margin", "margin") if match[1] == "m" else ("padding", "padding")
+        value = _spacing(match[3], negative)
+        return group, ";".join(f"{prop}{side}:{value}" for side in _SIDES[match[2]]), ""
+    match = re.fullmatch(r"(h|w)-(.+)", base)
+    if match:
+        prop = "height" if match[1] == "h" else "width"
+        return prop, f"{prop}:{_spacing(match[2], negative)}", ""
+    match = re.fullmatch(r"gap-(.+)", base)
+    if match:
+        return "gap", f"gap:{_spacing(match[1], negative)}", ""
+    match = re.fullmatch(r"space-y-(.+)", base)
+    if match:
+        value = _spacing(match[1], negative)
+        declarations = (
+            f"--tw-space-y-reverse:0;margin-top:calc({value}*(1 - var(--tw-space-y-reverse)));"
+            f"margin-bottom:calc({value}*var(--tw-space-y-reverse))"
+        )
+        return "space", declarations, ">:not([hidden])~:not([hidden])"
+    match = re.fullmatch(r"translate-y-(.+)", base)
+    if match:
+        return "transform", f"--tw-translate-y:{_spacing(match[1], negative)};{_TRANSFORM}", ""
+    match = re.fullmatch(r"rounded(?:-(md|lg|xl|full))?", base)
+    if match:
+        return "border-radius", f"border-radius:{RADII[match[1] or '']}", ""
+    match = re.fullmatch(r"opacity-(\d+)", base)
+    if match:
+        return "opacity", f"opacity:{_number(int(match[1]) / 100)}", ""
+    match = re.fullmatch(r"duration-(\d+)", base)
+    if match:
+        return "transition-duration", f"transition-duration:{_number(int(match[1]) / 1000)}s", ""
+    match = re.fullmatch(r"text-(xs|sm|lg|3xl)", base)
+    if match:
+        size, line_height = FONT_SIZES[match[1]]
+        return "font-size", f"font-size:{size};line-height:{line_height}", ""
+    match = re.fullmatch(r"from-(.+)", base)
+    if match:
+        value = colors[match[1]]
+        declarations = (
+            f"--tw-gradient-from:{value} var(--tw-gradient-from-position);"
+            f"--tw-gradient-to:rgb({_rgb(value)}/0) var(--tw-gradient-to-position);"
+            "--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)"
+        )
+        return "gradient-from", declarations, ""
+    match = re.fullmatch(r"(bg|text|border-l|border|ring|placeholder)-(.+)", base)
+    if match:
+        group, prop, opacity_var, suffix = _COLOR_PROPERTIES[match[1]]
+        name, _, alpha = match[2].partition("/")
+        if name == "transparent":
+            return group, f"{prop}:transparent", suffix
+        rgb = _rgb(colors[name])
+        if not alpha:
+            return group, f"{opacity_var}:1;{prop}:rgb({rgb}/var({opacity_var}))", suffix
+        opacity = float(alpha[1:-1]) if alpha.startswith("[") else int(alpha) / 100
+        return group, f"{prop}:rgb({rgb}/{_number(opacity)})", suffix
+    raise UnknownUtility(utility)
+
+
+def _side_rank(utility):
+    # Tailwind emits all sides, then x/y, then single sides, so "px-4 pl-10" keeps pl-10.
+    match = re.fullmatch(r"-?(?:[mp]|border)-?([xytrbl]?)(?:-.*)?", utility)
+    return "_xytrbl".index(match[1] or "_") if match else 0
+
+
+def _spacing(key, negative):
+    value = SPACING[key]
+    if negative and value != "0":
+        return "-" + value
+    return value
+
+
+def _rgb(hex_color):
+    return " ".join(str(int(hex_color[i:i + 2], 16)) for i in (1, 3, 5))
+
+
+def _number(value):
+    # Minified CSS numbers: 0.5 -> .5, 1.0 -> 1
+    text = f"{value:g}"
+    return text[1:] if text.startswith("0.") else text
+
+
+def _escape(cls):
+    return re.sub(r"([^a-zA-Z0-9_-])", r"\\\1", cls)